@@ -13,7 +13,79 @@
 
 """Image v2 API Library"""
 
+import collections
+import hashlib
+import logging
+import threading
+import time
+
+from osc_lib import exceptions
+
 from openstackclient.api import image_v1
+from openstackclient.common import ranged_download
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+_ImageHash = collections.namedtuple('_ImageHash', 'attr checksum expected')
+
+
+def _image_hasher(image):
+    """Return the hash to verify the data of an image with
+
+    The multihash is preferred over the legacy MD5 checksum when Glance
+    recorded one with an algorithm available locally.
+
+    :returns: an ``_ImageHash`` of the image attribute holding the
+              expected value, a new hash object and the expected hex
+              digest, or None if the image has no hash to verify against
+    """
+    algo = image.get('os_hash_algo')
+    if image.get('os_hash_value') and algo in hashlib.algorithms_available:
+        return _ImageHash(
+            'os_hash_value', hashlib.new(algo), image['os_hash_value'])
+    if image.get('checksum'):
+        return _ImageHash(
+            'checksum', hashlib.md5(), image['checksum'])  # nosec
+    return None
+
+
+def _verify_hash(hasher, name):
+    if hasher is None:
+        return
+    if hasher.checksum.hexdigest() != hasher.expected:
+        msg = _("The %(attr)s of %(name)s (%(actual)s) does not match the "
+                "image (%(expected)s)")
+        raise exceptions.CommandError(msg % {
+            'attr': hasher.attr,
+            'name': name,
+            'actual': hasher.checksum.hexdigest(),
+            'expected': hasher.expected,
+        })
+
+
+class _Progress(object):
+    """Count the bytes saved from threads and report them"""
+
+    def __init__(self, callback, done=0):
+        self.callback = callback
+        self.start = self.done = done
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    @property
+    def elapsed(self):
+        return time.time() - self._started
+
+    def add(self, count):
+        with self._lock:
+            self.done += count
+            done = self.done
+        if self.callback:
+            elapsed = self.elapsed
+            self.callback(
+                done, (done - self.start) / elapsed if elapsed else 0)
 
 
 class APIv2(image_v1.APIv1):
@@ -77,3 +149,98 @@ class APIv2(image_v1.APIv1):
             url += "/detail"
 
         return self.list(url, **filter)['images']
+
+    def image_save(
+        self,
+        image,
+        file,
+        workers=1,
+        chunk_size=None,
+        resume=False,
+        progress=None,
+    ):
+        """Save the data of an image to a file using HTTP Range requests
+
+        The data is checked against the image's ``os_hash_value`` or, if
+        there is none, its ``checksum``.
+
+        :param image:
+            the image, as returned by Glance
+        :param string file:
+            the name of the file to save the data in
+        :param integer workers:
+            the maximum number of Range requests in flight at once; with
+            a single worker the data is fetched with one request and
+            hashed as it arrives
+        :param integer chunk_size:
+            the number of bytes fetched by each Range request when there
+            is more than one worker
+        :param boolean resume:
+            continue downloading into an existing, partial file
+        :param progress:
+            called with the number of bytes saved so far and the bytes
+            per second downloaded as the data arrives
+        """
+
+        url = '/images/%s/file' % image['id']
+        size = image['size']
+
+        offset = ranged_download.resume_offset(file, size) if resume else 0
+
+        hasher = _image_hasher(image)
+        reporter = _Progress(progress, offset)
+        if workers > 1:
+            ranged_download.save_ranges(
+                self._request, url, file, size, offset, workers,
+                chunk_size or ranged_download.DEFAULT_CHUNK_SIZE,
+                reporter.add)
+            if hasher is not None:
+                ranged_download.hash_file(hasher.checksum, file)
+        else:
+            self._image_save_stream(
+                url, file, size, offset, hasher, reporter)
+        LOG.debug('Saved %(bytes)d bytes of image %(image)s in '
+                  '%(elapsed).1fs',
+                  {'bytes': reporter.done - reporter.start,
+                   'image': image['id'],
+                   'elapsed': reporter.elapsed})
+        _verify_hash(hasher, file)
+
+    def _image_save_stream(self, url, file, size, offset, hasher, reporter):
+        """Download image data with a single, possibly ranged, request
+
+        The data already in the file is hashed before the rest is
+        requested, and the rest is hashed as it is written.
+        """
+
+        if offset == size:
+            # Already downloaded, there is only the hash left to check
+            if hasher is not None:
+                ranged_download.hash_file(hasher.checksum, file)
+            return
+
+        headers = {}
+        if offset:
+            headers['Range'] = 'bytes=%d-' % offset
+        response = self._request('GET', url, stream=True, headers=headers)
+        if offset and response.status_code != 206:
+            LOG.warning(_('Range requests are not supported for %s, '
+                          'restarting the download'), url)
+            offset = reporter.done = reporter.start = 0
+        if offset and hasher is not None:
+            ranged_download.hash_file(hasher.checksum, file, offset)
+
+        with open(file, 'r+b' if offset else 'wb') as f:
+            f.seek(offset)
+            f.truncate()
+            for chunk in response.iter_content(ranged_download.READ_SIZE):
+                if hasher is not None:
+                    hasher.checksum.update(chunk)
+                f.write(chunk)
+                reporter.add(len(chunk))
+
+        if reporter.done != size:
+            msg = _("Incomplete download of %(url)s: got %(done)d of "
+                    "%(size)d bytes")
+            raise exceptions.CommandError(
+                msg % {'url': url, 'done': reporter.done, 'size': size})
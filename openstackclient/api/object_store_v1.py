@@ -13,16 +13,82 @@
 
 """Object Store v1 API Library"""
 
+from concurrent import futures
+import hashlib
 import io
+import itertools
+import json
 import logging
 import os
 import sys
 
+from keystoneauth1 import exceptions as ks_exceptions
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 from six.moves import urllib
 
 from openstackclient.api import api
+from openstackclient.common import concurrency
+from openstackclient.common import ranged_download
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+
+def _expected_md5(headers):
+    """Return the MD5 of an object's content from its headers, if known
+
+    The ETag of a large object manifest is not the MD5 of its content.
+    """
+    if (headers.get('X-Static-Large-Object') or
+            headers.get('X-Object-Manifest')):
+        return None
+    etag = headers.get('Etag')
+    return etag.strip('"').lower() if etag else None
+
+
+def _verify_md5(checksum, expected, name):
+    if expected and checksum.hexdigest() != expected:
+        msg = _("Checksum of %(name)s (%(checksum)s) does not match its "
+                "ETag (%(etag)s)")
+        raise exceptions.CommandError(msg % {
+            'name': name,
+            'checksum': checksum.hexdigest(),
+            'etag': expected,
+        })
+
+
+class _FileSegment(object):
+    """A byte range of an open file, readable as a request body
+
+    The range is streamed from the file as the request is sent rather than
+    read into memory first.
+    """
+
+    def __init__(self, fileobj, offset, length):
+        self._file = fileobj
+        self._file.seek(offset)
+        self._length = length
+        self._remaining = length
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(64 * 1024)
+            if not chunk:
+                return
+            yield chunk
 
 
 class APIv1(api.BaseAPI):
@@ -30,6 +96,65 @@ class APIv1(api.BaseAPI):
 
     def __init__(self, **kwargs):
         super(APIv1, self).__init__(**kwargs)
+        self._capabilities = None
+
+    def get_capabilities(self):
+        """Return the capabilities the cluster advertises in ``/info``
+
+        :returns:
+            dict of middleware names to their settings, empty if the
+            cluster does not publish them
+        """
+
+        if self._capabilities is None:
+            self._capabilities = {}
+            if self.endpoint:
+                # /info lives at the root of the cluster, not under the
+                # account endpoint that _request() prefixes paths with
+                info_url = urllib.parse.urljoin(self.endpoint, '/info')
+                try:
+                    info = self.session.request(info_url, 'GET').json()
+                except (ks_exceptions.ClientException, ValueError) as e:
+                    LOG.debug('Unable to get capabilities: %s', e)
+                else:
+                    if isinstance(info, dict):
+                        self._capabilities = info
+        return self._capabilities
+
+    def _list_pages(self, path, get_marker=None, **params):
+        """Yield every entry of a listing as the pages arrive
+
+        The next page is requested on a background thread while the caller
+        consumes the current one, so output can start after the first page
+        and memory use is bounded by the page size.
+
+        :param string path:
+            the listing path
+        :param get_marker:
+            a callable returning the marker for an entry, defaults to the
+            entry name
+        :param params:
+            query parameters, ``marker`` is replaced for each page after
+            the first
+        """
+
+        get_marker = get_marker or (lambda entry: entry['name'])
+
+        def _fetch(marker):
+            page_params = dict(params)
+            if marker:
+                page_params['marker'] = marker
+            return self.list(path, **page_params)
+
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            page = executor.submit(_fetch, params.get('marker'))
+            while True:
+                listing = page.result()
+                if not listing:
+                    return
+                page = executor.submit(_fetch, get_marker(listing[-1]))
+                for entry in listing:
+                    yield entry
 
     def container_create(
         self,
@@ -76,8 +201,8 @@ class APIv1(api.BaseAPI):
         """Get containers in an account
 
         :param boolean all_data:
-            if True, return a full listing, else returns a max of
-            10000 listings
+            if True, return a generator over the full listing, fetched
+            page by page, else returns a max of 10000 listings
         :param integer limit:
             query return count limit
         :param string marker:
@@ -92,27 +217,6 @@ class APIv1(api.BaseAPI):
 
         params['format'] = 'json'
 
-        if all_data:
-            data = listing = self.container_list(
-                limit=limit,
-                marker=marker,
-                end_marker=end_marker,
-                prefix=prefix,
-                **params
-            )
-            while listing:
-                marker = listing[-1]['name']
-                listing = self.container_list(
-                    limit=limit,
-                    marker=marker,
-                    end_marker=end_marker,
-                    prefix=prefix,
-                    **params
-                )
-                if listing:
-                    data.extend(listing)
-            return data
-
         if limit:
             params['limit'] = limit
         if marker:
@@ -122,6 +226,9 @@ class APIv1(api.BaseAPI):
         if prefix:
             params['prefix'] = prefix
 
+        if all_data:
+            return self._list_pages('', **params)
+
         return self.list('', **params)
 
     def container_save(
@@ -216,6 +323,8 @@ class APIv1(api.BaseAPI):
         container=None,
         object=None,
         name=None,
+        segment_size=None,
+        workers=1,
     ):
         """Create an object inside a container
 
@@ -225,6 +334,11 @@ class APIv1(api.BaseAPI):
             local path to object
         :param string name:
             name of object to create
+        :param integer segment_size:
+            upload files larger than this many bytes as a static large
+            object made of segments of this size
+        :param integer workers:
+            the maximum number of segments to upload at once
         :returns:
             dict of returned headers
         """
@@ -239,12 +353,21 @@ class APIv1(api.BaseAPI):
 
         full_url = "%s/%s" % (urllib.parse.quote(container),
                               urllib.parse.quote(object_name_str))
-        with io.open(object, 'rb') as f:
-            response = self.create(
-                full_url,
-                method='PUT',
-                data=f,
+        if segment_size and os.path.getsize(object) > segment_size:
+            response = self._object_create_segmented(
+                container,
+                object,
+                object_name_str,
+                segment_size,
+                workers,
             )
+        else:
+            with io.open(object, 'rb') as f:
+                response = self.create(
+                    full_url,
+                    method='PUT',
+                    data=f,
+                )
         data = {
             'account': self._find_account_id(),
             'container': container,
@@ -255,6 +378,59 @@ class APIv1(api.BaseAPI):
 
         return data
 
+    def _object_create_segmented(
+        self,
+        container,
+        path,
+        name,
+        segment_size,
+        workers,
+    ):
+        """Upload a file as a static large object
+
+        The segments are uploaded concurrently to ``<container>_segments``
+        and then tied together by a manifest object.
+        """
+
+        size = os.path.getsize(path)
+        segment_container = container + '_segments'
+        self.container_create(container=segment_container)
+        # Follow the segment naming used by the swift command line client
+        segment_prefix = '%s/slo/%f/%d/%d/' % (
+            name, os.path.getmtime(path), size, segment_size)
+
+        def _upload_segment(index):
+            offset = index * segment_size
+            length = min(segment_size, size - offset)
+            segment_name = '%s%08d' % (segment_prefix, index)
+            with io.open(path, 'rb') as f:
+                response = self.create(
+                    "%s/%s" % (urllib.parse.quote(segment_container),
+                               urllib.parse.quote(segment_name)),
+                    method='PUT',
+                    data=_FileSegment(f, offset, length),
+                )
+            return {
+                'path': '/%s/%s' % (segment_container, segment_name),
+                'etag': response.headers.get('Etag'),
+                'size_bytes': length,
+            }
+
+        manifest = []
+        count = (size + segment_size - 1) // segment_size
+        for index, segment, e in concurrency.run_concurrently(
+                _upload_segment, range(count), workers=workers):
+            if e is not None:
+                raise e
+            manifest.append(segment)
+
+        return self.create(
+            "%s/%s?multipart-manifest=put" % (
+                urllib.parse.quote(container), urllib.parse.quote(name)),
+            method='PUT',
+            data=json.dumps(manifest),
+        )
+
     def object_delete(
         self,
         container=None,
@@ -274,6 +450,82 @@ class APIv1(api.BaseAPI):
         self.delete("%s/%s" % (urllib.parse.quote(container),
                                urllib.parse.quote(object)))
 
+    def object_delete_many(
+        self,
+        container,
+        objects,
+        workers=concurrency.DEFAULT_WORKERS,
+    ):
+        """Delete objects from a container with as few requests as possible
+
+        Objects are deleted in batches with the bulk delete middleware when
+        the cluster advertises it, otherwise with concurrent requests for
+        each object.  A single object is always deleted on its own.
+
+        :param string container:
+            name of container that stores the objects
+        :param objects:
+            an iterable of object names, consumed as it is deleted
+        :param integer workers:
+            the maximum number of requests in flight at once when deleting
+            objects one by one
+        :returns:
+            a tuple of the number of objects deleted and a list of
+            (object, error) tuples for the objects that were not
+        """
+
+        objects = iter(objects)
+        head = list(itertools.islice(objects, 2))
+        objects = itertools.chain(head, objects)
+        bulk_delete = None
+        if len(head) > 1:
+            bulk_delete = self.get_capabilities().get('bulk_delete')
+        if not isinstance(bulk_delete, dict):
+            deleted = 0
+            failed = []
+            for obj, result, e in concurrency.run_concurrently(
+                    lambda obj: self.object_delete(
+                        container=container, object=obj),
+                    objects, workers=workers):
+                if e is not None:
+                    failed.append((obj, e))
+                else:
+                    deleted += 1
+            return deleted, failed
+
+        batch_size = bulk_delete.get('max_deletes_per_request', 10000)
+        prefix = '/%s/' % urllib.parse.quote(container)
+        deleted = 0
+        failed = []
+        while True:
+            batch = list(itertools.islice(objects, batch_size))
+            if not batch:
+                break
+            response = self._request(
+                'POST',
+                '',
+                params={'bulk-delete': ''},
+                headers={
+                    'Content-Type': 'text/plain',
+                    'Accept': 'application/json',
+                },
+                data='\n'.join(prefix + urllib.parse.quote(obj)
+                               for obj in batch),
+            )
+            result = response.json()
+            deleted += (result.get('Number Deleted', 0) +
+                        result.get('Number Not Found', 0))
+            errors = result.get('Errors') or []
+            for path, status in errors:
+                failed.append((urllib.parse.unquote(path[len(prefix):]),
+                               status))
+            if not errors and not str(
+                    result.get('Response Status', '200')).startswith('2'):
+                # The whole batch was rejected
+                failed.extend((obj, result.get('Response Status'))
+                              for obj in batch)
+        return deleted, failed
+
     def object_list(
         self,
         container=None,
@@ -290,8 +542,8 @@ class APIv1(api.BaseAPI):
         :param string container:
             container name to get a listing for
         :param boolean all_data:
-            if True, return a full listing, else returns a max of
-            10000 listings
+            if True, return a generator over the full listing, fetched
+            page by page, else returns a max of 10000 listings
         :param integer limit:
             query return count limit
         :param string marker:
@@ -310,34 +562,6 @@ class APIv1(api.BaseAPI):
             return None
 
         params['format'] = 'json'
-        if all_data:
-            data = listing = self.object_list(
-                container=container,
-                limit=limit,
-                marker=marker,
-                end_marker=end_marker,
-                prefix=prefix,
-                delimiter=delimiter,
-                **params
-            )
-            while listing:
-                if delimiter:
-                    marker = listing[-1].get('name', listing[-1].get('subdir'))
-                else:
-                    marker = listing[-1]['name']
-                listing = self.object_list(
-                    container=container,
-                    limit=limit,
-                    marker=marker,
-                    end_marker=end_marker,
-                    prefix=prefix,
-                    delimiter=delimiter,
-                    **params
-                )
-                if listing:
-                    data.extend(listing)
-            return data
-
         if limit:
             params['limit'] = limit
         if marker:
@@ -349,6 +573,14 @@ class APIv1(api.BaseAPI):
         if delimiter:
             params['delimiter'] = delimiter
 
+        if all_data:
+            return self._list_pages(
+                urllib.parse.quote(container),
+                # Pseudo-directories only have a subdir
+                get_marker=lambda e: e.get('name', e.get('subdir')),
+                **params
+            )
+
         return self.list(urllib.parse.quote(container), **params)
 
     def object_save(
@@ -356,38 +588,87 @@ class APIv1(api.BaseAPI):
         container=None,
         object=None,
         file=None,
+        workers=1,
+        chunk_size=None,
+        resume=False,
     ):
         """Save an object stored in a container
 
+        The content is checked against the object's ETag once downloaded.
+
         :param string container:
             name of container that stores object
         :param string object:
             name of object to save
         :param string file:
             local name of object
+        :param integer workers:
+            the maximum number of Range requests in flight at once
+        :param integer chunk_size:
+            the number of bytes fetched by each Range request
+        :param boolean resume:
+            continue downloading into an existing, partial file
         """
 
         if not file:
             file = object
 
+        url = "%s/%s" % (urllib.parse.quote(container),
+                         urllib.parse.quote(object))
+        if file != '-':
+            if not os.path.exists(os.path.dirname(file)):
+                if len(os.path.dirname(file)) > 0:
+                    os.makedirs(os.path.dirname(file))
+            if workers > 1 or resume:
+                self._object_save_ranges(
+                    url,
+                    file,
+                    workers,
+                    chunk_size or ranged_download.DEFAULT_CHUNK_SIZE,
+                    resume,
+                )
+                return
+
         response = self._request(
             'GET',
-            "%s/%s" % (urllib.parse.quote(container),
-                       urllib.parse.quote(object)),
+            url,
             stream=True,
         )
         if response.status_code == 200:
+            checksum = hashlib.md5()  # nosec
             if file == '-':
                 with os.fdopen(sys.stdout.fileno(), 'wb') as f:
-                    for chunk in response.iter_content(64 * 1024):
+                    for chunk in response.iter_content(
+                            ranged_download.READ_SIZE):
+                        checksum.update(chunk)
                         f.write(chunk)
             else:
-                if not os.path.exists(os.path.dirname(file)):
-                    if len(os.path.dirname(file)) > 0:
-                        os.makedirs(os.path.dirname(file))
                 with open(file, 'wb') as f:
-                    for chunk in response.iter_content(64 * 1024):
+                    for chunk in response.iter_content(
+                            ranged_download.READ_SIZE):
+                        checksum.update(chunk)
                         f.write(chunk)
+            _verify_md5(checksum, _expected_md5(response.headers), object)
+
+    def _object_save_ranges(self, url, file, workers, chunk_size, resume):
+        """Download an object with concurrent Range requests
+
+        The content is checked against the object's ETag once the ranges
+        are all saved.
+        """
+
+        headers = self._request('HEAD', url).headers
+        size = int(headers.get('Content-Length', 0))
+
+        offset = ranged_download.resume_offset(file, size) if resume else 0
+        ranged_download.save_ranges(
+            self._request, url, file, size, offset, workers, chunk_size)
+
+        expected = _expected_md5(headers)
+        if expected:
+            checksum = hashlib.md5()  # nosec
+            ranged_download.hash_file(checksum, file)
+            _verify_md5(checksum, expected, file)
 
     def object_set(
         self,
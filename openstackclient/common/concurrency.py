@@ -0,0 +1,112 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Helpers for issuing independent API requests concurrently"""
+
+import collections
+from concurrent import futures
+import itertools
+import logging
+
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+# Keep the number of requests a single command has in flight modest so
+# we do not trip API rate limiting on the server side.
+DEFAULT_WORKERS = 10
+
+
+def _call(func, item):
+    try:
+        return item, func(item), None
+    except Exception as e:
+        return item, None, e
+
+
+def run_concurrently(func, items, workers=DEFAULT_WORKERS, ordered=True):
+    """Call ``func`` once for each item using a bounded pool of threads
+
+    :param func: a callable taking a single item
+    :param items: an iterable of items
+    :param workers: the maximum number of calls in flight at once
+    :param ordered: yield results in the order the items were given rather
+                    than as soon as each call completes
+    :returns: a generator of ``(item, result, exception)`` tuples;
+              ``exception`` is None if the call succeeded
+    """
+    items = list(items)
+    workers = max(1, min(workers or 1, len(items)))
+    if workers == 1:
+        for item in items:
+            yield _call(func, item)
+        return
+
+    # Only submit a call when another completes, so that no more than
+    # ``workers`` calls are queued if the consumer stops early.
+    items = iter(items)
+    executor = futures.ThreadPoolExecutor(max_workers=workers)
+    running = collections.deque(
+        executor.submit(_call, func, item)
+        for item in itertools.islice(items, workers))
+    try:
+        while running:
+            if ordered:
+                done = [running.popleft()]
+            else:
+                done = futures.wait(
+                    running, return_when=futures.FIRST_COMPLETED)[0]
+                for future in done:
+                    running.remove(future)
+            for future in done:
+                result = future.result()
+                for item in itertools.islice(items, 1):
+                    running.append(executor.submit(_call, func, item))
+                yield result
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def get_many(get, ids, workers=DEFAULT_WORKERS):
+    """Fetch resources by ID concurrently
+
+    Lookups that fail are logged and left out of the result, which suits
+    callers that only need the resources to decorate output with names.
+
+    :param get: a callable taking a resource ID, e.g. ``images.get``
+    :param ids: an iterable of resource IDs
+    :param workers: the maximum number of requests in flight at once
+    :returns: a dict mapping each ID that was found to its resource
+    """
+    resources = {}
+    for res_id, resource, exc in run_concurrently(get, set(ids), workers):
+        if exc is not None:
+            LOG.debug('Failed to look up %s: %s', res_id, exc)
+            continue
+        resources[res_id] = resource
+    return resources
+
+
+def add_parallel_option_to_parser(parser, help=None):
+    """Add the ``--parallel`` option used by bulk commands"""
+    parser.add_argument(
+        '--parallel',
+        metavar='<num-workers>',
+        type=int,
+        default=1,
+        help=help or _('Act on up to <num-workers> resources concurrently '
+                       '(default: 1)'),
+    )
@@ -0,0 +1,241 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Persistent cache of resource names to IDs
+
+Resolving a resource name to an ID typically costs one or more API round
+trips.  When enabled with ``--os-name-cache`` the results are kept on disk,
+in one file per cloud and project, so that scripts running many commands
+against the same resources only pay for the lookups once.
+"""
+
+import collections
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from osc_lib import utils
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_TTL = 600
+DEFAULT_MAX_ENTRIES = 1000
+
+# Resource types that are cached, mapped to the command object names that
+# create, modify or delete them and so invalidate the cached entries.
+RESOURCE_TYPES = {
+    'domain': ('domain',),
+    'flavor': ('flavor',),
+    'image': ('image',),
+    'network': ('network',),
+    'project': ('project',),
+    'security_group': ('security group',),
+    # nova-network security group rule IDs mapped to their group's ID
+    'security_group_rule': ('security group rule', 'security group'),
+    'user': ('user',),
+}
+
+MUTATING_ACTIONS = ('create', 'delete', 'set', 'unset', 'purge')
+
+_cache = None
+
+
+def get_cache_dir():
+    """Return the directory holding the name cache files"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(
+        os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'openstack', 'names')
+
+
+def get_cache_path(*scope):
+    """Return the cache file for a cloud and project
+
+    :param scope: values identifying the cloud and project, such as the
+                  cloud name, auth URL, region and project
+    """
+    key = '|'.join(str(s or '') for s in scope)
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()  # nosec
+    return os.path.join(get_cache_dir(), digest + '.json')
+
+
+class NameCache(object):
+    """A size bounded, expiring map of resource names to IDs
+
+    Entries are kept in least recently used order and the oldest ones are
+    evicted once ``max_entries`` is exceeded.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(resource_type, name, scope=None):
+        return '%s|%s|%s' % (resource_type, scope or '', name)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            return
+        now = time.time()
+        for key, res_id, stamp in entries:
+            if now - stamp < self.ttl:
+                self._entries[key] = (res_id, stamp)
+
+    def get(self, resource_type, name, scope=None):
+        """Return the cached ID for a name, or None"""
+        key = self._key(resource_type, name, scope)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            if time.time() - entry[1] >= self.ttl:
+                self._dirty = True
+                return None
+            # Re-insert to mark the entry as most recently used
+            self._entries[key] = entry
+            self._dirty = True
+            return entry[0]
+
+    def set(self, resource_type, name, res_id, scope=None):
+        """Record the ID of a named resource"""
+        key = self._key(resource_type, name, scope)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (res_id, time.time())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def invalidate(self, resource_type):
+        """Drop every cached entry of a resource type"""
+        prefix = resource_type + '|'
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+                self._dirty = True
+
+    def save(self):
+        """Write the cache back to disk if it has changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [[k, v[0], v[1]] for k, v in self._entries.items()]
+            self._dirty = False
+        directory = os.path.dirname(self.path)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory, 0o700)
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.rename(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            LOG.debug('Unable to save name cache %s: %s', self.path, e)
+
+
+def configure(path, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+    """Enable the name cache for this process"""
+    global _cache
+    _cache = NameCache(path, ttl=ttl, max_entries=max_entries)
+    return _cache
+
+
+def get_cache():
+    """Return the name cache for this process, or None if it is disabled"""
+    return _cache
+
+
+def reset():
+    """Disable the name cache for this process"""
+    global _cache
+    _cache = None
+
+
+def invalidate_for_command(cmd_name):
+    """Invalidate the entries a command may have made stale
+
+    :param cmd_name: the full command name, e.g. ``security group delete``
+    """
+    if _cache is None or not cmd_name:
+        return
+    words = cmd_name.split()
+    if words[-1] not in MUTATING_ACTIONS:
+        return
+    noun = ' '.join(words[:-1])
+    for resource_type, nouns in RESOURCE_TYPES.items():
+        if noun in nouns:
+            _cache.invalidate(resource_type)
+
+
+def find_id(resource_type, name_or_id, finder, scope=None):
+    """Return the ID of a resource, consulting the name cache first
+
+    :param resource_type: one of the keys of ``RESOURCE_TYPES``
+    :param name_or_id: the resource name or ID given by the user
+    :param finder: a callable taking ``name_or_id`` and returning the
+                   resource, used on a cache miss
+    :param scope: an optional value the name is only unique within, such
+                  as a domain ID
+    :returns: the resource ID
+    """
+    cache = _cache
+    if cache is not None:
+        res_id = cache.get(resource_type, name_or_id, scope)
+        if res_id is not None:
+            return res_id
+    res_id = finder(name_or_id).id
+    if cache is not None and res_id and res_id != name_or_id:
+        cache.set(resource_type, name_or_id, res_id, scope)
+    return res_id
+
+
+def find_resource(manager, resource_type, name_or_id, **kwargs):
+    """Find a resource like ``osc_lib.utils.find_resource``
+
+    On a cache hit the resource is fetched directly by ID, skipping the
+    search by name.
+
+    :param manager: a client manager with ``get`` and ``list`` methods
+    :param resource_type: one of the keys of ``RESOURCE_TYPES``
+    :param name_or_id: the resource name or ID given by the user
+    :param kwargs: additional filters passed on to ``find_resource``
+    """
+    cache = _cache
+    scope = ','.join('%s=%s' % i for i in sorted(kwargs.items()))
+    if cache is not None:
+        res_id = cache.get(resource_type, name_or_id, scope)
+        if res_id is not None:
+            try:
+                return manager.get(res_id)
+            except Exception:
+                # Stale entry, fall back to a regular lookup
+                LOG.debug('Cached %s %s not found', resource_type, res_id)
+    resource = utils.find_resource(manager, name_or_id, **kwargs)
+    res_id = getattr(resource, 'id', None)
+    if cache is not None and res_id and res_id != name_or_id:
+        cache.set(resource_type, name_or_id, res_id, scope)
+    return resource
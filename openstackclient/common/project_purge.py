@@ -14,16 +14,21 @@
 #
 
 import logging
+import time
 
 from osc_lib.command import command
 from osc_lib import utils
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
 
 LOG = logging.getLogger(__name__)
 
+POLL_INTERVAL = 2
+WAIT_TIMEOUT = 3600
+
 
 class ProjectPurge(command.Command):
     _description = _("Clean resources associated with a project")
@@ -52,6 +57,17 @@ class ProjectPurge(command.Command):
             help=_('Project to clean (name or ID)'),
         )
         identity_common.add_project_domain_option_to_parser(parser)
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Delete up to <num-workers> resources concurrently '
+                   '(default: 1)'),
+        )
+        parser.add_argument(
+            '--wait',
+            action='store_true',
+            help=_('Wait for servers, volume snapshots and volume backups '
+                   'to be deleted before deleting volumes'),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -73,7 +89,11 @@ class ProjectPurge(command.Command):
                 ).id
 
         # delete all non-identity resources
-        self.delete_resources(parsed_args.dry_run, project_id)
+        self.delete_resources(parsed_args.dry_run, project_id,
+                              workers=parsed_args.parallel,
+                              wait=parsed_args.wait)
+        if not parsed_args.dry_run:
+            self.report_stats()
 
         # clean up the project
         if not parsed_args.keep_project:
@@ -81,82 +101,205 @@ class ProjectPurge(command.Command):
             if not parsed_args.dry_run:
                 identity_client.projects.delete(project_id)
 
-    def delete_resources(self, dry_run, project_id):
-        # servers
-        try:
+    def delete_resources(self, dry_run, project_id, workers=1, wait=False):
+        """Delete the resources of a project
+
+        Servers, images, volume snapshots and volume backups do not depend
+        on each other and are deleted together, volumes only afterwards.
+        When waiting, the deletion of the servers, volume snapshots and
+        volume backups, which may hold on to volumes, is polled to
+        completion before the volumes are deleted.
+        """
+        self._stats = {}
+        volume_search_opts = {'project_id': project_id, 'all_tenants': True}
+
+        def _list_servers():
             compute_client = self.app.client_manager.compute
             search_opts = {'tenant_id': project_id, 'all_tenants': True}
-            data = compute_client.servers.list(search_opts=search_opts)
-            self.delete_objects(
-                compute_client.servers.delete, data, 'server', dry_run)
-        except Exception:
-            pass
+            return compute_client.servers.list(search_opts=search_opts)
 
-        # images
-        try:
+        def _list_images():
             image_client = self.app.client_manager.image
             api_version = int(image_client.version)
             if api_version == 1:
-                data = image_client.images.list(owner=project_id)
-            elif api_version == 2:
-                kwargs = {'filters': {'owner': project_id}}
-                data = image_client.images.list(**kwargs)
+                return image_client.images.list(owner=project_id)
+            kwargs = {'filters': {'owner': project_id}}
+            return image_client.images.list(**kwargs)
+
+        def _list_snapshots():
+            volume_client = self.app.client_manager.volume
+            return volume_client.volume_snapshots.list(
+                search_opts=volume_search_opts)
+
+        def _list_backups():
+            volume_client = self.app.client_manager.volume
+            return volume_client.backups.list(search_opts=volume_search_opts)
+
+        def _list_volumes():
+            volume_client = self.app.client_manager.volume
+            return volume_client.volumes.list(search_opts=volume_search_opts)
+
+        def _delete_server(server_id):
+            self.app.client_manager.compute.servers.delete(server_id)
+
+        def _delete_image(image_id):
+            self.app.client_manager.image.images.delete(image_id)
+
+        def _delete_volume(volume_id):
+            self.app.client_manager.volume.volumes.force_delete(volume_id)
+
+        # Each stage is a list of (resource, list function, delete function,
+        # whether a later stage depends on the deletion having completed)
+        stages = [
+            [
+                ('server', _list_servers, _delete_server, True),
+                ('image', _list_images, _delete_image, False),
+                ('volume snapshot', _list_snapshots,
+                 self.delete_one_volume_snapshot, True),
+                ('volume backup', _list_backups,
+                 self.delete_one_volume_backup, True),
+            ],
+            [
+                ('volume', _list_volumes, _delete_volume, False),
+            ],
+        ]
+        for stage in stages:
+            work = []
+            for resource, list_func, func_delete, _w in stage:
+                try:
+                    data = list(list_func())
+                except Exception as e:
+                    LOG.warning(_("Unable to list %(resource)ss, they are "
+                                  "not deleted: %(e)s"),
+                                {'resource': resource, 'e': e})
+                else:
+                    work.append((resource, func_delete, data))
+            deleted = self.delete_objects_concurrently(
+                work, dry_run, workers=workers)
+            if wait and not dry_run:
+                listers = dict((r, l) for r, l, _f, w in stage if w)
+                self.wait_for_deletion(
+                    dict((r, (listers[r], ids))
+                         for r, ids in deleted.items() if r in listers))
+
+    def delete_objects_concurrently(self, work, dry_run, workers=1):
+        """Delete resources of several types through one worker pool
+
+        :param work: a list of (resource, delete function, resources) tuples
+        :param dry_run: only log what would be deleted
+        :param workers: the maximum number of deletions in flight at once
+        :returns: a dict mapping each resource type to the set of IDs
+                  deleted successfully
+        """
+        items = []
+        for resource, func_delete, data in work:
+            for i in data:
+                LOG.warning(_('Deleting %(resource)s : %(id)s') %
+                            {'resource': resource, 'id': i.id})
+                items.append((resource, func_delete, i.id))
+        deleted = dict((resource, set()) for resource, _f, _d in work)
+        if dry_run:
+            return deleted
+
+        # Each resource type is timed from its first deletion starting to
+        # its last one completing, as the types share the worker pool
+        started = {}
+
+        def _delete(item):
+            started.setdefault(item[0], time.time())
+            return item[1](item[2])
+
+        failed = dict((resource, 0) for resource, _f, _d in work)
+        finished = {}
+        results = concurrency.run_concurrently(
+            _delete, items, workers=workers, ordered=False)
+        for (resource, _f, res_id), _r, e in results:
+            finished[resource] = time.time()
+            if e is not None:
+                failed[resource] += 1
+                LOG.error(_("Failed to delete %(resource)s with "
+                            "ID '%(id)s': %(e)s")
+                          % {'resource': resource, 'id': res_id, 'e': e})
             else:
-                raise NotImplementedError
-            self.delete_objects(
-                image_client.images.delete, data, 'image', dry_run)
-        except Exception:
-            pass
+                deleted[resource].add(res_id)
 
-        # volumes, snapshots, backups
-        volume_client = self.app.client_manager.volume
-        search_opts = {'project_id': project_id, 'all_tenants': True}
-        try:
-            data = volume_client.volume_snapshots.list(search_opts=search_opts)
-            self.delete_objects(
-                self.delete_one_volume_snapshot,
-                data,
-                'volume snapshot',
-                dry_run)
-        except Exception:
-            pass
-        try:
-            data = volume_client.backups.list(search_opts=search_opts)
-            self.delete_objects(
-                self.delete_one_volume_backup,
-                data,
-                'volume backup',
-                dry_run)
-        except Exception:
-            pass
-        try:
-            data = volume_client.volumes.list(search_opts=search_opts)
-            self.delete_objects(
-                volume_client.volumes.force_delete, data, 'volume', dry_run)
-        except Exception:
-            pass
-
-    def delete_objects(self, func_delete, data, resource, dry_run):
-        result = 0
-        for i in data:
-            LOG.warning(_('Deleting %(resource)s : %(id)s') %
-                        {'resource': resource, 'id': i.id})
-            if not dry_run:
+        for resource, _f, data in work:
+            if resource in started:
+                self._stats[resource] = [len(deleted[resource]),
+                                         started[resource],
+                                         finished[resource]]
+            if failed[resource] > 0:
+                total = len(data)
+                msg = (_("%(result)s of %(total)s %(resource)ss failed "
+                       "to delete.") %
+                       {'result': failed[resource],
+                        'total': total,
+                        'resource': resource})
+                LOG.error(msg)
+        return deleted
+
+    def wait_for_deletion(self, pending, timeout=WAIT_TIMEOUT):
+        """Poll the deletion of several resource types to completion
+
+        Each poll cycle makes one list call per resource type rather than
+        one call per resource.
+
+        :param pending: a dict mapping each resource type to a tuple of its
+                        list function and the set of IDs being deleted
+        :param timeout: the maximum number of seconds to wait, counted in
+                        poll intervals
+        """
+        pending = dict((r, v) for r, v in pending.items() if v[1])
+        polls = 0
+        while pending:
+            if polls * POLL_INTERVAL >= timeout:
+                for resource, (_l, ids) in pending.items():
+                    LOG.error(_("Timed out waiting for %(count)s "
+                                "%(resource)ss to be deleted.") %
+                              {'count': len(ids), 'resource': resource})
+                return
+            time.sleep(POLL_INTERVAL)
+            polls += 1
+            for resource, (list_func, ids) in list(pending.items()):
                 try:
-                    func_delete(i.id)
+                    data = list_func()
                 except Exception as e:
-                    result += 1
-                    LOG.error(_("Failed to delete %(resource)s with "
-                                "ID '%(id)s': %(e)s")
-                              % {'resource': resource, 'id': i.id, 'e': e})
-        if result > 0:
-            total = len(data)
-            msg = (_("%(result)s of %(total)s %(resource)ss failed "
-                   "to delete.") %
-                   {'result': result,
-                    'total': total,
-                    'resource': resource})
-            LOG.error(msg)
+                    # Try again on the next poll
+                    LOG.debug('Failed to list %(resource)ss: %(e)s',
+                              {'resource': resource, 'e': e})
+                    continue
+                remaining = set()
+                for r in data:
+                    if r.id not in ids:
+                        continue
+                    status = str(getattr(r, 'status', '')).lower()
+                    if status.startswith('error'):
+                        LOG.error(_("Failed to delete %(resource)s with "
+                                    "ID '%(id)s': %(status)s") %
+                                  {'resource': resource, 'id': r.id,
+                                   'status': status})
+                        continue
+                    remaining.add(r.id)
+                if remaining:
+                    pending[resource] = (list_func, remaining)
+                else:
+                    del pending[resource]
+                    if resource in self._stats:
+                        self._stats[resource][2] = time.time()
+
+    def report_stats(self):
+        """Write the number of resources deleted and the rate per type"""
+        for resource in sorted(self._stats):
+            count, started, finished = self._stats[resource]
+            if not count:
+                continue
+            elapsed = finished - started
+            rate = count / elapsed if elapsed > 0 else float(count)
+            self.app.stdout.write(
+                _('Deleted %(count)s %(resource)ss in %(elapsed).2fs '
+                  '(%(rate).2f/s)\n') %
+                {'count': count, 'resource': resource,
+                 'elapsed': elapsed, 'rate': rate})
 
     def delete_one_volume_snapshot(self, snapshot_id):
         volume_client = self.app.client_manager.volume
@@ -23,6 +23,7 @@ from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.network import common
 
@@ -239,6 +240,54 @@ class ListQuota(command.Lister, BaseQuota):
                     s, columns,
                 ) for s in result))
 
+    @staticmethod
+    def _list_project_quotas(project_ids, get_quota, get_defaults, keys,
+                             is_not_found, workers=1):
+        """Yield the quotas of projects that differ from the defaults
+
+        The default quotas are the same for every project, so they are only
+        fetched once. With more than one worker the per-project quotas are
+        fetched concurrently and yielded as soon as they arrive.
+        """
+        defaults = []
+
+        def _get_defaults(project_id):
+            if not defaults:
+                defaults.append(get_defaults(project_id))
+            return defaults[0]
+
+        if workers > 1 and project_ids:
+            # Fetch the defaults up front so the workers do not race to
+            # fetch them themselves
+            _get_defaults(project_ids[0])
+
+        results = concurrency.run_concurrently(
+            get_quota, project_ids, workers=workers, ordered=False)
+        for p, data, ex in results:
+            if ex is not None:
+                if is_not_found(ex):
+                    # Project not found, move on to next one
+                    LOG.warning("Project %s not found: %s" % (p, ex))
+                    continue
+                raise ex
+
+            result_data = _xform_get_quota(data, p, keys)
+            result_default = _xform_get_quota(_get_defaults(p), p, keys)
+            if result_default != result_data:
+                for row in result_data:
+                    yield row
+
+    def _get_project_quotas(self, parsed_args, project_ids, get_quota,
+                            get_defaults, keys, is_not_found):
+        rows = self._list_project_quotas(
+            project_ids, get_quota, get_defaults, keys, is_not_found,
+            workers=parsed_args.parallel,
+        )
+        if parsed_args.parallel > 1:
+            # Stream rows into the output as they arrive
+            return rows
+        return list(rows)
+
     def get_parser(self, prog_name):
         parser = super(ListQuota, self).get_parser(prog_name)
         parser.add_argument(
@@ -246,6 +295,12 @@ class ListQuota(command.Lister, BaseQuota):
             metavar='<project>',
             help=_('List quotas for this project <project> (name or ID)'),
         )
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Fetch the quotas of up to <num-workers> projects '
+                   'concurrently and output them as they arrive '
+                   '(default: 1)'),
+        )
         parser.add_argument(
             '--detail',
             dest='detail',
@@ -276,40 +331,21 @@ class ListQuota(command.Lister, BaseQuota):
 
     def take_action(self, parsed_args):
         projects = self.app.client_manager.identity.projects.list()
-        result = []
         project_ids = [getattr(p, 'id', '') for p in projects]
 
         if parsed_args.compute:
             if parsed_args.detail:
                 return self._get_detailed_quotas(parsed_args)
             compute_client = self.app.client_manager.compute
-            for p in project_ids:
-                try:
-                    data = compute_client.quotas.get(p)
-                except Exception as ex:
-                    if (
-                        type(ex).__name__ == 'NotFound' or
-                        ex.http_status >= 400 and ex.http_status <= 499
-                    ):
-                        # Project not found, move on to next one
-                        LOG.warning("Project %s not found: %s" % (p, ex))
-                        continue
-                    else:
-                        raise
-
-                result_data = _xform_get_quota(
-                    data,
-                    p,
-                    COMPUTE_QUOTAS.keys(),
-                )
-                default_data = compute_client.quotas.defaults(p)
-                result_default = _xform_get_quota(
-                    default_data,
-                    p,
-                    COMPUTE_QUOTAS.keys(),
-                )
-                if result_default != result_data:
-                    result += result_data
+            result = self._get_project_quotas(
+                parsed_args,
+                project_ids,
+                compute_client.quotas.get,
+                compute_client.quotas.defaults,
+                COMPUTE_QUOTAS.keys(),
+                lambda ex: (type(ex).__name__ == 'NotFound' or
+                            ex.http_status >= 400 and ex.http_status <= 499),
+            )
 
             columns = (
                 'id',
@@ -349,30 +385,14 @@ class ListQuota(command.Lister, BaseQuota):
                 LOG.warning("Volume service doesn't provide detailed quota"
                             " information")
             volume_client = self.app.client_manager.volume
-            for p in project_ids:
-                try:
-                    data = volume_client.quotas.get(p)
-                except Exception as ex:
-                    if type(ex).__name__ == 'NotFound':
-                        # Project not found, move on to next one
-                        LOG.warning("Project %s not found: %s" % (p, ex))
-                        continue
-                    else:
-                        raise
-
-                result_data = _xform_get_quota(
-                    data,
-                    p,
-                    VOLUME_QUOTAS.keys(),
-                )
-                default_data = volume_client.quotas.defaults(p)
-                result_default = _xform_get_quota(
-                    default_data,
-                    p,
-                    VOLUME_QUOTAS.keys(),
-                )
-                if result_default != result_data:
-                    result += result_data
+            result = self._get_project_quotas(
+                parsed_args,
+                project_ids,
+                volume_client.quotas.get,
+                volume_client.quotas.defaults,
+                VOLUME_QUOTAS.keys(),
+                lambda ex: type(ex).__name__ == 'NotFound',
+            )
 
             columns = (
                 'id',
@@ -401,30 +421,14 @@ class ListQuota(command.Lister, BaseQuota):
             if parsed_args.detail:
                 return self._get_detailed_quotas(parsed_args)
             client = self.app.client_manager.network
-            for p in project_ids:
-                try:
-                    data = client.get_quota(p)
-                except Exception as ex:
-                    if type(ex).__name__ == 'NotFound':
-                        # Project not found, move on to next one
-                        LOG.warning("Project %s not found: %s" % (p, ex))
-                        continue
-                    else:
-                        raise
-
-                result_data = _xform_get_quota(
-                    data,
-                    p,
-                    NETWORK_KEYS,
-                )
-                default_data = client.get_quota_default(p)
-                result_default = _xform_get_quota(
-                    default_data,
-                    p,
-                    NETWORK_KEYS,
-                )
-                if result_default != result_data:
-                    result += result_data
+            result = self._get_project_quotas(
+                parsed_args,
+                project_ids,
+                client.get_quota,
+                client.get_quota_default,
+                NETWORK_KEYS,
+                lambda ex: type(ex).__name__ == 'NotFound',
+            )
 
             columns = (
                 'id',
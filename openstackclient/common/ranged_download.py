@@ -0,0 +1,134 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Download data into a file with concurrent HTTP Range requests"""
+
+import os
+import threading
+
+from osc_lib import exceptions
+import six
+
+from openstackclient.common import concurrency
+from openstackclient.i18n import _
+
+
+# Size of the blocks read from a download response or a saved file
+READ_SIZE = 64 * 1024
+# Default size of each Range request of a ranged download
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def resume_offset(file, size):
+    """Return where to resume a download of ``size`` bytes into a file
+
+    :returns: the size of the partial file, or 0 if there is none or it
+              is larger than the data and so not a partial download of it
+    """
+    if not os.path.exists(file):
+        return 0
+    offset = os.path.getsize(file)
+    return offset if offset <= size else 0
+
+
+def hash_file(checksum, file, length=None):
+    """Update a hash object with the first ``length`` bytes of a file"""
+    remaining = length
+    with open(file, 'rb') as f:
+        while remaining is None or remaining > 0:
+            size = READ_SIZE if remaining is None else min(
+                READ_SIZE, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            checksum.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+
+
+def save_ranges(request, url, file, size, offset=0,
+                workers=concurrency.DEFAULT_WORKERS,
+                chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Download data into a file with concurrent Range requests
+
+    The file is preallocated to ``size`` and each range is written in place
+    as it arrives.  If a range fails the file is truncated to the data
+    downloaded without gaps, so that the download can be resumed from there.
+
+    :param request: makes a request like ``BaseAPI._request``
+    :param string url: the URL of the data
+    :param string file: the name of the file to save the data in
+    :param integer size: the size of the data in bytes
+    :param integer offset: the number of bytes already in the file
+    :param integer workers: the maximum number of requests in flight at once
+    :param integer chunk_size: the number of bytes fetched by each request
+    :param progress: called with the number of bytes of each block written
+    """
+
+    starts = list(six.moves.range(offset, size, chunk_size))
+    done = set()
+    lock = threading.Lock()
+    fd = os.open(file, os.O_WRONLY | os.O_CREAT, 0o666)
+
+    def _write(data, position):
+        if hasattr(os, 'pwrite'):
+            os.pwrite(fd, data, position)
+        else:
+            with lock:
+                os.lseek(fd, position, os.SEEK_SET)
+                os.write(fd, data)
+
+    def _download(start):
+        end = min(start + chunk_size, size) - 1
+        response = request(
+            'GET',
+            url,
+            stream=True,
+            headers={'Range': 'bytes=%d-%d' % (start, end)},
+        )
+        if response.status_code != 206 and (start, end) != (0, size - 1):
+            msg = _("Range requests are not supported for %s")
+            raise exceptions.CommandError(msg % url)
+        position = start
+        for chunk in response.iter_content(READ_SIZE):
+            _write(chunk, position)
+            position += len(chunk)
+            if progress is not None:
+                progress(len(chunk))
+        if position != end + 1:
+            msg = _("Incomplete range %(start)d-%(end)d of %(url)s")
+            raise exceptions.CommandError(
+                msg % {'start': start, 'end': end, 'url': url})
+        with lock:
+            done.add(start)
+
+    try:
+        # Preallocate the file; on most filesystems this leaves the ranges
+        # not yet downloaded sparse
+        os.ftruncate(fd, size)
+        # Let every range finish before the file is closed
+        errors = [e for start, result, e in concurrency.run_concurrently(
+            _download, starts, workers=workers) if e is not None]
+        if errors:
+            raise errors[0]
+    except BaseException:
+        # Keep only the data without gaps so the download can resume
+        complete = offset
+        for start in starts:
+            if start not in done:
+                break
+            complete = min(start + chunk_size, size)
+        os.ftruncate(fd, complete)
+        raise
+    finally:
+        os.close(fd)
@@ -0,0 +1,59 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Cache of resources looked up by ID to decorate command output
+
+Listers often show the name of a related resource, such as the server a
+volume is attached to.  Resources fetched for that purpose are kept here
+for the rest of the command so that other listers run by the same
+command, or the same lister paging through results, do not fetch them
+again.  The shell empties the cache after each command.
+"""
+
+import threading
+
+from openstackclient.common import concurrency
+
+
+_caches = {}
+_lock = threading.Lock()
+
+
+def lookup(resource_type, ids, get, workers=concurrency.DEFAULT_WORKERS):
+    """Return the resources with the given IDs, fetching uncached ones
+
+    Resources that are not cached are fetched concurrently.  IDs that
+    could not be fetched are remembered and not tried again.
+
+    :param resource_type: a name for the kind of resource, e.g. ``server``
+    :param ids: an iterable of resource IDs
+    :param get: a callable fetching a single resource by ID
+    :param workers: the maximum number of requests in flight at once
+    :returns: a dict mapping each ID that was found to its resource
+    """
+    ids = set(i for i in ids if i)
+    with _lock:
+        cache = _caches.setdefault(resource_type, {})
+        missing = ids - set(cache)
+    if missing:
+        found = concurrency.get_many(get, missing, workers)
+        with _lock:
+            for res_id in missing:
+                cache[res_id] = found.get(res_id)
+    return dict((i, cache[i]) for i in ids if cache.get(i) is not None)
+
+
+def reset():
+    """Empty the cache"""
+    with _lock:
+        _caches.clear()
@@ -0,0 +1,197 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Wait for the status of many resources with few API requests"""
+
+import logging
+import random
+import time
+
+
+LOG = logging.getLogger(__name__)
+
+
+class Waiter(object):
+    """Wait for a set of resources to reach a status
+
+    Each poll cycle makes a single call to ``poll`` for all the resources
+    still being waited on. The delay between cycles grows exponentially,
+    with some random jitter so that many clients waiting at once do not
+    poll in lock step.
+
+    After each wait ``polls`` holds the number of poll cycles made and
+    ``elapsed`` the number of seconds spent waiting.
+
+    :param poll: a callable taking the set of IDs still being waited on and
+                 returning a dict that maps IDs to their current resource,
+                 or to None if the resource no longer exists. IDs left out
+                 of the dict have not changed since the previous poll.
+    :param interval: seconds to sleep after the first poll
+    :param max_interval: upper bound on the seconds to sleep between polls
+    :param backoff: factor the interval grows by after each poll
+    :param jitter: fraction of the interval to randomly add or subtract
+    :param timeout: seconds to wait before giving up, or None to wait
+                    until every resource is done
+    """
+
+    def __init__(self, poll, interval=2, max_interval=30, backoff=1.5,
+                 jitter=0.2, timeout=None):
+        self.poll = poll
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self.timeout = timeout
+        self.polls = 0
+        self.elapsed = 0.0
+
+    def _sleep_time(self, cycle):
+        delay = min(self.max_interval, self.interval * self.backoff ** cycle)
+        # The jitter only spreads out polling, it needs no secure source
+        return delay * random.uniform(  # nosec
+            1 - self.jitter, 1 + self.jitter)
+
+    @staticmethod
+    def _report_progress(resources, callback):
+        progress = [getattr(r, 'progress', None) for r in resources
+                    if r is not None]
+        progress = [p for p in progress if p is not None]
+        if progress:
+            callback(sum(progress) // len(progress))
+
+    def _wait(self, ids, is_done, is_failed, callback=None,
+              on_finished=None):
+        pending = set(ids)
+        count = len(pending)
+        results = {}
+        latest = {}
+        self.polls = 0
+        cycle = 0
+        start = time.time()
+
+        def _finish(res_id, success):
+            results[res_id] = success
+            pending.discard(res_id)
+            if on_finished:
+                more = set(on_finished(res_id, success) or ()) - set(results)
+                if more:
+                    pending.update(more)
+                    return len(more)
+            return 0
+
+        try:
+            while pending:
+                current = self.poll(set(pending))
+                self.polls += 1
+                added = 0
+                for res_id in list(pending):
+                    if res_id not in current:
+                        continue
+                    resource = latest[res_id] = current[res_id]
+                    if is_done(resource):
+                        added += _finish(res_id, True)
+                    elif is_failed(resource):
+                        added += _finish(res_id, False)
+                if added:
+                    count += added
+                    # Poll the resources just added as often as new ones
+                    cycle = 0
+                if callback:
+                    self._report_progress(latest.values(), callback)
+                if not pending:
+                    break
+                if (self.timeout is not None and
+                        time.time() - start >= self.timeout):
+                    break
+                time.sleep(self._sleep_time(cycle))
+                cycle += 1
+        finally:
+            self.elapsed = time.time() - start
+            LOG.debug('Waited %(elapsed).1fs over %(polls)d polls for '
+                      '%(count)d resources',
+                      {'elapsed': self.elapsed, 'polls': self.polls,
+                       'count': count})
+        for res_id in pending:
+            results[res_id] = False
+        return results
+
+    def wait_for(self, ids, is_done, is_failed, callback=None,
+                 on_finished=None):
+        """Wait for resources to meet a condition
+
+        :param ids: the IDs of the resources to wait for
+        :param is_done: called with a resource, or None if it no longer
+                        exists, and returns True if it is done
+        :param is_failed: called like ``is_done`` and returns True if the
+                          resource failed
+        :param callback: called with the average progress of the resources
+                         after each poll
+        :param on_finished: called with the ID of each resource once it is
+                            done or failed and whether it succeeded; it may
+                            return the IDs of more resources to wait for
+        :returns: a dict mapping each ID to True if the resource is done,
+                  False otherwise
+        """
+        return self._wait(ids, is_done, is_failed, callback=callback,
+                          on_finished=on_finished)
+
+    def wait_for_status(self, ids, success_status=('active',),
+                        error_status=('error',), status_field='status',
+                        callback=None, on_finished=None):
+        """Wait for resources to reach a status
+
+        :param ids: the IDs of the resources to wait for
+        :param success_status: the statuses indicating success
+        :param error_status: the statuses indicating failure
+        :param status_field: the attribute holding the status
+        :param callback: called with the average progress of the resources
+                         after each poll
+        :param on_finished: called like it is by ``wait_for``
+        :returns: a dict mapping each ID to True if the resource reached
+                  one of the success statuses, False otherwise
+        """
+        def _status(resource):
+            return str(getattr(resource, status_field, '')).lower()
+
+        return self._wait(
+            ids,
+            lambda r: r is not None and _status(r) in success_status,
+            lambda r: r is None or _status(r) in error_status,
+            callback=callback,
+            on_finished=on_finished,
+        )
+
+    def wait_for_delete(self, ids, deleted_status=('deleted',),
+                        error_status=('error',), status_field='status',
+                        callback=None):
+        """Wait for resources to be deleted
+
+        :param ids: the IDs of the resources to wait for
+        :param deleted_status: the statuses of resources that are deleted
+                               but still listed
+        :param error_status: the statuses indicating failure
+        :param status_field: the attribute holding the status
+        :param callback: called with the average progress of the resources
+                         after each poll
+        :returns: a dict mapping each ID to True if the resource was
+                  deleted, False otherwise
+        """
+        def _status(resource):
+            return str(getattr(resource, status_field, '')).lower()
+
+        return self._wait(
+            ids,
+            lambda r: r is None or _status(r) in deleted_status,
+            lambda r: _status(r) in error_status,
+            callback=callback,
+        )
@@ -15,6 +15,8 @@
 
 """Compute v2 Console action implementations"""
 
+import time
+
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import utils
@@ -23,6 +25,63 @@ import six
 from openstackclient.i18n import _
 
 
+# When following a console log, the lines fetched by the previous poll
+# must overlap a poll by at least this many lines to tell where the new
+# output starts, unless the whole log was fetched.
+FOLLOW_MIN_OVERLAP = 10
+# Lines fetched per poll when following.  The window grows when more than
+# this was written between polls, up to the maximum.
+FOLLOW_WINDOW_LINES = 100
+FOLLOW_MAX_WINDOW_LINES = 10000
+# Seconds between polls when following.  The interval grows while the
+# console is quiet and drops back as soon as there is new output.
+FOLLOW_INTERVAL = 1
+FOLLOW_MAX_INTERVAL = 15
+FOLLOW_BACKOFF = 1.5
+
+
+def _split_lines(data):
+    """Split console output into complete lines and a trailing partial line
+
+    :param data: console output
+    :returns: a list of the complete lines, newlines included, and the
+              text after the last newline
+    """
+    parts = data.split('\n')
+    return [part + '\n' for part in parts[:-1]], parts[-1]
+
+
+def _new_lines(lines, previous, offset=None):
+    """Return the lines written since the previous poll
+
+    :param lines: the lines fetched from the end of the console log
+    :param previous: the lines fetched by the previous poll
+    :param offset: the number of lines the log had at the previous poll,
+                   only given when ``lines`` is the whole log
+    :returns: the new lines, or None if ``lines`` does not carry on from
+              ``previous``
+    """
+    if not previous:
+        return lines
+    if offset is not None:
+        # The whole log was fetched, so the new output starts at the offset
+        if (len(previous) <= offset <= len(lines) and
+                lines[offset - len(previous):offset] == previous):
+            return lines[offset:]
+        return None
+    # Line up the end of the previous poll with these lines, preferring
+    # the fewest new lines.  All of the overlap has to match, not just the
+    # last few lines, so repeated output is not taken for the new output.
+    for count in range(len(lines) + 1):
+        end = len(lines) - count
+        overlap = min(len(previous), end)
+        if overlap < min(len(previous), FOLLOW_MIN_OVERLAP):
+            break
+        if lines[end - overlap:end] == previous[len(previous) - overlap:]:
+            return lines[end:]
+    return None
+
+
 class ShowConsoleLog(command.Command):
     _description = _("Show server's console output")
 
@@ -42,8 +101,58 @@ class ShowConsoleLog(command.Command):
             help=_("Number of lines to display from the end of the log "
                    "(default=all)")
         )
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            help=_("Keep polling the log and display new lines as they are "
+                   "written, until interrupted"),
+        )
         return parser
 
+    def _follow(self, server, previous, offset):
+        """Write console output newer than the previous poll until interrupted
+
+        Only a window at the end of the log is fetched on each poll, so a
+        long log is not downloaded again and again.  While the log fits in
+        the window, the number of lines already written tells where the
+        new output starts.
+        """
+        interval = FOLLOW_INTERVAL
+        window = FOLLOW_WINDOW_LINES
+        while True:
+            time.sleep(interval)
+            while True:
+                lines = _split_lines(
+                    server.get_console_output(length=window + 1))[0]
+                whole_log = len(lines) < window
+                new = _new_lines(lines, previous,
+                                 offset if whole_log else None)
+                if (new is not None or whole_log or
+                        window >= FOLLOW_MAX_WINDOW_LINES):
+                    break
+                # More was written since the last poll than was fetched
+                window = min(window * 2, FOLLOW_MAX_WINDOW_LINES)
+            if new is None:
+                # The log was reset, e.g. by a rebuild, or grew by more
+                # than the largest window; start over from what we have.
+                new = lines
+                offset = None
+            if whole_log:
+                offset = len(lines)
+            elif offset is not None:
+                offset += len(new)
+            previous = lines[-FOLLOW_WINDOW_LINES:]
+
+            if new:
+                self.app.stdout.write(''.join(new))
+                self.app.stdout.flush()
+                interval = FOLLOW_INTERVAL
+            else:
+                interval = min(interval * FOLLOW_BACKOFF,
+                               FOLLOW_MAX_INTERVAL)
+            window = max(FOLLOW_WINDOW_LINES,
+                         min(len(new) * 2, FOLLOW_MAX_WINDOW_LINES))
+
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
 
@@ -59,6 +168,20 @@ class ShowConsoleLog(command.Command):
 
         data = server.get_console_output(length=length)
 
+        if parsed_args.follow:
+            # Hold back a partial last line until it is complete
+            lines = _split_lines(data)[0]
+            self.app.stdout.write(''.join(lines))
+            self.app.stdout.flush()
+            try:
+                # Without --lines the whole log was fetched, so the number
+                # of lines written so far is known
+                self._follow(server, lines[-FOLLOW_WINDOW_LINES:],
+                             None if length else len(lines))
+            except KeyboardInterrupt:
+                pass
+            return
+
         if data and data[-1] != '\n':
             data += '\n'
         self.app.stdout.write(data)
@@ -24,6 +24,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -303,8 +304,22 @@ class ListFlavor(command.Lister):
                 "RXTX Factor",
                 "Properties",
             )
+            # Since 2.61 the extra specs are embedded in the flavor list,
+            # though they are left out if policy forbids showing them.
+            embedded = (compute_client.api_version >=
+                        api_versions.APIVersion('2.61'))
+            missing = []
             for f in data:
-                f.properties = f.get_keys()
+                extra_specs = getattr(f, 'extra_specs', None)
+                if embedded and extra_specs is not None:
+                    f.properties = extra_specs
+                else:
+                    missing.append(f)
+            for f, extra_specs, e in concurrency.run_concurrently(
+                    lambda f: f.get_keys(), missing):
+                if e is not None:
+                    raise e
+                f.properties = extra_specs
 
         column_headers = columns
 
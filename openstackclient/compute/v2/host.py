@@ -15,12 +15,209 @@
 
 """Host action implementations"""
 
+import logging
+import time
+
+from novaclient import api_versions
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
+from oslo_utils import timeutils
 
+from openstackclient.common import concurrency
+from openstackclient.common import waiter
+from openstackclient.compute.v2 import server as server_cmds
 from openstackclient.i18n import _
 
 
+LOG = logging.getLogger(__name__)
+
+# Only servers in these states can be live migrated
+LIVE_MIGRATABLE_STATUS = ('active', 'paused')
+
+
+class DrainHost(command.Lister):
+    _description = _("Live migrate all servers off a compute host")
+
+    # Why the drain failed, raised once the servers are shown
+    _failure = None
+
+    def get_parser(self, prog_name):
+        parser = super(DrainHost, self).get_parser(prog_name)
+        parser.add_argument(
+            "host",
+            metavar="<host>",
+            help=_("Compute host to drain (name only)")
+        )
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Live migrate up to <num-workers> servers at once '
+                   '(default: 1)'),
+        )
+        parser.add_argument(
+            '--target-host',
+            metavar='<hostname>',
+            help=_('Migrate the servers to the specified host instead of '
+                   'letting the scheduler pick one. Requires '
+                   '``--os-compute-api-version`` 2.30 or greater.'),
+        )
+        migration_group = parser.add_mutually_exclusive_group()
+        migration_group.add_argument(
+            '--shared-migration',
+            dest='block_migration',
+            action='store_false',
+            default=False,
+            help=_('Perform shared live migrations (default)'),
+        )
+        migration_group.add_argument(
+            '--block-migration',
+            dest='block_migration',
+            action='store_true',
+            help=_('Perform block live migrations'),
+        )
+        parser.add_argument(
+            '--timeout',
+            metavar='<seconds>',
+            type=int,
+            help=_('Give up waiting for the migrations after <seconds>'),
+        )
+        return parser
+
+    def run(self, parsed_args):
+        result = super(DrainHost, self).run(parsed_args)
+        if self._failure:
+            raise exceptions.CommandError(self._failure)
+        return result
+
+    def take_action(self, parsed_args):
+        compute_client = self.app.client_manager.compute
+
+        if parsed_args.parallel < 1:
+            msg = _('--parallel must be at least 1')
+            raise exceptions.CommandError(msg)
+        if (parsed_args.target_host and
+                compute_client.api_version < api_versions.APIVersion('2.30')):
+            msg = _('--os-compute-api-version 2.30 or greater is required '
+                    'when using --target-host')
+            raise exceptions.CommandError(msg)
+
+        kwargs = {
+            'block_migration': parsed_args.block_migration,
+            'host': parsed_args.target_host,
+        }
+        if compute_client.api_version < api_versions.APIVersion('2.25'):
+            kwargs['disk_over_commit'] = False
+
+        drain_started = time.time()
+        servers = compute_client.servers.list(
+            search_opts={'host': parsed_args.host, 'all_tenants': True},
+            limit=-1)
+        queue = []
+        results = {}
+        for server in servers:
+            if server.status.lower() in LIVE_MIGRATABLE_STATUS:
+                queue.append(server)
+            else:
+                results[server.id] = (server, 'skipped', None, None)
+        started = {}
+
+        def _start_next(count):
+            ids = []
+            while queue and len(ids) < count:
+                server = queue.pop(0)
+                try:
+                    server.live_migrate(**kwargs)
+                except Exception as e:
+                    LOG.error(_("Failed to live migrate server %(server)s: "
+                                "%(e)s"), {'server': server.id, 'e': e})
+                    results[server.id] = (server, 'failed', None, None)
+                    continue
+                started[server.id] = (server, time.time())
+                ids.append(server.id)
+            return ids
+
+        latest = {}
+
+        def _host(server):
+            return getattr(server, 'OS-EXT-SRV-ATTR:host', None)
+
+        def _idle(server):
+            return not getattr(server, 'OS-EXT-STS:task_state', None)
+
+        def _is_done(server):
+            if server is not None:
+                latest[server.id] = server
+            return (server is not None and _idle(server) and
+                    server.status.lower() in LIVE_MIGRATABLE_STATUS and
+                    _host(server) != parsed_args.host)
+
+        def _is_failed(server):
+            # Nova sets the task state before accepting a live migration,
+            # so a server back to idle on this host failed to migrate
+            return (server is None or server.status.lower() == 'error' or
+                    (_idle(server) and _host(server) == parsed_args.host))
+
+        def _on_finished(server_id, success):
+            server, migration_started = started[server_id]
+            server = latest.get(server_id, server)
+            results[server_id] = (
+                server,
+                'migrated' if success else 'failed',
+                _host(server) if success else None,
+                round(time.time() - migration_started, 1),
+            )
+            return _start_next(1)
+
+        migration_waiter = waiter.Waiter(
+            server_cmds._server_poller(
+                compute_client, since=timeutils.utcnow(), all_projects=True),
+            timeout=parsed_args.timeout,
+        )
+        migration_waiter.wait_for(
+            _start_next(parsed_args.parallel),
+            _is_done,
+            _is_failed,
+            on_finished=_on_finished,
+        )
+
+        # Anything left was still migrating, or never started, when the
+        # wait timed out
+        for server_id, (server, migration_started) in started.items():
+            if server_id not in results:
+                results[server_id] = (
+                    server, 'timed out', None,
+                    round(time.time() - migration_started, 1))
+        for server in queue:
+            results[server.id] = (server, 'not started', None, None)
+
+        self.app.stderr.write(
+            _('Drained %(count)d of %(total)d servers from %(host)s in '
+              '%(elapsed).1fs\n') % {
+                'count': len([r for r in results.values()
+                              if r[1] == 'migrated']),
+                'total': len(results),
+                'host': parsed_args.host,
+                'elapsed': time.time() - drain_started,
+            })
+
+        columns = ('ID', 'Name', 'Result', 'Destination Host', 'Duration (s)')
+        failed = [r for r in results.values() if r[1] != 'migrated' and
+                  r[1] != 'skipped']
+        if failed:
+            # Fail once the servers are shown, so that a partly drained
+            # host is not taken for a drained one
+            self._failure = _('%(failed)s of %(total)s servers were not '
+                              'migrated off %(host)s') % {
+                'failed': len(failed),
+                'total': len(results),
+                'host': parsed_args.host,
+            }
+        return (columns,
+                ((server.id, server.name, result, host, duration)
+                 for server, result, host, duration in (
+                     results[s.id] for s in servers)))
+
+
 class ListHost(command.Lister):
     _description = _("List hosts")
 
@@ -18,13 +18,56 @@
 import re
 
 from novaclient import exceptions as nova_exceptions
+from osc_lib.cli import format_columns
 from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 
 
+def _aggregate_index(aggregates):
+    """Map each host to the aggregates it is a member of"""
+    index = {}
+    for aggregate in aggregates:
+        for host in aggregate.hosts:
+            index.setdefault(host, []).append(aggregate)
+    return index
+
+
+def _member_of(index, service_host):
+    """Return the names of the aggregates a hypervisor's host is in"""
+    # Hypervisors in nova cells are prefixed by "<cell>@"
+    if "@" in service_host:
+        cell, service_host = service_host.split('@', 1)
+    else:
+        cell = None
+
+    # The host aggregates are also prefixed by "<cell>@"
+    return [aggregate.name
+            for aggregate in index.get(service_host, [])
+            if not cell or cell in aggregate.name]
+
+
+def _parse_uptime(uptime):
+    """Split the output of uptime into its fields"""
+    # format: 0 up 0,  0 users,  load average: 0, 0, 0
+    # example: 17:37:14 up  2:33,  3 users,
+    #          load average: 0.33, 0.36, 0.34
+    m = re.match(
+        r"\s*(.+)\sup\s+(.+),\s+(.+)\susers?,\s+load average:\s(.+)",
+        uptime)
+    if not m:
+        return {}
+    return {
+        "host_time": m.group(1),
+        "uptime": m.group(2),
+        "users": m.group(3),
+        "load_average": m.group(4),
+    }
+
+
 class ListHypervisor(command.Lister):
     _description = _("List hypervisors")
 
@@ -38,7 +81,8 @@ class ListHypervisor(command.Lister):
         parser.add_argument(
             '--long',
             action='store_true',
-            help=_("List additional fields in output")
+            help=_("List additional fields in output, including the "
+                   "aggregates and uptime of each hypervisor")
         )
         return parser
 
@@ -59,10 +103,30 @@ class ListHypervisor(command.Lister):
         else:
             data = compute_client.hypervisors.list()
 
-        return (columns,
-                (utils.get_item_properties(
-                    s, columns,
-                ) for s in data))
+        if not parsed_args.long:
+            return (columns,
+                    (utils.get_item_properties(
+                        s, columns,
+                    ) for s in data))
+
+        data = list(data)
+        index = _aggregate_index(compute_client.aggregates.list())
+        uptimes = concurrency.get_many(
+            compute_client.hypervisors.uptime, [s.id for s in data])
+
+        def _row(hypervisor):
+            uptime = uptimes.get(hypervisor.id)
+            if uptime is not None:
+                uptime = _parse_uptime(uptime.uptime).get("uptime")
+            service_host = (getattr(hypervisor, 'service', None) or
+                            {}).get('host', '')
+            return utils.get_item_properties(hypervisor, columns) + (
+                format_columns.ListColumn(_member_of(index, service_host)),
+                uptime,
+            )
+
+        return (columns + ("Aggregates", "Uptime"),
+                (_row(s) for s in data))
 
 
 class ShowHypervisor(command.ShowOne):
@@ -82,43 +146,13 @@ class ShowHypervisor(command.ShowOne):
         hypervisor = utils.find_resource(compute_client.hypervisors,
                                          parsed_args.hypervisor)._info.copy()
 
-        aggregates = compute_client.aggregates.list()
-        hypervisor["aggregates"] = list()
-        if aggregates:
-            # Hypervisors in nova cells are prefixed by "<cell>@"
-            if "@" in hypervisor['service']['host']:
-                cell, service_host = hypervisor['service']['host'].split('@',
-                                                                         1)
-            else:
-                cell = None
-                service_host = hypervisor['service']['host']
-
-            if cell:
-                # The host aggregates are also prefixed by "<cell>@"
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if cell in aggregate.name and
-                             service_host in aggregate.hosts]
-            else:
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if service_host in aggregate.hosts]
-            hypervisor["aggregates"] = member_of
+        index = _aggregate_index(compute_client.aggregates.list())
+        hypervisor["aggregates"] = _member_of(
+            index, hypervisor['service']['host'])
 
         try:
             uptime = compute_client.hypervisors.uptime(hypervisor['id'])._info
-            # Extract data from uptime value
-            # format: 0 up 0,  0 users,  load average: 0, 0, 0
-            # example: 17:37:14 up  2:33,  3 users,
-            #          load average: 0.33, 0.36, 0.34
-            m = re.match(
-                r"\s*(.+)\sup\s+(.+),\s+(.+)\susers?,\s+load average:\s(.+)",
-                uptime['uptime'])
-            if m:
-                hypervisor["host_time"] = m.group(1)
-                hypervisor["uptime"] = m.group(2)
-                hypervisor["users"] = m.group(3)
-                hypervisor["load_average"] = m.group(4)
+            hypervisor.update(_parse_uptime(uptime['uptime']))
         except nova_exceptions.HTTPNotImplemented:
             pass
 
@@ -16,6 +16,7 @@
 """Compute v2 Server action implementations"""
 
 import argparse
+import datetime
 import getpass
 import io
 import logging
@@ -24,6 +25,7 @@ import os
 from novaclient import api_versions
 from novaclient.v2 import servers
 from openstack import exceptions as sdk_exceptions
+from osc_lib.cli import format_columns
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
@@ -31,6 +33,10 @@ from osc_lib import utils
 from oslo_utils import timeutils
 import six
 
+from openstackclient.common import concurrency
+from openstackclient.common import name_cache
+from openstackclient.common import resource_cache
+from openstackclient.common import waiter
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import common as network_common
@@ -38,6 +44,17 @@ from openstackclient.network import common as network_common
 
 LOG = logging.getLogger(__name__)
 
+# Above this many distinct IDs it is cheaper to fetch the whole image or
+# flavor catalog than to look each referenced ID up individually.
+NAME_LOOKUP_BULK_THRESHOLD = 50
+
+# Servers changed up to this many seconds before a wait started are still
+# polled for, to allow for clock skew between the client and the server.
+CHANGES_SINCE_MARGIN = 300
+
+# Upper bound on the seconds between polls when waiting for one server
+SINGLE_SERVER_MAX_INTERVAL = 5
+
 
 def _format_servers_list_networks(networks):
     """Return a formatted string of a server's networks
@@ -112,6 +129,90 @@ def _get_ip_address(addresses, address_type, ip_address_family):
     )
 
 
+def _lookup_by_ids(ids, get, list_all, one_by_one=False):
+    """Map resource IDs to resources for name lookups
+
+    Only the given IDs are looked up, concurrently, unless there are enough
+    of them that listing the whole catalog costs fewer requests.  Failures
+    are swallowed as the names are only used to decorate output.
+
+    :param ids: a set of resource IDs
+    :param get: a callable fetching a single resource by ID
+    :param list_all: a callable listing every resource
+    :param one_by_one: always look the IDs up individually
+    :rtype: a dict mapping resource IDs to resources
+    """
+    if not ids:
+        return {}
+    if one_by_one or len(ids) <= NAME_LOOKUP_BULK_THRESHOLD:
+        return concurrency.get_many(get, ids)
+    try:
+        return {r.id: r for r in list_all()}
+    except Exception:
+        return {}
+
+
+def _server_poller(compute_client, since=None, all_projects=False):
+    """Return a function polling the status of servers for a Waiter
+
+    A single server is fetched by ID.  Many servers are polled with one
+    list request, filtered on ``changes-since`` so that only servers
+    touched since the command acted on them are returned.
+
+    :param compute_client: a compute client
+    :param since: when the servers were acted on, defaults to now
+    :param all_projects: list servers in all projects (admin only)
+    """
+    since = ((since or timeutils.utcnow()) -
+             datetime.timedelta(seconds=CHANGES_SINCE_MARGIN)).isoformat()
+
+    def poll(server_ids):
+        if len(server_ids) == 1:
+            server_id = next(iter(server_ids))
+            try:
+                return {server_id: compute_client.servers.get(server_id)}
+            except Exception as e:
+                if type(e).__name__ == 'NotFound':
+                    return {server_id: None}
+                raise
+        search_opts = {'changes-since': since}
+        if all_projects:
+            search_opts['all_tenants'] = True
+        # Fetch every page, as a server left out of the list is taken
+        # to have been deleted
+        found = {s.id: s for s in
+                 compute_client.servers.list(search_opts=search_opts,
+                                             limit=-1)
+                 if s.id in server_ids}
+        # Every server we acted on changed after ``since``, so a server
+        # missing from the list no longer exists.
+        return {server_id: found.get(server_id) for server_id in server_ids}
+
+    return poll
+
+
+def _wait_for_server_status(poll, server_id, success_status=('active',),
+                            callback=None):
+    """Wait for a single server to reach a status
+
+    :param poll: a poller returned by ``_server_poller``
+    :param server_id: the server ID
+    :param success_status: the statuses indicating success
+    :param callback: called with the progress of the server
+    :returns: True if the server reached one of the success statuses
+    """
+    # Poll a single server at least every SINGLE_SERVER_MAX_INTERVAL
+    # seconds, as osc_lib's wait_for_status() used to
+    server_waiter = waiter.Waiter(
+        poll, max_interval=SINGLE_SERVER_MAX_INTERVAL)
+    result = server_waiter.wait_for_status(
+        [server_id],
+        success_status=success_status,
+        callback=callback,
+    )
+    return result.get(server_id, False)
+
+
 def _prefix_checked_value(prefix):
     def func(value):
         if ',' in value or '=' in value:
@@ -138,31 +239,38 @@ def _prep_server_detail(compute_client, image_client, server, refresh=True):
         server = utils.find_resource(compute_client.servers, info['id'])
         info.update(server.to_dict())
 
-    # Convert the image blob to a name
+    # Convert the image and flavor blobs to names.  The server holds their
+    # IDs, so they are fetched directly, and concurrently, rather than with
+    # find_resource(), which searches by name when the ID lookup misses.
+    lookups = []
+    # Servers booted from volume have no image
     image_info = info.get('image', {})
     if image_info:
-        image_id = image_info.get('id', '')
-        try:
-            image = utils.find_resource(image_client.images, image_id)
-            info['image'] = "%s (%s)" % (image.name, image_id)
-        except Exception:
-            info['image'] = image_id
-
-    # Convert the flavor blob to a name
-    flavor_info = info.get('flavor', {})
+        lookups.append(
+            ('image', image_info.get('id', ''), image_client.images.get))
     # Microversion 2.47 puts the embedded flavor into the server response
     # body but omits the id, so if not present we just expose the flavor
     # dict in the server output.
+    flavor_info = info.get('flavor', {})
     if 'id' in flavor_info:
-        flavor_id = flavor_info.get('id', '')
-        try:
-            flavor = utils.find_resource(compute_client.flavors, flavor_id)
-            info['flavor'] = "%s (%s)" % (flavor.name, flavor_id)
-        except Exception:
-            info['flavor'] = flavor_id
+        lookups.append(
+            ('flavor', flavor_info.get('id', ''), compute_client.flavors.get))
     else:
         info['flavor'] = utils.format_dict(flavor_info)
 
+    def _lookup(lookup):
+        resource_type, resource_id, get = lookup
+        return resource_cache.lookup(
+            resource_type, [resource_id], get).get(resource_id)
+
+    for lookup, resource, e in concurrency.run_concurrently(
+            _lookup, lookups):
+        resource_type, resource_id = lookup[:2]
+        if resource is not None:
+            info[resource_type] = "%s (%s)" % (resource.name, resource_id)
+        else:
+            info[resource_type] = resource_id
+
     if 'os-extended-volumes:volumes_attached' in info:
         info.update(
             {
@@ -510,6 +618,9 @@ class AddServerVolume(command.Command):
 class CreateServer(command.ShowOne):
     _description = _("Create a new server")
 
+    # The servers that failed to boot when waiting for many servers
+    _failed_servers = ()
+
     def get_parser(self, prog_name):
         parser = super(CreateServer, self).get_parser(prog_name)
         parser.add_argument(
@@ -717,10 +828,66 @@ class CreateServer(command.ShowOne):
         parser.add_argument(
             '--wait',
             action='store_true',
-            help=_('Wait for build to complete'),
+            help=_('Wait for build to complete. With --max greater than 1, '
+                   'wait for every server created and show each with its '
+                   'boot time'),
         )
         return parser
 
+    def run(self, parsed_args):
+        result = super(CreateServer, self).run(parsed_args)
+        if self._failed_servers:
+            # The servers are shown first, then the command fails
+            msg = _('Error creating %(failed)d servers: %(ids)s')
+            raise exceptions.CommandError(msg % {
+                'failed': len(self._failed_servers),
+                'ids': ', '.join(sorted(self._failed_servers)),
+            })
+        return result
+
+    def _wait_for_servers(self, compute_client, reservation_id, since,
+                          callback=None):
+        """Wait for all the servers of a reservation to boot
+
+        :param compute_client: a compute client
+        :param reservation_id: the reservation ID returned on create
+        :param since: when the servers were created
+        :param callback: called with the average progress of the servers
+        :returns: the server IDs and, for each, its name, status,
+                  networks and boot time in seconds
+        """
+        search_opts = {'reservation_id': reservation_id}
+        servers = compute_client.servers.list(
+            search_opts=search_opts, limit=-1)
+        boot_times = {}
+
+        def _on_finished(server_id, success):
+            if success:
+                boot_times[server_id] = round(timeutils.delta_seconds(
+                    since, timeutils.utcnow()), 1)
+
+        server_waiter = waiter.Waiter(
+            _server_poller(compute_client, since=since))
+        results = server_waiter.wait_for_status(
+            [s.id for s in servers],
+            callback=callback,
+            on_finished=_on_finished,
+        )
+        self.app.stdout.write('\n')
+        self._failed_servers = [
+            server_id for server_id, ok in results.items() if not ok]
+
+        # One more list picks up the final status and the addresses
+        servers = compute_client.servers.list(
+            search_opts=search_opts, limit=-1)
+        return self.dict2columns(dict(
+            (s.id, format_columns.DictColumn({
+                'name': s.name,
+                'status': s.status,
+                'networks': _format_servers_list_networks(s.networks),
+                'boot_time': boot_times.get(s.id),
+            })) for s in servers))
+
     def take_action(self, parsed_args):
 
         def _show_progress(progress):
@@ -735,8 +902,9 @@ class CreateServer(command.ShowOne):
         # Lookup parsed_args.image
         image = None
         if parsed_args.image:
-            image = utils.find_resource(
+            image = name_cache.find_resource(
                 image_client.images,
+                'image',
                 parsed_args.image,
             )
 
@@ -792,8 +960,9 @@ class CreateServer(command.ShowOne):
             ).id
 
         # Lookup parsed_args.flavor
-        flavor = utils.find_resource(compute_client.flavors,
-                                     parsed_args.flavor)
+        flavor = name_cache.find_resource(compute_client.flavors,
+                                          'flavor',
+                                          parsed_args.flavor)
 
         files = {}
         for f in parsed_args.file:
@@ -933,9 +1102,12 @@ class CreateServer(command.ShowOne):
                 if self.app.client_manager.is_network_endpoint_enabled():
                     network_client = self.app.client_manager.network
                     if nic_info["net-id"]:
-                        net = network_client.find_network(
-                            nic_info["net-id"], ignore_missing=False)
-                        nic_info["net-id"] = net.id
+                        nic_info["net-id"] = name_cache.find_id(
+                            'network',
+                            nic_info["net-id"],
+                            lambda n: network_client.find_network(
+                                n, ignore_missing=False),
+                        )
                     if nic_info["port-id"]:
                         port = network_client.find_port(
                             nic_info["port-id"], ignore_missing=False)
@@ -974,11 +1146,14 @@ class CreateServer(command.ShowOne):
         if self.app.client_manager.is_network_endpoint_enabled():
             network_client = self.app.client_manager.network
             for each_sg in parsed_args.security_group:
-                sg = network_client.find_security_group(each_sg,
-                                                        ignore_missing=False)
                 # Use security group ID to avoid multiple security group have
                 # same name in neutron networking backend
-                security_group_names.append(sg.id)
+                security_group_names.append(name_cache.find_id(
+                    'security_group',
+                    each_sg,
+                    lambda n: network_client.find_security_group(
+                        n, ignore_missing=False),
+                ))
         else:
             # Handle nova-network case
             for each_sg in parsed_args.security_group:
@@ -1008,10 +1183,14 @@ class CreateServer(command.ShowOne):
         else:
             config_drive = parsed_args.config_drive
 
+        # Nova only returns the first of many servers it creates, so to
+        # wait for them all ask for the reservation ID to look them up by.
+        wait_for_many = parsed_args.wait and parsed_args.max > 1
+
         boot_kwargs = dict(
             meta=parsed_args.property,
             files=files,
-            reservation_id=None,
+            reservation_id=True if wait_for_many else None,
             min_count=parsed_args.min,
             max_count=parsed_args.max,
             security_groups=security_group_names,
@@ -1044,6 +1223,7 @@ class CreateServer(command.ShowOne):
         LOG.debug('boot_args: %s', boot_args)
         LOG.debug('boot_kwargs: %s', boot_kwargs)
 
+        boot_started = timeutils.utcnow()
         # Wrap the call to catch exceptions in order to close files
         try:
             server = compute_client.servers.create(*boot_args, **boot_kwargs)
@@ -1055,9 +1235,14 @@ class CreateServer(command.ShowOne):
             if hasattr(userdata, 'close'):
                 userdata.close()
 
+        if wait_for_many:
+            # The reservation ID is returned in place of the server
+            return self._wait_for_servers(
+                compute_client, server, boot_started, callback=_show_progress)
+
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
+            if _wait_for_server_status(
+                _server_poller(compute_client, since=boot_started),
                 server.id,
                 callback=_show_progress,
             ):
@@ -1118,6 +1303,7 @@ class DeleteServer(command.Command):
             action='store_true',
             help=_('Wait for delete to complete'),
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -1128,18 +1314,57 @@ class DeleteServer(command.Command):
                 self.app.stdout.flush()
 
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
+
+        def _delete_server(server):
             server_obj = utils.find_resource(
                 compute_client.servers, server)
             compute_client.servers.delete(server_obj.id)
-            if parsed_args.wait:
-                if not utils.wait_for_delete(compute_client.servers,
-                                             server_obj.id,
-                                             callback=_show_progress):
-                    LOG.error(_('Error deleting server: %s'),
-                              server_obj.id)
-                    self.app.stdout.write(_('Error deleting server\n'))
-                    raise SystemExit
+            return server_obj
+
+        auth_ref = self.app.client_manager.auth_ref
+        project_id = getattr(auth_ref, 'project_id', None)
+        started = timeutils.utcnow()
+
+        result = 0
+        server_ids = []
+        all_projects = False
+        for server, server_obj, e in concurrency.run_concurrently(
+                _delete_server, parsed_args.server,
+                workers=parsed_args.parallel):
+            if e is not None:
+                result += 1
+                LOG.error(_("Failed to delete server with "
+                            "name or ID '%(server)s': %(e)s"),
+                          {'server': server, 'e': e})
+            else:
+                server_ids.append(server_obj.id)
+                tenant_id = getattr(server_obj, 'tenant_id', None)
+                if project_id and tenant_id and tenant_id != project_id:
+                    all_projects = True
+
+        if parsed_args.wait and server_ids:
+            # Poll for all the deletions together with one request per
+            # cycle; progress is only meaningful for a single server.
+            server_waiter = waiter.Waiter(_server_poller(
+                compute_client, since=started, all_projects=all_projects))
+            deleted = server_waiter.wait_for_delete(
+                server_ids,
+                deleted_status=('deleted', 'soft_deleted'),
+                callback=_show_progress if len(server_ids) == 1 else None,
+            )
+            failed = [server_id for server_id in server_ids
+                      if not deleted.get(server_id)]
+            if failed:
+                for server_id in failed:
+                    LOG.error(_('Error deleting server: %s'), server_id)
+                self.app.stdout.write(_('Error deleting server\n'))
+                raise SystemExit
+
+        if result > 0:
+            total = len(parsed_args.server)
+            msg = (_("%(result)s of %(total)s servers failed "
+                   "to delete.") % {'result': result, 'total': total})
+            raise exceptions.CommandError(msg)
 
 
 class ListServer(command.Lister):
@@ -1232,8 +1457,9 @@ class ListServer(command.Lister):
             '--name-lookup-one-by-one',
             action='store_true',
             default=False,
-            help=_('When looking up flavor and image names, look them up'
-                   'one by one as needed instead of all together (default). '
+            help=_('When looking up flavor and image names, always look '
+                   'them up one by one as needed instead of listing all '
+                   'of them when many are referenced (default). '
                    'Mutually exclusive with "--no-name-lookup|-n" option.'),
         )
         parser.add_argument(
@@ -1461,44 +1687,30 @@ class ListServer(command.Lister):
         images = {}
         flavors = {}
         if data and not parsed_args.no_name_lookup:
-            # Create a dict that maps image_id to image object.
-            # Needed so that we can display the "Image Name" column.
-            # "Image Name" is not crucial, so we swallow any exceptions.
-            # The 'image' attribute can be an empty string if the server was
-            # booted from a volume.
-            if parsed_args.name_lookup_one_by_one or image_id:
-                for i_id in set(filter(lambda x: x is not None,
-                                       (s.image.get('id') for s in data
-                                        if s.image))):
-                    try:
-                        images[i_id] = image_client.images.get(i_id)
-                    except Exception:
-                        pass
-            else:
-                try:
-                    images_list = image_client.images.list()
-                    for i in images_list:
-                        images[i.id] = i
-                except Exception:
-                    pass
-
-            # Create a dict that maps flavor_id to flavor object.
-            # Needed so that we can display the "Flavor Name" column.
-            # "Flavor Name" is not crucial, so we swallow any exceptions.
-            if parsed_args.name_lookup_one_by_one or flavor_id:
-                for f_id in set(filter(lambda x: x is not None,
-                                       (s.flavor.get('id') for s in data))):
-                    try:
-                        flavors[f_id] = compute_client.flavors.get(f_id)
-                    except Exception:
-                        pass
-            else:
-                try:
-                    flavors_list = compute_client.flavors.list(is_public=None)
-                    for i in flavors_list:
-                        flavors[i.id] = i
-                except Exception:
-                    pass
+            # Create dicts that map image_id and flavor_id to the image and
+            # flavor objects, needed to display the "Image Name" and
+            # "Flavor Name" columns. Neither is crucial, so lookup failures
+            # are swallowed. The 'image' attribute can be an empty string if
+            # the server was booted from a volume. Servers filtered by image
+            # or flavor all reference the same one, so look it up directly.
+            image_ids = set(s.image['id'] for s in data
+                            if getattr(s, 'image', None) and
+                            s.image.get('id') is not None)
+            images = _lookup_by_ids(
+                image_ids,
+                image_client.images.get,
+                image_client.images.list,
+                one_by_one=parsed_args.name_lookup_one_by_one or image_id,
+            )
+            flavor_ids = set(s.flavor['id'] for s in data
+                             if getattr(s, 'flavor', None) and
+                             s.flavor.get('id') is not None)
+            flavors = _lookup_by_ids(
+                flavor_ids,
+                compute_client.flavors.get,
+                lambda: compute_client.flavors.list(is_public=None),
+                one_by_one=parsed_args.name_lookup_one_by_one or flavor_id,
+            )
 
         # Populate image_name, image_id, flavor_name and flavor_id attributes
         # of server objects so that we can display those columns.
@@ -1751,8 +1963,8 @@ revert to release the new server and restart the old one.""")
             server.migrate(**kwargs)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
+            if _wait_for_server_status(
+                _server_poller(compute_client),
                 server.id,
                 success_status=['active', 'verify_resize'],
                 callback=_show_progress,
@@ -1834,8 +2046,8 @@ class RebootServer(command.Command):
         server.reboot(parsed_args.reboot_type)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
+            if _wait_for_server_status(
+                _server_poller(compute_client),
                 server.id,
                 callback=_show_progress,
             ):
@@ -1944,8 +2156,8 @@ class RebuildServer(command.ShowOne):
 
         server = server.rebuild(image, parsed_args.password, **kwargs)
         if parsed_args.wait:
-            if utils.wait_for_status(
-                compute_client.servers.get,
+            if _wait_for_server_status(
+                _server_poller(compute_client),
                 server.id,
                 callback=_show_progress,
             ):
@@ -2190,8 +2402,9 @@ class RescueServer(command.Command):
 
         image = None
         if parsed_args.image:
-            image = utils.find_resource(
+            image = name_cache.find_resource(
                 image_client.images,
+                'image',
                 parsed_args.image,
             )
 
@@ -2260,8 +2473,8 @@ release the new server and restart the old one.""")
             )
             compute_client.servers.resize(server, flavor)
             if parsed_args.wait:
-                if utils.wait_for_status(
-                    compute_client.servers.get,
+                if _wait_for_server_status(
+                    _server_poller(compute_client),
                     server.id,
                     success_status=['active', 'verify_resize'],
                     callback=_show_progress,
@@ -16,11 +16,17 @@
 """Compute v2 Server operation event implementations"""
 
 import logging
+import os
 
+from novaclient import api_versions
+from osc_lib.cli import format_columns
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
+from oslo_utils import timeutils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 
 
@@ -38,7 +44,8 @@ class ListServerEvent(command.Lister):
         parser.add_argument(
             'server',
             metavar='<server>',
-            help=_('Server to list events (name or ID)'),
+            nargs='*',
+            help=_('Server(s) to list events (name or ID)'),
         )
         parser.add_argument(
             '--long',
@@ -46,13 +53,89 @@ class ListServerEvent(command.Lister):
             default=False,
             help=_("List additional fields in output")
         )
+        parser.add_argument(
+            '--details',
+            action='store_true',
+            default=False,
+            help=_("Also list the steps of each event and their results. "
+                   "The details of the events are fetched concurrently.")
+        )
+        parser.add_argument(
+            '--all-projects',
+            action='store_true',
+            default=bool(int(os.environ.get("ALL_PROJECTS", 0))),
+            help=_('Include servers of all projects when listing the '
+                   'events of servers changed since --changes-since '
+                   '(admin only)'),
+        )
+        parser.add_argument(
+            '--changes-since',
+            metavar='<changes-since>',
+            default=None,
+            help=_("List only events started after a certain point of time. "
+                   "Without <server>, list the events of every server "
+                   "changed since then. The provided time should be an "
+                   "ISO 8061 formatted time (e.g., 2016-03-04T06:27:59Z)."),
+        )
         return parser
 
+    def _find_server_ids(self, compute_client, parsed_args):
+        if parsed_args.server:
+            ids = []
+            for server, server_id, e in concurrency.run_concurrently(
+                    lambda s: utils.find_resource(
+                        compute_client.servers, s).id,
+                    parsed_args.server):
+                if e is not None:
+                    raise e
+                ids.append(server_id)
+            return ids
+
+        search_opts = {'changes-since': parsed_args.changes_since}
+        if parsed_args.all_projects:
+            search_opts['all_tenants'] = True
+        return [s.id for s in compute_client.servers.list(
+            search_opts=search_opts, limit=-1)]
+
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        server_id = utils.find_resource(compute_client.servers,
-                                        parsed_args.server).id
-        data = compute_client.instance_action.list(server_id)
+
+        since = None
+        if parsed_args.changes_since:
+            try:
+                since = timeutils.normalize_time(
+                    timeutils.parse_isotime(parsed_args.changes_since))
+            except ValueError:
+                raise exceptions.CommandError(
+                    _('Invalid changes-since value: %s') %
+                    parsed_args.changes_since
+                )
+        elif not parsed_args.server:
+            msg = _('Specify at least one server or --changes-since')
+            raise exceptions.CommandError(msg)
+
+        server_ids = self._find_server_ids(compute_client, parsed_args)
+
+        list_kwargs = {}
+        if (since and compute_client.api_version >=
+                api_versions.APIVersion('2.58')):
+            list_kwargs['changes_since'] = parsed_args.changes_since
+
+        data = []
+        for server_id, actions, e in concurrency.run_concurrently(
+                lambda server_id: compute_client.instance_action.list(
+                    server_id, **list_kwargs),
+                server_ids):
+            if e is not None:
+                if len(server_ids) == 1:
+                    raise e
+                LOG.error(_("Failed to list events of server %(server)s: "
+                            "%(e)s"), {'server': server_id, 'e': e})
+                continue
+            data.extend(
+                a for a in actions
+                if not since or timeutils.normalize_time(
+                    timeutils.parse_isotime(a.start_time)) >= since)
 
         if parsed_args.long:
             columns = (
@@ -87,9 +170,28 @@ class ListServerEvent(command.Lister):
                 'Start Time',
             )
 
-        return (column_headers,
-                (utils.get_item_properties(
-                    s, columns,
+        if not parsed_args.details:
+            return (column_headers,
+                    (utils.get_item_properties(
+                        s, columns,
+                    ) for s in data))
+
+        events = {}
+        for action, detail, e in concurrency.run_concurrently(
+                lambda a: compute_client.instance_action.get(
+                    a.instance_uuid, a.request_id),
+                data):
+            if e is not None:
+                LOG.debug('Failed to get details of event %s: %s',
+                          action.request_id, e)
+                continue
+            events[action.request_id] = [
+                '%s: %s' % (event.get('event'), event.get('result'))
+                for event in getattr(detail, 'events', None) or []]
+
+        return (column_headers + ('Events',),
+                (utils.get_item_properties(s, columns) + (
+                    format_columns.ListColumn(events.get(s.request_id)),
                 ) for s in data))
 
 
@@ -23,6 +23,7 @@ from keystoneclient.v3 import users
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import name_cache
 from openstackclient.i18n import _
 
 
@@ -142,7 +143,7 @@ def _get_domain_id_if_requested(identity_client, domain_name_or_id):
 
 def find_domain(identity_client, name_or_id):
     return _find_identity_resource(identity_client.domains, name_or_id,
-                                   domains.Domain)
+                                   domains.Domain, cache_type='domain')
 
 
 def find_group(identity_client, name_or_id, domain_name_or_id=None):
@@ -159,24 +160,26 @@ def find_project(identity_client, name_or_id, domain_name_or_id=None):
     domain_id = _get_domain_id_if_requested(identity_client, domain_name_or_id)
     if not domain_id:
         return _find_identity_resource(identity_client.projects, name_or_id,
-                                       projects.Project)
+                                       projects.Project, cache_type='project')
     else:
         return _find_identity_resource(identity_client.projects, name_or_id,
-                                       projects.Project, domain_id=domain_id)
+                                       projects.Project, cache_type='project',
+                                       domain_id=domain_id)
 
 
 def find_user(identity_client, name_or_id, domain_name_or_id=None):
     domain_id = _get_domain_id_if_requested(identity_client, domain_name_or_id)
     if not domain_id:
         return _find_identity_resource(identity_client.users, name_or_id,
-                                       users.User)
+                                       users.User, cache_type='user')
     else:
         return _find_identity_resource(identity_client.users, name_or_id,
-                                       users.User, domain_id=domain_id)
+                                       users.User, cache_type='user',
+                                       domain_id=domain_id)
 
 
 def _find_identity_resource(identity_client_manager, name_or_id,
-                            resource_type, **kwargs):
+                            resource_type, cache_type=None, **kwargs):
     """Find a specific identity resource.
 
     Using keystoneclient's manager, attempt to find a specific resource by its
@@ -196,6 +199,9 @@ def _find_identity_resource(identity_client_manager, name_or_id,
     :type name_or_id: string
     :param resource_type: class that represents the resource type
     :type resource_type: `keystoneclient.base.Resource`
+    :param cache_type: the name cache resource type, if the name to ID
+                       mapping may be cached
+    :type cache_type: string
 
     :returns: the resource in question
     :rtype: `keystoneclient.base.Resource`
@@ -203,8 +209,12 @@ def _find_identity_resource(identity_client_manager, name_or_id,
     """
 
     try:
-        identity_resource = utils.find_resource(identity_client_manager,
-                                                name_or_id, **kwargs)
+        if cache_type:
+            identity_resource = name_cache.find_resource(
+                identity_client_manager, cache_type, name_or_id, **kwargs)
+        else:
+            identity_resource = utils.find_resource(identity_client_manager,
+                                                    name_or_id, **kwargs)
         if identity_resource is not None:
             return identity_resource
     except exceptions.Forbidden:
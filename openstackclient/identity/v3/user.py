@@ -15,7 +15,9 @@
 
 """Identity v3 User action implementations"""
 
+import collections
 import copy
+import functools
 import logging
 
 from keystoneauth1 import exceptions as ks_exc
@@ -24,12 +26,54 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common
 
 
 LOG = logging.getLogger(__name__)
 
+# Above this many users of a domain, listing the domain's users costs fewer
+# requests than fetching each user.
+USER_LOOKUP_BULK_THRESHOLD = 50
+
+_AssignedUser = collections.namedtuple('_AssignedUser', ['id', 'name'])
+
+
+def _get_users(identity_client, user_refs):
+    """Fetch users referenced by role assignments
+
+    The users of a domain are listed in one request when there are many of
+    them, otherwise they are fetched concurrently by ID.
+
+    :param user_refs: a dict mapping user IDs to the user references of
+                      their role assignments
+    :returns: a list of the users, in the order of ``user_refs``
+    :raises: CommandError if a user cannot be found
+    """
+    by_domain = collections.defaultdict(set)
+    for user_id, ref in user_refs.items():
+        by_domain[(ref.get('domain') or {}).get('id')].add(user_id)
+
+    users = {}
+    for domain_id, user_ids in by_domain.items():
+        if domain_id and len(user_ids) > USER_LOOKUP_BULK_THRESHOLD:
+            try:
+                users.update((u.id, u) for u in
+                             identity_client.users.list(domain=domain_id)
+                             if u.id in user_ids)
+            except Exception as e:
+                LOG.debug('Failed to list users of domain %s: %s',
+                          domain_id, e)
+    find_user = functools.partial(utils.find_resource, identity_client.users)
+    missing = [user_id for user_id in user_refs if user_id not in users]
+    for user_id, user, exc in concurrency.run_concurrently(find_user,
+                                                           missing):
+        if exc is not None:
+            raise exc
+        users[user_id] = user
+    return [users[user_id] for user_id in user_refs]
+
 
 class CreateUser(command.ShowOne):
     _description = _("Create new user")
@@ -154,6 +198,7 @@ class DeleteUser(command.Command):
             metavar='<domain>',
             help=_('Domain owning <user> (name or ID)'),
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -162,18 +207,22 @@ class DeleteUser(command.Command):
         domain = None
         if parsed_args.domain:
             domain = common.find_domain(identity_client, parsed_args.domain)
+
+        def _delete_user(user):
+            if domain is not None:
+                user_obj = utils.find_resource(identity_client.users,
+                                               user,
+                                               domain_id=domain.id)
+            else:
+                user_obj = utils.find_resource(identity_client.users,
+                                               user)
+            identity_client.users.delete(user_obj.id)
+
         errors = 0
-        for user in parsed_args.users:
-            try:
-                if domain is not None:
-                    user_obj = utils.find_resource(identity_client.users,
-                                                   user,
-                                                   domain_id=domain.id)
-                else:
-                    user_obj = utils.find_resource(identity_client.users,
-                                                   user)
-                identity_client.users.delete(user_obj.id)
-            except Exception as e:
+        for user, _r, e in concurrency.run_concurrently(
+                _delete_user, parsed_args.users,
+                workers=parsed_args.parallel):
+            if e is not None:
                 errors += 1
                 LOG.error(_("Failed to delete user with "
                           "name or ID '%(user)s': %(e)s"),
@@ -243,22 +292,23 @@ class ListUser(command.Lister):
                 ).id
 
             assignments = identity_client.role_assignments.list(
-                project=project)
+                project=project, include_names=True)
 
             # NOTE(stevemar): If a user has more than one role on a project
             # then they will have two entries in the returned data. Since we
             # are looking for any role, let's just track unique user IDs.
-            user_ids = set()
+            user_refs = collections.OrderedDict()
             for assignment in assignments:
                 if hasattr(assignment, 'user'):
-                    user_ids.add(assignment.user['id'])
-
-            # NOTE(stevemar): Call find_resource once we have unique IDs, so
-            # it's fewer trips to the Identity API, then collect the data.
-            data = []
-            for user_id in user_ids:
-                user = utils.find_resource(identity_client.users, user_id)
-                data.append(user)
+                    user_refs[assignment.user['id']] = assignment.user
+
+            if not parsed_args.long and all(
+                    'name' in ref for ref in user_refs.values()):
+                # The names included in the assignments are all we need
+                data = [_AssignedUser(user_id, ref['name'])
+                        for user_id, ref in user_refs.items()]
+            else:
+                data = _get_users(identity_client, user_refs)
 
         else:
             data = identity_client.users.list(
@@ -17,7 +17,11 @@
 
 import argparse
 from base64 import b64encode
+from concurrent import futures
+import hashlib
 import logging
+import os
+import time
 
 from glanceclient.common import utils as gc_utils
 from openstack.image import image_signer
@@ -29,6 +33,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common
 
@@ -39,6 +44,22 @@ DEFAULT_DISK_FORMAT = 'raw'
 DISK_CHOICES = ["ami", "ari", "aki", "vhd", "vmdk", "raw", "qcow2", "vhdx",
                 "vdi", "iso", "ploop"]
 MEMBER_STATUS_CHOICES = ["accepted", "pending", "rejected", "all"]
+# The hash algorithm Glance uses for os_hash_value unless configured
+# otherwise
+DEFAULT_HASH_ALGO = 'sha512'
+UPLOAD_CHUNK_SIZE = 4 * 1024 * 1024
+# Image attributes Glance does not accept as list filters; --property
+# filters on these are applied by the client instead.
+UNFILTERABLE_ATTRIBUTES = ["checksum", "created_at", "file", "limit",
+                           "locations", "marker", "min_disk", "min_ram",
+                           "os_hash_algo", "os_hash_value", "schema", "self",
+                           "size", "sort", "sort_dir", "sort_key", "tags",
+                           "updated_at", "virtual_size"]
+# Keys that image_list() takes as its own arguments rather than passing
+# them on as filters; --property filters on these are applied by the
+# client too.
+IMAGE_LIST_ARGUMENTS = ["community", "detailed", "private", "public",
+                        "shared", "visibility"]
 
 
 LOG = logging.getLogger(__name__)
@@ -75,6 +96,149 @@ def _format_image(image):
     return info
 
 
+def _list_image_pages(image_client, limit=None, **kwargs):
+    """Yield images page by page, fetching the next page in the background
+
+    The request for the next page is issued as soon as the current one
+    arrives so that it overlaps with the caller processing the current
+    page.  Only a single page is fetched if ``limit`` is given.
+    """
+
+    def _fetch(marker):
+        page_kwargs = dict(kwargs)
+        if limit:
+            page_kwargs['limit'] = limit
+        return image_client.api.image_list(marker=marker, **page_kwargs)
+
+    with futures.ThreadPoolExecutor(max_workers=1) as executor:
+        page = executor.submit(_fetch, kwargs.pop('marker', None))
+        while True:
+            images = page.result()
+            if not images:
+                return
+            if not limit:
+                # Set the marker to the id of the last item we received
+                page = executor.submit(_fetch, images[-1]['id'])
+            yield images
+            if limit:
+                return
+
+
+class _UploadReader(object):
+    """Read image data for upload, hashing it on a background thread
+
+    The file is read in large chunks which are handed to a single worker
+    thread that updates the MD5 checksum and the multihash while the
+    previous chunk is being sent, so the data is only read once.
+
+    :param fileobj: the file to read the image data from
+    :param progress: called with the number of bytes read so far and the
+                     bytes per second after each chunk is read
+    :param hash_algo: the algorithm of the multihash
+    :param chunk_size: the number of bytes to read from the file at once
+    """
+
+    def __init__(self, fileobj, progress=None, hash_algo=DEFAULT_HASH_ALGO,
+                 chunk_size=UPLOAD_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.progress = progress
+        self.hash_algo = hash_algo
+        self.chunk_size = chunk_size
+        self.checksum = hashlib.md5()  # nosec
+        self.multihash = hashlib.new(hash_algo)
+        self.bytes_read = 0
+        self.eof = False
+        self._buffer = b''
+        self._offset = 0
+        self._hashing = None
+        self._executor = futures.ThreadPoolExecutor(max_workers=1)
+        self._started = time.time()
+
+    @property
+    def elapsed(self):
+        return time.time() - self._started
+
+    def _hash(self, chunk):
+        self.checksum.update(chunk)
+        self.multihash.update(chunk)
+
+    def _fill(self):
+        chunk = self.fileobj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return
+        # Only keep one chunk waiting to be hashed so memory use is bounded
+        if self._hashing is not None:
+            self._hashing.result()
+        self._hashing = self._executor.submit(self._hash, chunk)
+        self._buffer = chunk
+        self._offset = 0
+        self.bytes_read += len(chunk)
+        if self.progress:
+            elapsed = self.elapsed
+            self.progress(self.bytes_read,
+                          self.bytes_read / elapsed if elapsed else 0)
+
+    def read(self, size=-1):
+        if self._offset >= len(self._buffer) and not self.eof:
+            self._fill()
+        if size is None or size < 0:
+            size = len(self._buffer) - self._offset
+        data = self._buffer[self._offset:self._offset + size]
+        self._offset += len(data)
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self):
+        """Wait for the hashing to finish"""
+        self._executor.shutdown(wait=True)
+
+
+def _verify_upload(image, reader):
+    """Compare the hashes Glance computed with those of the uploaded data"""
+    expected = [('checksum', getattr(image, 'checksum', None),
+                 reader.checksum.hexdigest())]
+    if getattr(image, 'os_hash_algo', None) == reader.hash_algo:
+        expected.append(('os_hash_value',
+                         getattr(image, 'os_hash_value', None),
+                         reader.multihash.hexdigest()))
+    for attr, actual, uploaded in expected:
+        if actual and actual != uploaded:
+            msg = (_("Image %(image)s was uploaded but its %(attr)s "
+                     "%(actual)s does not match %(uploaded)s computed from "
+                     "the uploaded data")
+                   % {'image': image.id, 'attr': attr, 'actual': actual,
+                      'uploaded': uploaded})
+            raise exceptions.CommandError(msg)
+
+
+def _progress_reporter(stream, action, total=None):
+    """Return a callback writing the progress of a transfer to a stream"""
+
+    def _show_progress(done, rate):
+        values = {
+            'action': action,
+            'done': utils.format_size(done),
+            'rate': utils.format_size(rate),
+        }
+        if total:
+            values['total'] = utils.format_size(total)
+            values['percent'] = done * 100 // total
+            msg = _("%(action)s %(done)s of %(total)s (%(percent)d%%) at "
+                    "%(rate)s/s")
+        else:
+            msg = _("%(action)s %(done)s at %(rate)s/s")
+        stream.write('\r' + msg % values)
+
+    return _show_progress
+
+
 class AddProjectToImage(command.ShowOne):
     _description = _("Associate project with image")
 
@@ -179,6 +343,12 @@ class CreateImage(command.ShowOne):
             metavar="<volume>",
             help=_("Create image from a volume"),
         )
+        parser.add_argument(
+            "--progress",
+            action="store_true",
+            default=False,
+            help=_("Show upload progress and throughput"),
+        )
         parser.add_argument(
             "--force",
             dest='force',
@@ -396,9 +566,20 @@ class CreateImage(command.ShowOne):
             image = image_client.images.create(**kwargs)
 
         if fp is not None:
+            progress = None
+            if parsed_args.progress:
+                total = None
+                if parsed_args.file:
+                    try:
+                        total = os.path.getsize(parsed_args.file)
+                    except OSError:
+                        pass
+                progress = _progress_reporter(
+                    self.app.stderr, _('Uploaded'), total)
+            reader = _UploadReader(fp, progress=progress)
             with fp:
                 try:
-                    image_client.images.upload(image.id, fp)
+                    image_client.images.upload(image.id, reader)
                 except Exception:
                     # If the upload fails for some reason attempt to remove the
                     # dangling queued image made by the create() call above but
@@ -410,9 +591,19 @@ class CreateImage(command.ShowOne):
                     except Exception:
                         pass  # we don't care about this one
                     raise  # now, throw the upload exception again
+                finally:
+                    reader.close()
+                    if parsed_args.progress:
+                        self.app.stderr.write('\n')
+
+                LOG.debug('Uploaded %(bytes)d bytes in %(elapsed).1fs',
+                          {'bytes': reader.bytes_read,
+                           'elapsed': reader.elapsed})
 
                 # update the image after the data has been uploaded
                 image = image_client.images.get(image.id)
+                if reader.eof:
+                    _verify_upload(image, reader)
 
         if not info:
             info = _format_image(image)
@@ -431,20 +622,25 @@ class DeleteImage(command.Command):
             nargs="+",
             help=_("Image(s) to delete (name or ID)"),
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
 
         del_result = 0
         image_client = self.app.client_manager.image
-        for image in parsed_args.images:
-            try:
-                image_obj = utils.find_resource(
-                    image_client.images,
-                    image,
-                )
-                image_client.images.delete(image_obj.id)
-            except Exception as e:
+
+        def _delete_image(image):
+            image_obj = utils.find_resource(
+                image_client.images,
+                image,
+            )
+            image_client.images.delete(image_obj.id)
+
+        for image, _r, e in concurrency.run_concurrently(
+                _delete_image, parsed_args.images,
+                workers=parsed_args.parallel):
+            if e is not None:
                 del_result += 1
                 LOG.error(_("Failed to delete image with name or "
                             "ID '%(image)s': %(e)s"),
@@ -543,7 +739,7 @@ class ListImage(command.Lister):
         parser.add_argument(
             '--sort',
             metavar="<key>[:<direction>]",
-            default='name:asc',
+            default=None,
             help=_("Sort output by selected keys and directions(asc or desc) "
                    "(default: name:asc), multiple keys and directions can be "
                    "specified separated by comma"),
@@ -620,36 +816,42 @@ class ListImage(command.Lister):
             columns = ("ID", "Name", "Status")
             column_headers = columns
 
-        # List of image data received
-        data = []
-        limit = None
-        if 'limit' in kwargs:
-            limit = kwargs['limit']
+        # Push property filters down to Glance where it supports them and
+        # filter the rest on the client
+        client_filters = {}
+        for attr, value in (parsed_args.property or {}).items():
+            if (attr in kwargs or attr in UNFILTERABLE_ATTRIBUTES or
+                    attr in IMAGE_LIST_ARGUMENTS):
+                client_filters[attr] = value
+            else:
+                kwargs[attr] = value
+
+        # Without an explicit --sort let Glance order the images so that
+        # rows can be output as the pages arrive
+        if not parsed_args.sort:
+            kwargs['sort_key'] = 'name'
+            kwargs['sort_dir'] = 'asc'
+
         if 'marker' in kwargs:
-            data = image_client.api.image_list(**kwargs)
+            pages = [image_client.api.image_list(**kwargs)]
         else:
-            # No pages received yet, so start the page marker at None.
-            marker = None
-            while True:
-                page = image_client.api.image_list(marker=marker, **kwargs)
-                if not page:
-                    break
-                data.extend(page)
-                # Set the marker to the id of the last item we received
-                marker = page[-1]['id']
-                if limit:
-                    break
-
-        if parsed_args.property:
-            for attr, value in parsed_args.property.items():
-                api_utils.simple_filter(
-                    data,
-                    attr=attr,
-                    value=value,
-                    property_field='properties',
-                )
-
-        data = utils.sort_items(data, parsed_args.sort, str)
+            pages = _list_image_pages(image_client, **kwargs)
+
+        def _filter(pages):
+            for page in pages:
+                for attr, value in client_filters.items():
+                    api_utils.simple_filter(
+                        page,
+                        attr=attr,
+                        value=value,
+                        property_field='properties',
+                    )
+                for image in page:
+                    yield image
+
+        data = _filter(pages)
+        if parsed_args.sort:
+            data = utils.sort_items(list(data), parsed_args.sort, str)
 
         return (
             column_headers,
@@ -744,14 +946,71 @@ class SaveImage(command.Command):
             metavar="<image>",
             help=_("Image to save (name or ID)"),
         )
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Download up to <num-workers> ranges of the image '
+                   'concurrently (default: 1)'),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            metavar='<bytes>',
+            type=int,
+            help=_('Size of each range downloaded with --parallel '
+                   '(default: 64 MiB)'),
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=_('Resume a partial download into an existing file'),
+        )
+        parser.add_argument(
+            '--progress',
+            action='store_true',
+            help=_('Show download progress and throughput'),
+        )
         return parser
 
     def take_action(self, parsed_args):
+        if parsed_args.chunk_size is not None and \
+                parsed_args.chunk_size <= 0:
+            msg = _('--chunk-size must be a positive number of bytes')
+            raise exceptions.CommandError(msg)
+        ranged = (parsed_args.parallel > 1 or parsed_args.resume or
+                  parsed_args.progress)
+        if ranged and not parsed_args.file:
+            msg = _('--parallel, --resume and --progress require --file')
+            raise exceptions.CommandError(msg)
+
         image_client = self.app.client_manager.image
         image = utils.find_resource(
             image_client.images,
             parsed_args.image,
         )
+
+        if ranged:
+            if image.get('size') is None:
+                msg = _('Image %s has no data.') % image.id
+                LOG.error(msg)
+                self.app.stdout.write(msg + '\n')
+                raise SystemExit
+            progress = None
+            if parsed_args.progress:
+                progress = _progress_reporter(
+                    self.app.stderr, _('Saved'), image['size'])
+            try:
+                image_client.api.image_save(
+                    image,
+                    parsed_args.file,
+                    workers=parsed_args.parallel,
+                    chunk_size=parsed_args.chunk_size,
+                    resume=parsed_args.resume,
+                    progress=progress,
+                )
+            finally:
+                if parsed_args.progress:
+                    self.app.stderr.write('\n')
+            return
+
         data = image_client.images.data(image.id)
 
         if data.wrapped is None:
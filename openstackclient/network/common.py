@@ -13,6 +13,7 @@
 
 import abc
 import contextlib
+import copy
 import logging
 
 import openstack.exceptions
@@ -20,6 +21,7 @@ from osc_lib.command import command
 from osc_lib import exceptions
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 
 
@@ -189,20 +191,35 @@ class NetworkAndComputeDelete(NetworkAndComputeCommand):
     following the rules in doc/source/command-errors.rst.
     """
 
+    def get_parser(self, prog_name):
+        parser = super(NetworkAndComputeDelete, self).get_parser(prog_name)
+        concurrency.add_parallel_option_to_parser(parser)
+        return parser
+
+    def _delete_one(self, r, parsed_args):
+        # The subclasses find the resource to delete in self.r, so give each
+        # deletion its own copy of the command to allow running them
+        # concurrently.
+        cmd = copy.copy(self)
+        cmd.r = r
+        if self.app.client_manager.is_network_endpoint_enabled():
+            cmd.take_action_network(self.app.client_manager.network,
+                                    parsed_args)
+        else:
+            cmd.take_action_compute(self.app.client_manager.compute,
+                                    parsed_args)
+
     def take_action(self, parsed_args):
         ret = 0
         resources = getattr(parsed_args, self.resource, [])
 
-        for r in resources:
-            self.r = r
-            try:
-                if self.app.client_manager.is_network_endpoint_enabled():
-                    self.take_action_network(self.app.client_manager.network,
-                                             parsed_args)
-                else:
-                    self.take_action_compute(self.app.client_manager.compute,
-                                             parsed_args)
-            except Exception as e:
+        results = concurrency.run_concurrently(
+            lambda r: self._delete_one(r, parsed_args),
+            resources,
+            workers=getattr(parsed_args, 'parallel', 1),
+        )
+        for r, _r, e in results:
+            if e is not None:
                 msg = _("Failed to delete %(resource)s with name or ID "
                         "'%(name_or_id)s': %(e)s") % {
                             "resource": self.resource,
@@ -25,6 +25,7 @@ from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import common
@@ -478,17 +479,21 @@ class DeletePort(command.Command):
             nargs="+",
             help=_("Port(s) to delete (name or ID)")
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.network
         result = 0
 
-        for port in parsed_args.port:
-            try:
-                obj = client.find_port(port, ignore_missing=False)
-                client.delete_port(obj)
-            except Exception as e:
+        def _delete_port(port):
+            obj = client.find_port(port, ignore_missing=False)
+            client.delete_port(obj)
+
+        for port, _r, e in concurrency.run_concurrently(
+                _delete_port, parsed_args.port,
+                workers=parsed_args.parallel):
+            if e is not None:
                 result += 1
                 LOG.error(_("Failed to delete port with "
                             "name or ID '%(port)s': %(e)s"),
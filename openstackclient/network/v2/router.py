@@ -24,6 +24,7 @@ from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import sdk_utils
@@ -267,17 +268,21 @@ class DeleteRouter(command.Command):
             nargs="+",
             help=_("Router(s) to delete (name or ID)")
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.network
         result = 0
 
-        for router in parsed_args.router:
-            try:
-                obj = client.find_router(router, ignore_missing=False)
-                client.delete_router(obj)
-            except Exception as e:
+        def _delete_router(router):
+            obj = client.find_router(router, ignore_missing=False)
+            client.delete_router(obj)
+
+        for router, _r, e in concurrency.run_concurrently(
+                _delete_router, parsed_args.router,
+                workers=parsed_args.parallel):
+            if e is not None:
                 result += 1
                 LOG.error(_("Failed to delete router with "
                           "name or ID '%(router)s': %(e)s"),
@@ -16,12 +16,15 @@
 import argparse
 import logging
 
+from openstack import exceptions as sdk_exceptions
 from osc_lib.cli import format_columns
 from osc_lib.cli import parseractions
 from osc_lib import exceptions
 from osc_lib import utils
 import six
+import yaml
 
+from openstackclient.common import name_cache
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import common
@@ -36,12 +39,73 @@ _formatters = {
     'location': format_columns.DictColumn,
 }
 
+# Rules created from a file are sent to Neutron this many at a time
+BULK_CREATE_BATCH_SIZE = 100
+
+# The keys of a rule in a rules file, which match the rule options
+RULE_FILE_KEYS = (
+    'description',
+    'direction',
+    'dst_port',
+    'ethertype',
+    'icmp_code',
+    'icmp_type',
+    'protocol',
+    'remote_group',
+    'remote_ip',
+)
+
 
 def _format_security_group_rule_show(obj):
     data = network_utils.transform_compute_security_group_rule(obj)
     return zip(*sorted(six.iteritems(data)))
 
 
+def _iter_compute_rules(groups):
+    """Yield the rules of nova-network security groups one at a time"""
+    for group in groups:
+        for rule in group['rules']:
+            yield rule
+
+
+def _find_compute_security_group_rule(client, rule_id):
+    """Find a nova-network security group rule by ID
+
+    Compute has no API to get a single rule, so the security groups are
+    searched for it, stopping at the first match.  When the name cache is
+    enabled it remembers the group of each rule found, and of the other
+    rules in that group, so that the next lookup only fetches that group.
+
+    :param client: a compute client
+    :param rule_id: the rule ID
+    :returns: the rule dict, or None if it was not found
+    """
+    cache = name_cache.get_cache()
+    if cache is not None:
+        group_id = cache.get('security_group_rule', rule_id)
+        if group_id is not None:
+            try:
+                group = client.api.security_group_find(str(group_id))
+            except Exception:
+                # Stale entry, fall back to searching every group
+                LOG.debug('Cached security group %s not found', group_id)
+            else:
+                for rule in group['rules']:
+                    if rule_id == str(rule.get('id')):
+                        return rule
+
+    for group in client.api.security_group_list():
+        for rule in group['rules']:
+            if rule_id != str(rule.get('id')):
+                continue
+            if cache is not None:
+                for group_rule in group['rules']:
+                    cache.set('security_group_rule',
+                              str(group_rule.get('id')), group['id'])
+            return rule
+    return None
+
+
 def _format_network_port_range(rule):
     # Display port range or ICMP type and code. For example:
     # - ICMP type: 'type=3'
@@ -98,6 +162,100 @@ def _convert_ipvx_case(string):
     return string
 
 
+def _load_rules_file(path):
+    """Load the list of rules from a YAML or JSON file"""
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except (IOError, OSError, yaml.YAMLError) as e:
+        msg = _("Unable to load rules from %(file)s: %(e)s")
+        raise exceptions.CommandError(msg % {'file': path, 'e': e})
+    if isinstance(data, dict):
+        data = data.get('rules')
+    if not isinstance(data, list):
+        msg = _("%s must hold a list of rules, or a mapping with the "
+                "list under 'rules'")
+        raise exceptions.CommandError(msg % path)
+    return data
+
+
+def _parse_port_range(value):
+    if isinstance(value, int):
+        return (value, value)
+    start, sep, end = str(value).partition(':')
+    start = int(start)
+    end = int(end) if sep else start
+    if start > end:
+        raise ValueError(_("invalid port range %s") % value)
+    return (start, end)
+
+
+def _parse_rule(rule):
+    """Turn a rule read from a file into the options of a single rule
+
+    :raises ValueError: if the rule is not valid
+    """
+    if not isinstance(rule, dict):
+        raise ValueError(_("a rule must be a mapping"))
+    rule = dict((k.replace('-', '_'), v) for k, v in rule.items())
+    unknown = set(rule) - set(RULE_FILE_KEYS)
+    if unknown:
+        raise ValueError(_("unknown keys %s") % ', '.join(sorted(unknown)))
+
+    direction = rule.get('direction', 'ingress')
+    if direction not in ('ingress', 'egress'):
+        raise ValueError(_("direction must be ingress or egress"))
+    ethertype = rule.get('ethertype')
+    if ethertype is not None:
+        ethertype = _convert_ipvx_case(str(ethertype))
+        if ethertype not in ('IPv4', 'IPv6'):
+            raise ValueError(_("ethertype must be IPv4 or IPv6"))
+    if (rule.get('remote_ip') is not None and
+            rule.get('remote_group') is not None):
+        raise ValueError(_("remote_ip and remote_group are exclusive"))
+
+    def _int(key):
+        return int(rule[key]) if rule.get(key) is not None else None
+
+    return argparse.Namespace(
+        protocol=(_convert_to_lowercase(str(rule['protocol']))
+                  if rule.get('protocol') is not None else None),
+        proto=None,
+        description=rule.get('description'),
+        ingress=direction == 'ingress',
+        egress=direction == 'egress',
+        ethertype=ethertype,
+        dst_port=(_parse_port_range(rule['dst_port'])
+                  if rule.get('dst_port') is not None else None),
+        icmp_type=_int('icmp_type'),
+        icmp_code=_int('icmp_code'),
+        remote_group=rule.get('remote_group'),
+        remote_ip=rule.get('remote_ip'),
+    )
+
+
+def _network_rule_key(rule, ethertype):
+    """Return the attributes that tell apart the rules of a group
+
+    :param rule: a dict of rule attributes
+    :param ethertype: the rule ethertype, whose key differs between the
+                      API and SDK resources
+    """
+    remote_ip_prefix = rule.get('remote_ip_prefix')
+    # Rules for any address may have no prefix at all
+    if remote_ip_prefix in ('0.0.0.0/0', '::/0'):
+        remote_ip_prefix = None
+    return (
+        rule.get('direction'),
+        ethertype,
+        rule.get('protocol'),
+        rule.get('port_range_min'),
+        rule.get('port_range_max'),
+        remote_ip_prefix,
+        rule.get('remote_group_id'),
+    )
+
+
 def _is_icmp_protocol(protocol):
     # NOTE(rtheis): Neutron has deprecated protocol icmpv6.
     # However, while the OSC CLI doesn't document the protocol,
@@ -247,6 +405,24 @@ class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
         )
         identity_common.add_project_domain_option_to_parser(
             parser, enhance_help=self.enhance_help_neutron)
+        parser.add_argument(
+            '--from-file',
+            metavar='<file>',
+            help=self.enhance_help_neutron(
+                _("Create the rules listed in a YAML or JSON file instead "
+                  "of a single rule. Each rule is a mapping with any of "
+                  "the keys direction (ingress or egress), ethertype, "
+                  "protocol, dst-port, icmp-type, icmp-code, remote-ip, "
+                  "remote-group and description. Rules the group already "
+                  "has are skipped"))
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help=self.enhance_help_neutron(
+                _("With --from-file, only show which rules would be "
+                  "created and which are skipped as they already exist"))
+        )
         return parser
 
     def _get_protocol(self, parsed_args, default_protocol='any'):
@@ -278,14 +454,13 @@ class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
         else:
             return False
 
-    def take_action_network(self, client, parsed_args):
-        # Get the security group ID to hold the rule.
-        security_group_id = client.find_security_group(
-            parsed_args.group,
-            ignore_missing=False
-        ).id
+    def _get_network_attrs(self, parsed_args, find_group):
+        """Build the create attributes of a rule from its options
 
-        # Build the create attributes.
+        :param parsed_args: the rule options
+        :param find_group: a callable returning the ID of a security group
+                           given its name or ID
+        """
         attrs = {}
         attrs['protocol'] = self._get_protocol(parsed_args)
 
@@ -331,17 +506,119 @@ class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
             attrs['port_range_max'] = parsed_args.icmp_code
 
         if parsed_args.remote_group is not None:
-            attrs['remote_group_id'] = client.find_security_group(
-                parsed_args.remote_group,
-                ignore_missing=False
-            ).id
+            attrs['remote_group_id'] = find_group(parsed_args.remote_group)
         elif parsed_args.remote_ip is not None:
             attrs['remote_ip_prefix'] = parsed_args.remote_ip
         elif attrs['ethertype'] == 'IPv4':
             attrs['remote_ip_prefix'] = '0.0.0.0/0'
         elif attrs['ethertype'] == 'IPv6':
             attrs['remote_ip_prefix'] = '::/0'
-        attrs['security_group_id'] = security_group_id
+        return attrs
+
+    def _create_from_file(self, client, parsed_args, security_group_id,
+                          find_group, project_id):
+        """Create the rules of a file that the group does not have yet"""
+        rule_options = [
+            'description', 'dst_port', 'egress', 'ethertype', 'icmp_code',
+            'icmp_type', 'ingress', 'proto', 'protocol', 'remote_group',
+            'remote_ip',
+        ]
+        given = [o for o in rule_options if getattr(parsed_args, o, None)]
+        if given:
+            msg = _("--from-file cannot be used with --%s")
+            raise exceptions.CommandError(
+                msg % given[0].replace('_', '-'))
+
+        # Validate every rule before creating any
+        new_rules = []
+        for index, rule in enumerate(
+                _load_rules_file(parsed_args.from_file)):
+            try:
+                attrs = self._get_network_attrs(_parse_rule(rule), find_group)
+            except (ValueError, exceptions.CommandError) as e:
+                msg = _("Invalid rule %(index)d in %(file)s: %(e)s")
+                raise exceptions.CommandError(msg % {
+                    'index': index + 1,
+                    'file': parsed_args.from_file,
+                    'e': e,
+                })
+            attrs['security_group_id'] = security_group_id
+            if project_id is not None:
+                attrs['tenant_id'] = project_id
+            new_rules.append(attrs)
+
+        existing = {}
+        for rule in client.security_group_rules(
+                security_group_id=security_group_id):
+            rule = rule.to_dict()
+            existing[_network_rule_key(rule, rule['ether_type'])] = rule['id']
+        to_create = []
+        skipped = []
+        for attrs in new_rules:
+            key = _network_rule_key(attrs, attrs['ethertype'])
+            if key in existing:
+                # Rules repeated in the file are only created once
+                if existing[key] is not None:
+                    skipped.append(existing[key])
+                continue
+            existing[key] = None
+            to_create.append(attrs)
+
+        if parsed_args.dry_run:
+            would_create = []
+            for attrs in to_create:
+                rule = {'port_range_min': None, 'port_range_max': None}
+                rule.update(attrs)
+                would_create.append(' '.join(str(v) for v in (
+                    rule['direction'],
+                    rule['ethertype'],
+                    rule['protocol'] or 'any',
+                    _format_network_port_range(rule) or '-',
+                    rule.get('remote_group_id') or rule['remote_ip_prefix'],
+                )))
+            return (('skipped', 'would_create'),
+                    (format_columns.ListColumn(skipped),
+                     format_columns.ListColumn(would_create)))
+
+        created = []
+        try:
+            for start in range(0, len(to_create), BULK_CREATE_BATCH_SIZE):
+                # Neutron creates a list of rules in a single request
+                response = client.post(
+                    '/security-group-rules',
+                    json={'security_group_rules':
+                          to_create[start:start + BULK_CREATE_BATCH_SIZE]},
+                )
+                sdk_exceptions.raise_from_response(response)
+                created.extend(
+                    r['id'] for r in response.json()['security_group_rules'])
+        except sdk_exceptions.HttpException:
+            if created:
+                LOG.error(_("Created %(count)d of %(total)d rules before "
+                            "failing: %(ids)s"),
+                          {'count': len(created), 'total': len(to_create),
+                           'ids': ', '.join(created)})
+            raise
+        return (('created', 'skipped'),
+                (format_columns.ListColumn(created),
+                 format_columns.ListColumn(skipped)))
+
+    def take_action_network(self, client, parsed_args):
+        # Security groups are looked up once, however many rules use them
+        group_ids = {}
+
+        def find_group(group):
+            if group not in group_ids:
+                group_ids[group] = client.find_security_group(
+                    group,
+                    ignore_missing=False
+                ).id
+            return group_ids[group]
+
+        # Get the security group ID to hold the rule.
+        security_group_id = find_group(parsed_args.group)
+
+        project_id = None
         if parsed_args.project is not None:
             identity_client = self.app.client_manager.identity
             project_id = identity_common.find_project(
@@ -349,6 +626,19 @@ class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
                 parsed_args.project,
                 parsed_args.project_domain,
             ).id
+
+        if parsed_args.from_file:
+            return self._create_from_file(
+                client, parsed_args, security_group_id, find_group,
+                project_id)
+        elif parsed_args.dry_run:
+            msg = _("--dry-run can only be used with --from-file")
+            raise exceptions.CommandError(msg)
+
+        # Build the create attributes.
+        attrs = self._get_network_attrs(parsed_args, find_group)
+        attrs['security_group_id'] = security_group_id
+        if project_id is not None:
             attrs['tenant_id'] = project_id
 
         # Create and show the security group rule.
@@ -574,7 +864,6 @@ class ListSecurityGroupRule(common.NetworkAndComputeLister):
             "Remote Security Group",
         )
 
-        rules_to_list = []
         if parsed_args.group is not None:
             group = client.api.security_group_find(
                 parsed_args.group,
@@ -583,19 +872,13 @@ class ListSecurityGroupRule(common.NetworkAndComputeLister):
         else:
             columns = columns + ('parent_group_id',)
             search = {'all_tenants': parsed_args.all_projects}
-            for group in client.api.security_group_list(search_opts=search):
-                rules_to_list.extend(group['rules'])
-
-        # NOTE(rtheis): Turn the raw rules into resources.
-        rules = []
-        for rule in rules_to_list:
-            rules.append(
-                network_utils.transform_compute_security_group_rule(rule),
-            )
-            # rules.append(compute_secgroup_rules.SecurityGroupRule(
-            #     client.security_group_rules,
-            #     network_utils.transform_compute_security_group_rule(rule),
-            # ))
+            rules_to_list = _iter_compute_rules(
+                client.api.security_group_list(search_opts=search))
+
+        # NOTE(rtheis): Turn the raw rules into resources as they are
+        # output rather than building a list of them all.
+        rules = (network_utils.transform_compute_security_group_rule(rule)
+                 for rule in rules_to_list)
 
         return (column_headers,
                 (utils.get_dict_properties(
@@ -625,19 +908,7 @@ class ShowSecurityGroupRule(common.NetworkAndComputeShowOne):
         return (display_columns, data)
 
     def take_action_compute(self, client, parsed_args):
-        # NOTE(rtheis): Unfortunately, compute does not have an API
-        # to get or list security group rules so parse through the
-        # security groups to find all accessible rules in search of
-        # the requested rule.
-        obj = None
-        security_group_rules = []
-        for security_group in client.api.security_group_list():
-            security_group_rules.extend(security_group['rules'])
-        for security_group_rule in security_group_rules:
-            if parsed_args.rule == str(security_group_rule.get('id')):
-                obj = security_group_rule
-                break
-
+        obj = _find_compute_security_group_rule(client, parsed_args.rule)
         if obj is None:
             msg = _("Could not find security group rule "
                     "with ID '%s'") % parsed_args.rule
@@ -15,15 +15,19 @@
 
 """Container v1 action implementations"""
 
+import itertools
 import logging
+import time
 
 from osc_lib.cli import format_columns
 from osc_lib.cli import parseractions
 from osc_lib.command import command
+from osc_lib import exceptions
 from osc_lib import utils
 import six
 
 from openstackclient.i18n import _
+from openstackclient.object.v1 import object as object_cmds
 
 
 LOG = logging.getLogger(__name__)
@@ -84,16 +88,28 @@ class DeleteContainer(command.Command):
 
     def take_action(self, parsed_args):
 
+        object_store = self.app.client_manager.object_store
         for container in parsed_args.containers:
             if parsed_args.recursive:
-                objs = self.app.client_manager.object_store.object_list(
-                    container=container)
-                for obj in objs:
-                    self.app.client_manager.object_store.object_delete(
-                        container=container,
-                        object=obj['name'],
-                    )
-            self.app.client_manager.object_store.container_delete(
+                start = time.time()
+                objs = object_store.object_list(
+                    container=container, all_data=True)
+                deleted, failed = object_store.object_delete_many(
+                    container,
+                    (obj['name'] for obj in objs),
+                )
+                object_cmds.report_delete_stats(
+                    self.app.stdout, deleted, time.time() - start)
+                if failed:
+                    for obj, e in failed:
+                        LOG.error(_("Failed to delete object with name "
+                                    "'%(object)s': %(e)s"),
+                                  {'object': obj, 'e': e})
+                    msg = (_("%(result)s objects in container %(container)s "
+                             "failed to delete.") %
+                           {'result': len(failed), 'container': container})
+                    raise exceptions.CommandError(msg)
+            object_store.container_delete(
                 container=container,
             )
 
@@ -155,11 +171,14 @@ class ListContainer(command.Lister):
         if parsed_args.limit:
             kwargs['limit'] = parsed_args.limit
         if parsed_args.all:
-            kwargs['full_listing'] = True
+            kwargs['all_data'] = True
 
         data = self.app.client_manager.object_store.container_list(
             **kwargs
         )
+        if parsed_args.all and parsed_args.limit:
+            # --limit caps the number listed, not just the size of a page
+            data = itertools.islice(data, parsed_args.limit)
 
         return (columns,
                 (utils.get_dict_properties(
@@ -15,7 +15,9 @@
 
 """Object v1 action implementations"""
 
+import itertools
 import logging
+import time
 
 from osc_lib.cli import format_columns
 from osc_lib.cli import parseractions
@@ -24,12 +26,24 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
 from openstackclient.i18n import _
 
 
 LOG = logging.getLogger(__name__)
 
 
+def report_delete_stats(stdout, deleted, elapsed):
+    """Write the rate objects were deleted at, for bulk deletes"""
+    if deleted > 1:
+        stdout.write(_("Deleted %(count)d objects in %(elapsed).2fs "
+                       "(%(rate).1f/s)\n") % {
+            'count': deleted,
+            'elapsed': elapsed,
+            'rate': deleted / elapsed if elapsed else 0.0,
+        })
+
+
 class CreateObject(command.Lister):
     _description = _("Upload object to container")
 
@@ -52,6 +66,19 @@ class CreateObject(command.Lister):
             help=_('Upload a file and rename it. '
                    'Can only be used when uploading a single object')
         )
+        parser.add_argument(
+            '--segment-size',
+            metavar='<bytes>',
+            type=int,
+            help=_('Upload files larger than <bytes> as a static large '
+                   'object, in segments of <bytes> each. Required for '
+                   'files larger than 5 GB'),
+        )
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Upload up to <num-workers> files, or segments of a '
+                   'file, concurrently (default: 1)'),
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -60,18 +87,46 @@ class CreateObject(command.Lister):
                 msg = _('Attempting to upload multiple objects and '
                         'using --name is not permitted')
                 raise exceptions.CommandError(msg)
-        results = []
+        if parsed_args.segment_size is not None and \
+                parsed_args.segment_size <= 0:
+            msg = _('--segment-size must be a positive number of bytes')
+            raise exceptions.CommandError(msg)
         for obj in parsed_args.objects:
             if len(obj) > 1024:
                 LOG.warning(
                     _('Object name is %s characters long, default limit'
                       ' is 1024'), len(obj))
-            data = self.app.client_manager.object_store.object_create(
+
+        object_store = self.app.client_manager.object_store
+        # Keep at most --parallel requests in flight: the segments of a
+        # single file are uploaded concurrently, otherwise the files are.
+        single = len(parsed_args.objects) == 1
+
+        def _upload(obj):
+            return object_store.object_create(
                 container=parsed_args.container,
                 object=obj,
                 name=parsed_args.name,
+                segment_size=parsed_args.segment_size,
+                workers=parsed_args.parallel if single else 1,
             )
-            results.append(data)
+
+        results = []
+        failed = 0
+        for obj, data, e in concurrency.run_concurrently(
+                _upload, parsed_args.objects, workers=parsed_args.parallel):
+            if e is not None:
+                failed += 1
+                LOG.error(_("Failed to upload object '%(object)s': %(e)s"),
+                          {'object': obj, 'e': e})
+            else:
+                results.append(data)
+
+        if failed:
+            total = len(parsed_args.objects)
+            msg = (_("%(result)s of %(total)s objects failed "
+                   "to upload.") % {'result': failed, 'total': total})
+            raise exceptions.CommandError(msg)
 
         columns = ("object", "container", "etag")
         return (columns,
@@ -100,12 +155,24 @@ class DeleteObject(command.Command):
         return parser
 
     def take_action(self, parsed_args):
-
-        for obj in parsed_args.objects:
-            self.app.client_manager.object_store.object_delete(
-                container=parsed_args.container,
-                object=obj,
+        start = time.time()
+        deleted, failed = (
+            self.app.client_manager.object_store.object_delete_many(
+                parsed_args.container,
+                parsed_args.objects,
             )
+        )
+        report_delete_stats(self.app.stdout, deleted, time.time() - start)
+
+        for obj, e in failed:
+            LOG.error(_("Failed to delete object with name "
+                        "'%(object)s': %(e)s"),
+                      {'object': obj, 'e': e})
+        if failed:
+            total = len(parsed_args.objects)
+            msg = (_("%(result)s of %(total)s objects failed "
+                   "to delete.") % {'result': len(failed), 'total': total})
+            raise exceptions.CommandError(msg)
 
 
 class ListObject(command.Lister):
@@ -183,12 +250,15 @@ class ListObject(command.Lister):
         if parsed_args.limit:
             kwargs['limit'] = parsed_args.limit
         if parsed_args.all:
-            kwargs['full_listing'] = True
+            kwargs['all_data'] = True
 
         data = self.app.client_manager.object_store.object_list(
             container=parsed_args.container,
             **kwargs
         )
+        if parsed_args.all and parsed_args.limit:
+            # --limit caps the number listed, not just the size of a page
+            data = itertools.islice(data, parsed_args.limit)
 
         return (columns,
                 (utils.get_dict_properties(
@@ -218,13 +288,42 @@ class SaveObject(command.Command):
             metavar="<object>",
             help=_("Object to save"),
         )
+        concurrency.add_parallel_option_to_parser(
+            parser,
+            help=_('Download up to <num-workers> ranges of the object '
+                   'concurrently (default: 1)'),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            metavar='<bytes>',
+            type=int,
+            help=_('Size of each range downloaded with --parallel or '
+                   '--resume (default: 64 MiB)'),
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=_('Resume a partial download into an existing file'),
+        )
         return parser
 
     def take_action(self, parsed_args):
+        if parsed_args.chunk_size is not None and \
+                parsed_args.chunk_size <= 0:
+            msg = _('--chunk-size must be a positive number of bytes')
+            raise exceptions.CommandError(msg)
+        if parsed_args.file == '-' and (parsed_args.parallel > 1 or
+                                        parsed_args.resume):
+            msg = _('--parallel and --resume cannot be used when saving '
+                    'to stdout')
+            raise exceptions.CommandError(msg)
         self.app.client_manager.object_store.object_save(
             container=parsed_args.container,
             object=parsed_args.object,
             file=parsed_args.file,
+            workers=parsed_args.parallel,
+            chunk_size=parsed_args.chunk_size,
+            resume=parsed_args.resume,
         )
 
 
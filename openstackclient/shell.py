@@ -17,19 +17,48 @@
 """Command-line interface to the OpenStack APIs"""
 
 import locale
+import logging
+import os
 import sys
 
 from osc_lib.api import auth
 from osc_lib.command import commandmanager
 from osc_lib import shell
+from oslo_utils import strutils
 import six
 
 import openstackclient
 from openstackclient.common import clientmanager
+from openstackclient.common import name_cache
+from openstackclient.common import resource_cache
+from openstackclient.i18n import _
 
 
 DEFAULT_DOMAIN = 'default'
 
+LOG = logging.getLogger(__name__)
+
+
+def _name_cache_ttl_from_env():
+    """Return the name cache TTL set in OS_NAME_CACHE_TTL
+
+    A value that is not a number of seconds is ignored with a warning.
+    """
+    ttl = os.environ.get('OS_NAME_CACHE_TTL')
+    if ttl is None:
+        return name_cache.DEFAULT_TTL
+    try:
+        ttl = int(ttl)
+    except ValueError:
+        ttl = -1
+    if ttl < 0:
+        LOG.warning(_('Ignoring invalid OS_NAME_CACHE_TTL %(ttl)r, using '
+                      '%(default)s seconds'),
+                    {'ttl': os.environ['OS_NAME_CACHE_TTL'],
+                     'default': name_cache.DEFAULT_TTL})
+        return name_cache.DEFAULT_TTL
+    return ttl
+
 
 class OpenStackShell(shell.OpenStackShell):
 
@@ -50,6 +79,23 @@ class OpenStackShell(shell.OpenStackShell):
         parser = super(OpenStackShell, self).build_option_parser(
             description,
             version)
+        parser.add_argument(
+            '--os-name-cache',
+            action='store_true',
+            default=strutils.bool_from_string(
+                os.environ.get('OS_NAME_CACHE')),
+            help=_('Cache the IDs of resources looked up by name on disk '
+                   'to skip repeated lookups (Env: OS_NAME_CACHE)'),
+        )
+        parser.add_argument(
+            '--os-name-cache-ttl',
+            metavar='<seconds>',
+            type=int,
+            default=_name_cache_ttl_from_env(),
+            help=_('Seconds cached resource IDs remain valid '
+                   '(Env: OS_NAME_CACHE_TTL, default: %s)') %
+            name_cache.DEFAULT_TTL,
+        )
         parser = clientmanager.build_plugin_option_parser(parser)
         parser = auth.build_auth_plugins_option_parser(parser)
         return parser
@@ -163,8 +209,31 @@ class OpenStackShell(shell.OpenStackShell):
         # Push the updated args into ClientManager
         self.client_manager._cli_options = self.cloud
 
+        if self.options.os_name_cache and cmd.auth_required:
+            self._configure_name_cache()
+
         return super(OpenStackShell, self).prepare_to_run_command(cmd)
 
+    def _configure_name_cache(self):
+        auth = self.cloud.config.get('auth', {})
+        path = name_cache.get_cache_path(
+            self.cloud.name,
+            auth.get('auth_url'),
+            self.cloud.region_name,
+            auth.get('project_id') or auth.get('project_name'),
+            auth.get('project_domain_id') or auth.get('project_domain_name'),
+            auth.get('user_id') or auth.get('username'),
+        )
+        name_cache.configure(path, ttl=self.options.os_name_cache_ttl)
+
+    def clean_up(self, cmd, result, err):
+        cache = name_cache.get_cache()
+        if cache is not None:
+            name_cache.invalidate_for_command(getattr(cmd, 'cmd_name', None))
+            cache.save()
+        resource_cache.reset()
+        return super(OpenStackShell, self).clean_up(cmd, result, err)
+
 
 def main(argv=None):
     if argv is None:
@@ -13,7 +13,13 @@
 
 """Image v2 API Library Tests"""
 
+import hashlib
+import os
+
+import fixtures
 from keystoneauth1 import session
+import mock
+from osc_lib import exceptions
 from requests_mock.contrib import fixture
 
 from openstackclient.api import image_v2
@@ -96,3 +102,117 @@ class TestImage(TestImageAPIv2):
         )
         ret = self.api.image_list(public=True)
         self.assertEqual([self.NOPUB_PROT, self.NOPUB_NOPROT], ret)
+
+
+class TestImageSave(TestImageAPIv2):
+
+    CONTENT = b'0123456789'
+    IMAGE = {
+        'id': '1',
+        'size': len(CONTENT),
+        'checksum': hashlib.md5(CONTENT).hexdigest(),
+        'os_hash_algo': 'sha512',
+        'os_hash_value': hashlib.sha512(CONTENT).hexdigest(),
+    }
+    DATA_URL = FAKE_URL + '/v2/images/1/file'
+
+    def setUp(self):
+        super(TestImageSave, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'image.raw')
+
+    def _saved(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_image_save(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.DATA_URL,
+            content=self.CONTENT,
+            status_code=200,
+        )
+        progress = mock.Mock()
+
+        self.api.image_save(self.IMAGE, self.path, progress=progress)
+
+        self.assertEqual(self.CONTENT, self._saved())
+        progress.assert_called_with(len(self.CONTENT), mock.ANY)
+
+    def test_image_save_resume(self):
+        with open(self.path, 'wb') as f:
+            f.write(self.CONTENT[:4])
+        self.requests_mock.register_uri(
+            'GET',
+            self.DATA_URL,
+            request_headers={'Range': 'bytes=4-'},
+            content=self.CONTENT[4:],
+            status_code=206,
+        )
+
+        self.api.image_save(self.IMAGE, self.path, resume=True)
+
+        self.assertEqual(self.CONTENT, self._saved())
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_image_save_resume_range_not_supported(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'xxxx')
+        self.requests_mock.register_uri(
+            'GET',
+            self.DATA_URL,
+            content=self.CONTENT,
+            status_code=200,
+        )
+
+        self.api.image_save(self.IMAGE, self.path, resume=True)
+
+        self.assertEqual(self.CONTENT, self._saved())
+
+    def test_image_save_parallel(self):
+        for start in range(0, len(self.CONTENT), 4):
+            end = min(start + 4, len(self.CONTENT)) - 1
+            self.requests_mock.register_uri(
+                'GET',
+                self.DATA_URL,
+                request_headers={'Range': 'bytes=%d-%d' % (start, end)},
+                content=self.CONTENT[start:end + 1],
+                status_code=206,
+            )
+
+        self.api.image_save(self.IMAGE, self.path, workers=2, chunk_size=4)
+
+        self.assertEqual(self.CONTENT, self._saved())
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    def test_image_save_checksum_mismatch(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.DATA_URL,
+            content=b'9876543210',
+            status_code=200,
+        )
+
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.image_save,
+            self.IMAGE,
+            self.path,
+        )
+
+    def test_image_save_incomplete(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.DATA_URL,
+            content=self.CONTENT[:4],
+            status_code=200,
+        )
+
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.image_save,
+            self.IMAGE,
+            self.path,
+        )
+        # The partial data is kept so the download can be resumed
+        self.assertEqual(self.CONTENT[:4], self._saved())
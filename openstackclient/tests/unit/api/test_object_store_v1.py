@@ -13,9 +13,16 @@
 
 """Object Store v1 API Library Tests"""
 
+import hashlib
+import json
+import os
+import re
+
+import fixtures
 import mock
 
 from keystoneauth1 import session
+from osc_lib import exceptions
 from requests_mock.contrib import fixture
 
 from openstackclient.api import object_store_v1 as object_store
@@ -117,6 +124,32 @@ class TestContainer(TestObjectAPIv1):
         )
         self.assertEqual(LIST_CONTAINER_RESP, ret)
 
+    def test_container_list_all_data(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '?limit=2&format=json',
+            json=[{'name': 'qaz'}, {'name': 'fred'}],
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '?marker=fred&limit=2&format=json',
+            json=[{'name': 'wilma'}],
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '?marker=wilma&limit=2&format=json',
+            json=[],
+            status_code=200,
+        )
+        ret = self.api.container_list(all_data=True, limit=2)
+        self.assertEqual(
+            ['qaz', 'fred', 'wilma'],
+            [c['name'] for c in ret],
+        )
+        self.assertEqual(3, self.requests_mock.call_count)
+
 #     def test_container_list_full_listing(self):
 #         sess = self.app.client_manager.session
 #
@@ -209,6 +242,49 @@ class TestObject(TestObjectAPIv1):
         self.base_object_create('111\n222\n333\n')
         self.base_object_create(bytes([0x31, 0x00, 0x0d, 0x0a, 0x7f, 0xff]))
 
+    def test_object_create_segmented(self):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'counter.txt')
+        with open(path, 'wb') as f:
+            f.write(b'0123456789')
+
+        self.requests_mock.register_uri(
+            'PUT',
+            FAKE_URL + '/qaz_segments',
+            status_code=201,
+        )
+        segment_matcher = self.requests_mock.register_uri(
+            'PUT',
+            re.compile(FAKE_URL + '/qaz_segments/counter.txt/slo/'),
+            headers={'etag': 'segment'},
+            status_code=201,
+        )
+        manifest_matcher = self.requests_mock.register_uri(
+            'PUT',
+            FAKE_URL + '/qaz/counter.txt?multipart-manifest=put',
+            headers={'etag': 'youreit', 'x-trans-id': '1qaz2wsx'},
+            status_code=201,
+        )
+        ret = self.api.object_create(
+            container='qaz',
+            object=path,
+            name='counter.txt',
+            segment_size=4,
+            workers=2,
+        )
+
+        self.assertEqual('youreit', ret['etag'])
+        self.assertEqual(3, segment_matcher.call_count)
+        self.assertEqual(
+            ['4', '4', '2'],
+            sorted((r.headers['Content-Length']
+                    for r in segment_matcher.request_history), reverse=True),
+        )
+        manifest = json.loads(manifest_matcher.last_request.body)
+        self.assertEqual([4, 4, 2], [s['size_bytes'] for s in manifest])
+        self.assertTrue(manifest[0]['path'].endswith('/00000000'))
+        self.assertTrue(manifest[2]['path'].endswith('/00000002'))
+
     def test_object_delete(self):
         self.requests_mock.register_uri(
             'DELETE',
@@ -221,6 +297,75 @@ class TestObject(TestObjectAPIv1):
         )
         self.assertIsNone(ret)
 
+    def test_object_delete_many_bulk(self):
+        self.requests_mock.register_uri(
+            'GET',
+            'http://gopher.com/info',
+            json={'bulk_delete': {'max_deletes_per_request': 2}},
+            status_code=200,
+        )
+        bulk_matcher = self.requests_mock.register_uri(
+            'POST',
+            FAKE_URL + '?bulk-delete',
+            [
+                {'json': {'Number Deleted': 2, 'Errors': [],
+                          'Response Status': '200 OK'}},
+                {'json': {'Number Deleted': 0,
+                          'Errors': [['/qaz/barney%20rubble', '409']],
+                          'Response Status': '400 Bad Request'}},
+            ],
+        )
+
+        deleted, failed = self.api.object_delete_many(
+            'qaz', iter(['fred', 'wilma', 'barney rubble']))
+
+        self.assertEqual(2, deleted)
+        self.assertEqual([('barney rubble', '409')], failed)
+        self.assertEqual(2, bulk_matcher.call_count)
+        self.assertEqual(
+            '/qaz/fred\n/qaz/wilma',
+            bulk_matcher.request_history[0].text,
+        )
+
+    def test_object_delete_many_no_bulk(self):
+        self.requests_mock.register_uri(
+            'GET',
+            'http://gopher.com/info',
+            status_code=404,
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/fred',
+            status_code=204,
+        )
+        self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/wilma',
+            status_code=404,
+        )
+
+        deleted, failed = self.api.object_delete_many(
+            'qaz', ['fred', 'wilma'])
+
+        self.assertEqual(1, deleted)
+        self.assertEqual(['wilma'], [obj for obj, e in failed])
+
+    def test_object_delete_many_single(self):
+        delete_matcher = self.requests_mock.register_uri(
+            'DELETE',
+            FAKE_URL + '/qaz/fred',
+            status_code=204,
+        )
+
+        deleted, failed = self.api.object_delete_many('qaz', ['fred'])
+
+        self.assertEqual(1, deleted)
+        self.assertEqual([], failed)
+        # The capabilities are not needed to delete a single object
+        self.assertEqual(
+            [delete_matcher.last_request],
+            self.requests_mock.request_history)
+
     def test_object_list_no_options(self):
         self.requests_mock.register_uri(
             'GET',
@@ -272,6 +417,35 @@ class TestObject(TestObjectAPIv1):
         )
         self.assertEqual(LIST_CONTAINER_RESP, ret)
 
+    def test_object_list_all_data_delimiter(self):
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz?delimiter=%2F',
+            json=[LIST_OBJECT_RESP[0], {'subdir': 'pebbles/'}],
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz?marker=pebbles%2F&delimiter=%2F',
+            json=[LIST_OBJECT_RESP[1]],
+            status_code=200,
+        )
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz?marker=wilma&delimiter=%2F',
+            json=[],
+            status_code=200,
+        )
+        ret = self.api.object_list(
+            container='qaz',
+            all_data=True,
+            delimiter='/',
+        )
+        self.assertEqual(
+            [LIST_OBJECT_RESP[0], {'subdir': 'pebbles/'}, LIST_OBJECT_RESP[1]],
+            list(ret),
+        )
+
 #     def test_list_objects_full_listing(self):
 #         sess = self.app.client_manager.session
 #
@@ -302,6 +476,89 @@ class TestObject(TestObjectAPIv1):
 #         )
 #         self.assertEqual(resp, data)
 
+    def _register_ranges(self, content, chunk_size, etag=None):
+        headers = {'Content-Length': str(len(content))}
+        if etag:
+            headers['Etag'] = etag
+        self.requests_mock.register_uri(
+            'HEAD',
+            FAKE_URL + '/qaz/counter.txt',
+            headers=headers,
+            status_code=200,
+        )
+        for start in range(0, len(content), chunk_size):
+            end = min(start + chunk_size, len(content)) - 1
+            self.requests_mock.register_uri(
+                'GET',
+                FAKE_URL + '/qaz/counter.txt',
+                request_headers={'Range': 'bytes=%d-%d' % (start, end)},
+                content=content[start:end + 1],
+                status_code=206,
+            )
+
+    def test_object_save_parallel(self):
+        content = b'0123456789'
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'counter.txt')
+        self._register_ranges(
+            content, 4, etag=hashlib.md5(content).hexdigest())
+
+        self.api.object_save(
+            container='qaz',
+            object='counter.txt',
+            file=path,
+            workers=2,
+            chunk_size=4,
+        )
+
+        with open(path, 'rb') as f:
+            self.assertEqual(content, f.read())
+        # One HEAD and three ranges
+        self.assertEqual(4, self.requests_mock.call_count)
+
+    def test_object_save_resume(self):
+        content = b'0123456789'
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'counter.txt')
+        with open(path, 'wb') as f:
+            f.write(content[:4])
+        self._register_ranges(content, 4)
+
+        self.api.object_save(
+            container='qaz',
+            object='counter.txt',
+            file=path,
+            chunk_size=4,
+            resume=True,
+        )
+
+        with open(path, 'rb') as f:
+            self.assertEqual(content, f.read())
+        self.assertEqual(
+            ['bytes=4-7', 'bytes=8-9'],
+            [r.headers['Range'] for r in self.requests_mock.request_history
+             if r.method == 'GET'],
+        )
+
+    def test_object_save_checksum_mismatch(self):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'counter.txt')
+        self.requests_mock.register_uri(
+            'GET',
+            FAKE_URL + '/qaz/counter.txt',
+            headers={'Etag': hashlib.md5(b'other').hexdigest()},
+            content=b'0123456789',
+            status_code=200,
+        )
+
+        self.assertRaises(
+            exceptions.CommandError,
+            self.api.object_save,
+            container='qaz',
+            object='counter.txt',
+            file=path,
+        )
+
     def test_object_show(self):
         headers = {
             'content-type': 'text/alpha',
@@ -0,0 +1,76 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from openstackclient.common import concurrency
+from openstackclient.tests.unit import utils
+
+
+class TestRunConcurrently(utils.TestCase):
+
+    def test_run_concurrently(self):
+        result = list(concurrency.run_concurrently(
+            lambda x: x * 2, range(20), workers=4))
+
+        self.assertEqual([(i, i * 2, None) for i in range(20)], result)
+
+    def test_run_concurrently_single_worker(self):
+        result = list(concurrency.run_concurrently(
+            lambda x: x * 2, [1, 2], workers=1))
+
+        self.assertEqual([(1, 2, None), (2, 4, None)], result)
+
+    def test_run_concurrently_no_items(self):
+        self.assertEqual(
+            [], list(concurrency.run_concurrently(lambda x: x, [])))
+
+    def test_run_concurrently_exception(self):
+        error = ValueError('boom')
+        func = mock.Mock(side_effect=[1, error, 3])
+
+        result = list(concurrency.run_concurrently(
+            func, ['a', 'b', 'c'], workers=1))
+
+        self.assertEqual(
+            [('a', 1, None), ('b', None, error), ('c', 3, None)], result)
+
+    def test_run_concurrently_unordered(self):
+        result = concurrency.run_concurrently(
+            lambda x: x * 2, range(20), workers=4, ordered=False)
+
+        self.assertEqual(
+            [(i, i * 2, None) for i in range(20)], sorted(result))
+
+    def test_run_concurrently_stop_early(self):
+        func = mock.Mock(side_effect=lambda x: x)
+
+        results = concurrency.run_concurrently(func, range(100), workers=2)
+        self.assertEqual((0, 0, None), next(results))
+        results.close()
+
+        # Only the calls in flight when the consumer stopped were made
+        self.assertLessEqual(func.call_count, 3)
+
+
+class TestGetMany(utils.TestCase):
+
+    def test_get_many(self):
+        def get(res_id):
+            if res_id == 'missing':
+                raise Exception('not found')
+            return res_id.upper()
+
+        result = concurrency.get_many(get, ['a', 'b', 'a', 'missing'])
+
+        self.assertEqual({'a': 'A', 'b': 'B'}, result)
@@ -0,0 +1,125 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import os
+
+import fixtures
+import mock
+
+from openstackclient.common import name_cache
+from openstackclient.tests.unit import fakes
+from openstackclient.tests.unit import utils
+
+
+class TestNameCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestNameCache, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'names', 'cache.json')
+        self.cache = name_cache.NameCache(self.path, ttl=60, max_entries=2)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get('image', 'cirros'))
+        self.cache.set('image', 'cirros', 'image-id')
+        self.assertEqual('image-id', self.cache.get('image', 'cirros'))
+        self.assertIsNone(self.cache.get('flavor', 'cirros'))
+        self.assertIsNone(
+            self.cache.get('image', 'cirros', scope='domain-id'))
+
+    def test_save_and_load(self):
+        self.cache.set('image', 'cirros', 'image-id')
+        self.cache.save()
+
+        cache = name_cache.NameCache(self.path, ttl=60)
+        self.assertEqual('image-id', cache.get('image', 'cirros'))
+
+    def test_expired(self):
+        with mock.patch('time.time', return_value=1000):
+            self.cache.set('image', 'cirros', 'image-id')
+        with mock.patch('time.time', return_value=1060):
+            self.assertIsNone(self.cache.get('image', 'cirros'))
+
+    def test_lru_eviction(self):
+        self.cache.set('image', 'a', 'a-id')
+        self.cache.set('image', 'b', 'b-id')
+        # Touch 'a' so that 'b' is the least recently used entry
+        self.cache.get('image', 'a')
+        self.cache.set('image', 'c', 'c-id')
+
+        self.assertEqual('a-id', self.cache.get('image', 'a'))
+        self.assertIsNone(self.cache.get('image', 'b'))
+        self.assertEqual('c-id', self.cache.get('image', 'c'))
+
+    def test_invalidate(self):
+        self.cache.set('image', 'cirros', 'image-id')
+        self.cache.set('flavor', 'tiny', 'flavor-id')
+        self.cache.invalidate('image')
+
+        self.assertIsNone(self.cache.get('image', 'cirros'))
+        self.assertEqual('flavor-id', self.cache.get('flavor', 'tiny'))
+
+
+class TestNameCacheLookup(utils.TestCase):
+
+    def setUp(self):
+        super(TestNameCacheLookup, self).setUp()
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'cache.json')
+        self.cache = name_cache.configure(path)
+        self.addCleanup(name_cache.reset)
+
+    def test_find_id(self):
+        finder = mock.Mock(
+            return_value=fakes.FakeResource(info={'id': 'net-id'}))
+
+        self.assertEqual(
+            'net-id', name_cache.find_id('network', 'private', finder))
+        self.assertEqual(
+            'net-id', name_cache.find_id('network', 'private', finder))
+        finder.assert_called_once_with('private')
+
+    def test_find_id_disabled(self):
+        name_cache.reset()
+        finder = mock.Mock(
+            return_value=fakes.FakeResource(info={'id': 'net-id'}))
+
+        name_cache.find_id('network', 'private', finder)
+        name_cache.find_id('network', 'private', finder)
+        self.assertEqual(2, finder.call_count)
+
+    @mock.patch('osc_lib.utils.find_resource')
+    def test_find_resource(self, mock_find):
+        flavor = fakes.FakeResource(info={'id': 'flavor-id'})
+        mock_find.return_value = flavor
+        manager = mock.Mock()
+        manager.get.return_value = flavor
+
+        self.assertEqual(
+            flavor, name_cache.find_resource(manager, 'flavor', 'tiny'))
+        self.assertEqual(
+            flavor, name_cache.find_resource(manager, 'flavor', 'tiny'))
+        mock_find.assert_called_once_with(manager, 'tiny')
+        manager.get.assert_called_once_with('flavor-id')
+
+    def test_invalidate_for_command(self):
+        self.cache.set('security_group', 'web', 'sg-id')
+        self.cache.set('image', 'cirros', 'image-id')
+
+        name_cache.invalidate_for_command('security group rule create')
+        self.assertEqual('sg-id', self.cache.get('security_group', 'web'))
+        name_cache.invalidate_for_command('security group list')
+        self.assertEqual('sg-id', self.cache.get('security_group', 'web'))
+        name_cache.invalidate_for_command('security group delete')
+        self.assertIsNone(self.cache.get('security_group', 'web'))
+        self.assertEqual('image-id', self.cache.get('image', 'cirros'))
@@ -10,6 +10,8 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import itertools
+
 import mock
 
 from osc_lib import exceptions
@@ -318,3 +320,89 @@ class TestProjectPurge(TestProjectPurgeInit):
         self.assertEqual(2, self.backups_mock.delete.call_count)
         self.backups_mock.delete.assert_called_with(self.backup.id, force=True)
         self.assertIsNone(result)
+
+    @mock.patch.object(project_purge.time, 'sleep')
+    def test_project_purge_with_parallel_and_wait(self, mock_sleep):
+        deleting = volume_fakes.FakeBackup.create_one_backup(
+            attrs={'id': self.backup.id, 'status': 'deleting'})
+        self.servers_mock.list.side_effect = [[self.server], []]
+        self.snapshots_mock.list.side_effect = [[self.snapshot], []]
+        self.backups_mock.list.side_effect = [[self.backup], [deleting], []]
+        arglist = [
+            '--parallel', '4',
+            '--wait',
+            '--project', self.project.id,
+        ]
+        verifylist = [
+            ('parallel', 4),
+            ('wait', True),
+            ('project', self.project.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        result = self.cmd.take_action(parsed_args)
+        self.projects_mock.delete.assert_called_once_with(self.project.id)
+        self.servers_mock.delete.assert_called_once_with(self.server.id)
+        self.images_mock.delete.assert_called_once_with(self.image.id)
+        self.snapshots_mock.delete.assert_called_once_with(self.snapshot.id)
+        self.backups_mock.delete.assert_called_once_with(self.backup.id)
+        self.volumes_mock.force_delete.assert_called_once_with(self.volume.id)
+        # One list call per resource type per poll cycle
+        self.assertEqual(2, self.servers_mock.list.call_count)
+        self.assertEqual(2, self.snapshots_mock.list.call_count)
+        self.assertEqual(3, self.backups_mock.list.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        # Volumes are not waited on as nothing depends on them
+        self.assertEqual(1, self.volumes_mock.list.call_count)
+        self.assertIsNone(result)
+
+    @mock.patch.object(project_purge.time, 'sleep')
+    def test_project_purge_wait_timeout(self, mock_sleep):
+        deleting = volume_fakes.FakeBackup.create_one_backup(
+            attrs={'id': self.backup.id, 'status': 'deleting'})
+        list_backups = mock.Mock(return_value=[deleting])
+
+        self.cmd.wait_for_deletion(
+            {'volume backup': (list_backups, {self.backup.id})},
+            timeout=project_purge.POLL_INTERVAL * 2,
+        )
+
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(2, list_backups.call_count)
+
+    @mock.patch.object(project_purge.time, 'time',
+                       side_effect=itertools.count())
+    def test_project_purge_times_each_resource(self, mock_time):
+        self.cmd._stats = {}
+        delete = mock.Mock()
+
+        self.cmd.delete_objects_concurrently(
+            [('server', delete, [self.server]),
+             ('image', delete, [self.image])],
+            False,
+        )
+
+        # With one worker the images are only deleted once the servers are
+        count, server_started, server_finished = self.cmd._stats['server']
+        self.assertEqual(1, count)
+        count, image_started, image_finished = self.cmd._stats['image']
+        self.assertEqual(1, count)
+        self.assertLess(server_started, server_finished)
+        self.assertLess(server_finished, image_started)
+        self.assertLess(image_started, image_finished)
+
+    def test_project_purge_reports_stats(self):
+        arglist = [
+            '--project', self.project.id,
+        ]
+        verifylist = [
+            ('project', self.project.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        output = self.app.stdout.make_string()
+        for resource in ('servers', 'images', 'volume snapshots',
+                         'volume backups', 'volumes'):
+            self.assertIn('Deleted 1 %s in' % resource, output)
@@ -392,6 +392,50 @@ class TestQuotaList(TestQuota):
             parsed_args,
         )
 
+    def test_quota_list_compute_defaults_fetched_once(self):
+        self.compute.quotas.get = mock.Mock(
+            side_effect=self.compute_quotas,
+        )
+
+        arglist = [
+            '--compute',
+        ]
+        verifylist = [
+            ('compute', True),
+            ('parallel', 1),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(2, len(list(data)))
+        self.compute.quotas.defaults.assert_called_once_with(
+            self.projects[0].id)
+
+    def test_quota_list_compute_parallel(self):
+        quotas = dict(zip([p.id for p in self.projects], self.compute_quotas))
+        self.compute.quotas.get = mock.Mock(side_effect=quotas.get)
+
+        arglist = [
+            '--compute',
+            '--parallel', '4',
+        ]
+        verifylist = [
+            ('compute', True),
+            ('parallel', 4),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+        ret_quotas = list(data)
+
+        self.assertEqual(self.compute_column_header, columns)
+        self.assertEqual(2, len(ret_quotas))
+        self.assertIn(self.compute_reference_data, ret_quotas)
+        self.compute.quotas.get.assert_has_calls(
+            [mock.call(p.id) for p in self.projects], any_order=True)
+        self.assertEqual(1, self.compute.quotas.defaults.call_count)
+
     def test_quota_list_network(self):
         # Two projects with non-default quotas
         self.network.get_quota = mock.Mock(
@@ -0,0 +1,100 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import hashlib
+import os
+
+import fixtures
+import mock
+from osc_lib import exceptions
+
+from openstackclient.common import ranged_download
+from openstackclient.tests.unit import utils
+
+
+CONTENT = b'0123456789'
+
+
+def _response(data, status_code=206):
+    response = mock.Mock(status_code=status_code)
+    response.iter_content.return_value = [data]
+    return response
+
+
+class TestRangedDownload(utils.TestCase):
+
+    def setUp(self):
+        super(TestRangedDownload, self).setUp()
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'data')
+
+    def _request(self, method, url, stream=False, headers=None):
+        start, end = headers['Range'][len('bytes='):].split('-')
+        return _response(CONTENT[int(start):int(end) + 1])
+
+    def _saved(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_save_ranges(self):
+        progress = mock.Mock()
+
+        ranged_download.save_ranges(
+            self._request, 'url', self.path, len(CONTENT), workers=2,
+            chunk_size=4, progress=progress)
+
+        self.assertEqual(CONTENT, self._saved())
+        progress.assert_has_calls(
+            [mock.call(4), mock.call(4), mock.call(2)], any_order=True)
+
+    def test_save_ranges_resume(self):
+        with open(self.path, 'wb') as f:
+            f.write(CONTENT[:4])
+        request = mock.Mock(side_effect=self._request)
+
+        ranged_download.save_ranges(
+            request, 'url', self.path, len(CONTENT), offset=4, chunk_size=4)
+
+        self.assertEqual(CONTENT, self._saved())
+        self.assertEqual(2, request.call_count)
+
+    def test_save_ranges_failure_truncates(self):
+        def request(method, url, stream=False, headers=None):
+            if headers['Range'] == 'bytes=4-7':
+                return _response(b'', status_code=200)
+            return self._request(method, url, stream, headers)
+
+        self.assertRaises(
+            exceptions.CommandError,
+            ranged_download.save_ranges,
+            request, 'url', self.path, len(CONTENT), chunk_size=4)
+
+        # Only the data before the failed range is kept
+        self.assertEqual(CONTENT[:4], self._saved())
+
+    def test_resume_offset(self):
+        self.assertEqual(0, ranged_download.resume_offset(self.path, 10))
+        with open(self.path, 'wb') as f:
+            f.write(CONTENT[:4])
+        self.assertEqual(4, ranged_download.resume_offset(self.path, 10))
+        self.assertEqual(0, ranged_download.resume_offset(self.path, 2))
+
+    def test_hash_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(CONTENT)
+        checksum = hashlib.sha256()
+
+        ranged_download.hash_file(checksum, self.path, 4)
+
+        self.assertEqual(
+            hashlib.sha256(CONTENT[:4]).hexdigest(), checksum.hexdigest())
@@ -0,0 +1,56 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from openstackclient.common import resource_cache
+from openstackclient.tests.unit import utils
+
+
+class TestResourceCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestResourceCache, self).setUp()
+        self.addCleanup(resource_cache.reset)
+
+    def test_lookup(self):
+        def get(res_id):
+            if res_id == 'missing':
+                raise Exception('not found')
+            return res_id.upper()
+        get = mock.Mock(side_effect=get)
+
+        self.assertEqual(
+            {'a': 'A', 'b': 'B'},
+            resource_cache.lookup('server', ['a', 'b', 'missing', None], get),
+        )
+        self.assertEqual(
+            {'a': 'A', 'c': 'C'},
+            resource_cache.lookup('server', ['a', 'c', 'missing'], get),
+        )
+        # Each ID is only fetched once, even when it was not found
+        self.assertEqual(
+            ['a', 'b', 'c', 'missing'],
+            sorted(c[0][0] for c in get.call_args_list),
+        )
+
+    def test_lookup_by_type(self):
+        get = mock.Mock(return_value='resource')
+
+        resource_cache.lookup('server', ['a'], get)
+        resource_cache.lookup('volume', ['a'], get)
+        self.assertEqual(2, get.call_count)
+
+        resource_cache.reset()
+        resource_cache.lookup('server', ['a'], get)
+        self.assertEqual(3, get.call_count)
@@ -0,0 +1,126 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import itertools
+
+import mock
+
+from openstackclient.common import waiter
+from openstackclient.tests.unit import fakes
+from openstackclient.tests.unit import utils
+
+
+def _resource(status, progress=None):
+    return fakes.FakeResource(info={'status': status, 'progress': progress})
+
+
+@mock.patch('time.sleep')
+class TestWaiter(utils.TestCase):
+
+    def test_wait_for_status(self, mock_sleep):
+        poll = mock.Mock(side_effect=[
+            {'a': _resource('BUILD', 10), 'b': _resource('BUILD', 30)},
+            {'a': _resource('ACTIVE', 100), 'b': _resource('ERROR')},
+        ])
+        callback = mock.Mock()
+        res_waiter = waiter.Waiter(poll, jitter=0)
+
+        result = res_waiter.wait_for_status(['a', 'b'], callback=callback)
+
+        self.assertEqual({'a': True, 'b': False}, result)
+        poll.assert_has_calls([mock.call({'a', 'b'}), mock.call({'a', 'b'})])
+        callback.assert_has_calls([mock.call(20), mock.call(100)])
+        mock_sleep.assert_called_once_with(2)
+        self.assertEqual(2, res_waiter.polls)
+
+    def test_wait_for_status_only_polls_pending(self, mock_sleep):
+        poll = mock.Mock(side_effect=[
+            {'a': _resource('ACTIVE'), 'b': _resource('BUILD')},
+            {},
+            {'b': _resource('ACTIVE')},
+        ])
+        res_waiter = waiter.Waiter(poll, interval=1, backoff=2, jitter=0)
+
+        result = res_waiter.wait_for_status(['a', 'b'])
+
+        self.assertEqual({'a': True, 'b': True}, result)
+        poll.assert_has_calls([mock.call({'b'}), mock.call({'b'})])
+        mock_sleep.assert_has_calls([mock.call(1), mock.call(2)])
+
+    def test_wait_for_status_gone(self, mock_sleep):
+        poll = mock.Mock(return_value={'a': None})
+
+        result = waiter.Waiter(poll).wait_for_status(['a'])
+
+        self.assertEqual({'a': False}, result)
+        mock_sleep.assert_not_called()
+
+    def test_wait_for_status_timeout(self, mock_sleep):
+        poll = mock.Mock(return_value={'a': _resource('BUILD')})
+
+        with mock.patch('time.time', side_effect=itertools.chain(
+                [0], itertools.repeat(10))):
+            result = waiter.Waiter(poll, timeout=5).wait_for_status(['a'])
+
+        self.assertEqual({'a': False}, result)
+        poll.assert_called_once_with({'a'})
+
+    def test_wait_for_delete(self, mock_sleep):
+        poll = mock.Mock(side_effect=[
+            {'a': _resource('ACTIVE'), 'b': None},
+            {'a': _resource('DELETED')},
+        ])
+
+        result = waiter.Waiter(poll).wait_for_delete(['a', 'b'])
+
+        self.assertEqual({'a': True, 'b': True}, result)
+
+    def test_wait_for_delete_error(self, mock_sleep):
+        poll = mock.Mock(return_value={'a': _resource('ERROR')})
+
+        result = waiter.Waiter(poll).wait_for_delete(['a'])
+
+        self.assertEqual({'a': False}, result)
+
+    def test_wait_for_on_finished(self, mock_sleep):
+        poll = mock.Mock(side_effect=[
+            {'a': _resource('ACTIVE')},
+            {'b': _resource('BUILD')},
+            {'b': _resource('ERROR')},
+        ])
+        queue = ['b']
+        on_finished = mock.Mock(
+            side_effect=lambda res_id, success: [queue.pop()] if queue
+            else [])
+
+        result = waiter.Waiter(poll, jitter=0).wait_for(
+            ['a'],
+            lambda r: r.status == 'ACTIVE',
+            lambda r: r.status == 'ERROR',
+            on_finished=on_finished,
+        )
+
+        self.assertEqual({'a': True, 'b': False}, result)
+        poll.assert_has_calls(
+            [mock.call({'a'}), mock.call({'b'}), mock.call({'b'})])
+        on_finished.assert_has_calls(
+            [mock.call('a', True), mock.call('b', False)])
+        mock_sleep.assert_has_calls([mock.call(2), mock.call(3)])
+
+    def test_sleep_time(self, mock_sleep):
+        res_waiter = waiter.Waiter(
+            mock.Mock(), interval=2, max_interval=10, backoff=2, jitter=0.5)
+
+        for cycle, delay in enumerate([2, 4, 8, 10, 10]):
+            sleep = res_waiter._sleep_time(cycle)
+            self.assertTrue(delay * 0.5 <= sleep <= delay * 1.5)
@@ -190,3 +190,101 @@ class TestConsoleUrlShow(TestConsole):
         self.fake_server.get_console_url.assert_called_once_with('webmks')
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
+
+
+class TestConsoleLogShow(TestConsole):
+
+    def setUp(self):
+        super(TestConsoleLogShow, self).setUp()
+        self.fake_server = compute_fakes.FakeServer.create_one_server(
+            methods={'get_console_output': None})
+        self.servers_mock.get.return_value = self.fake_server
+
+        self.cmd = console.ShowConsoleLog(self.app, None)
+
+    def test_console_log_show(self):
+        self.fake_server.get_console_output.return_value = 'line1\nline2'
+        arglist = [
+            '--lines', '2',
+            'foo_vm',
+        ]
+        verifylist = [
+            ('lines', 2),
+            ('follow', False),
+            ('server', 'foo_vm'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.app.stdout, 'write') as mock_write:
+            self.cmd.take_action(parsed_args)
+
+        self.fake_server.get_console_output.assert_called_once_with(length=3)
+        mock_write.assert_called_once_with('line1\nline2\n')
+
+    @mock.patch('time.sleep')
+    def test_console_log_show_follow(self, mock_sleep):
+        self.fake_server.get_console_output.side_effect = [
+            'line1\nline2\nlin',
+            'line1\nline2\nlin',
+            'line1\nline2\nline3\nline4\n',
+            # More than the window was written, so it is fetched again
+            # with a larger window
+            '\n'.join('new%d' % i for i in range(101)) + '\n',
+            'line1\nline2\nline3\nline4\n' +
+            ''.join('new%d\n' % i for i in range(101)),
+            KeyboardInterrupt,
+        ]
+        arglist = [
+            '--follow',
+            'foo_vm',
+        ]
+        verifylist = [
+            ('follow', True),
+            ('server', 'foo_vm'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(self.app.stdout, 'write') as mock_write:
+            self.cmd.take_action(parsed_args)
+
+        self.fake_server.get_console_output.assert_has_calls([
+            mock.call(length=None),
+            mock.call(length=console.FOLLOW_WINDOW_LINES + 1),
+            mock.call(length=console.FOLLOW_WINDOW_LINES + 1),
+            mock.call(length=console.FOLLOW_WINDOW_LINES + 1),
+            mock.call(length=console.FOLLOW_WINDOW_LINES * 2 + 1),
+        ])
+        mock_write.assert_has_calls([
+            mock.call('line1\nline2\n'),
+            mock.call('line3\nline4\n'),
+            mock.call(''.join('new%d\n' % i for i in range(101))),
+        ])
+        self.assertEqual(3, mock_write.call_count)
+        mock_sleep.assert_has_calls([
+            mock.call(console.FOLLOW_INTERVAL),
+            mock.call(console.FOLLOW_INTERVAL * console.FOLLOW_BACKOFF),
+            mock.call(console.FOLLOW_INTERVAL),
+        ])
+
+    def test_new_lines(self):
+        self.assertEqual(
+            ['c\n', 'd\n'],
+            console._new_lines(['a\n', 'b\n', 'c\n', 'd\n'], ['a\n', 'b\n']))
+        self.assertEqual(
+            [], console._new_lines(['a\n', 'b\n'], ['a\n', 'b\n']))
+        self.assertEqual(['a\n'], console._new_lines(['a\n'], []))
+        self.assertIsNone(console._new_lines(['c\n'], ['a\n', 'b\n']))
+
+    def test_new_lines_repeated(self):
+        # A window that moved on by one repeated line
+        self.assertEqual(
+            ['h\n'],
+            console._new_lines(['h\n'] * 12, ['x\n'] + ['h\n'] * 11))
+        # With the whole log, the offset is used
+        self.assertEqual(
+            ['h\n', 'h\n'],
+            console._new_lines(['h\n', 'h\n', 'h\n', 'h\n'],
+                               ['h\n', 'h\n'], offset=2))
+        # The log was reset
+        self.assertIsNone(
+            console._new_lines(['c\n', 'd\n'], ['a\n', 'b\n'], offset=2))
@@ -585,6 +585,52 @@ class TestFlavorList(TestFlavor):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(tuple(self.data_long), tuple(data))
 
+    def test_flavor_list_long_many(self):
+        flavors = compute_fakes.FakeFlavor.create_flavors(count=3)
+        self.flavors_mock.list.return_value = flavors
+
+        arglist = [
+            '--long',
+        ]
+        verifylist = [
+            ('long', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns_long, columns)
+        self.assertEqual(
+            [u'property=\'value\''] * 3,
+            [row[-1] for row in data],
+        )
+        for f in flavors:
+            f.get_keys.assert_called_once_with()
+
+    def test_flavor_list_long_embedded_extra_specs(self):
+        flavors = compute_fakes.FakeFlavor.create_flavors(
+            attrs={'extra_specs': {'hw:cpu_policy': 'dedicated'}}, count=2)
+        self.flavors_mock.list.return_value = flavors
+        self.app.client_manager.compute.api_version = \
+            novaclient.api_versions.APIVersion('2.61')
+
+        arglist = [
+            '--long',
+        ]
+        verifylist = [
+            ('long', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            [u'hw:cpu_policy=\'dedicated\''] * 2,
+            [row[-1] for row in data],
+        )
+        for f in flavors:
+            f.get_keys.assert_not_called()
+
 
 class TestFlavorSet(TestFlavor):
 
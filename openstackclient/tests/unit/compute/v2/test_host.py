@@ -14,6 +14,7 @@
 #
 
 import mock
+from osc_lib import exceptions
 
 from openstackclient.compute.v2 import host
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
@@ -189,3 +190,109 @@ class TestHostShow(TestHost):
         h_mock.assert_called_with(self.host['host_name'])
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, list(data))
+
+
+@mock.patch('time.sleep')
+class TestHostDrain(TestHost):
+
+    def setUp(self):
+        super(TestHostDrain, self).setUp()
+
+        self.servers_mock = self.compute.servers
+        self.servers_mock.reset_mock()
+        self.servers = [
+            compute_fakes.FakeServer.create_one_server(
+                attrs={'status': status, 'OS-EXT-SRV-ATTR:host': 'source'},
+                methods={'live_migrate': None})
+            for status in ('ACTIVE', 'ACTIVE', 'SHUTOFF')
+        ]
+
+        self.cmd = host.DrainHost(self.app, None)
+
+    def _server(self, server, host, task_state=None):
+        return compute_fakes.FakeServer.create_one_server(attrs={
+            'id': server.id,
+            'name': server.name,
+            'status': 'ACTIVE',
+            'OS-EXT-SRV-ATTR:host': host,
+            'OS-EXT-STS:task_state': task_state,
+        })
+
+    def test_host_drain(self, mock_sleep):
+        self.servers_mock.list.side_effect = [
+            self.servers,
+            [self._server(self.servers[0], 'target'),
+             self._server(self.servers[1], 'source', 'migrating')],
+        ]
+        # Failed live migrations leave the server idle on the source host
+        self.servers_mock.get.return_value = self._server(
+            self.servers[1], 'source')
+
+        arglist = ['--parallel', '2', 'source']
+        verifylist = [
+            ('parallel', 2),
+            ('host', 'source'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.list.assert_has_calls([
+            mock.call(search_opts={'host': 'source', 'all_tenants': True},
+                      limit=-1),
+            mock.call(search_opts={'changes-since': mock.ANY,
+                                   'all_tenants': True}, limit=-1),
+        ])
+        self.servers_mock.get.assert_called_once_with(self.servers[1].id)
+        self.servers[0].live_migrate.assert_called_once_with(
+            block_migration=False, host=None, disk_over_commit=False)
+        self.servers[2].live_migrate.assert_not_called()
+        self.assertEqual(
+            ('ID', 'Name', 'Result', 'Destination Host', 'Duration (s)'),
+            columns)
+        self.assertEqual(
+            [(self.servers[0].id, self.servers[0].name, 'migrated',
+              'target'),
+             (self.servers[1].id, self.servers[1].name, 'failed', None),
+             (self.servers[2].id, self.servers[2].name, 'skipped', None)],
+            [row[:4] for row in data])
+        self.assertEqual('1 of 3 servers were not migrated off source',
+                         self.cmd._failure)
+
+    @mock.patch('osc_lib.command.command.Lister.run', return_value=0)
+    def test_host_drain_failed(self, mock_run, mock_sleep):
+        self.cmd._failure = 'failed'
+
+        self.assertRaises(exceptions.CommandError, self.cmd.run, mock.Mock())
+        mock_run.assert_called_once_with(mock.ANY)
+
+    def test_host_drain_one_at_a_time(self, mock_sleep):
+        self.servers_mock.list.return_value = self.servers
+        self.servers_mock.get.side_effect = [
+            self._server(self.servers[0], 'target'),
+            self._server(self.servers[1], 'target'),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, ['source'], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['migrated', 'migrated', 'skipped'],
+                         [row[2] for row in data])
+        self.assertIsNone(self.cmd._failure)
+        # The second migration only starts once the first one is done
+        self.servers_mock.get.assert_has_calls([
+            mock.call(self.servers[0].id),
+            mock.call(self.servers[1].id),
+        ])
+
+    def test_host_drain_target_host_old_api(self, mock_sleep):
+        arglist = ['--target-host', 'target', 'source']
+        verifylist = [
+            ('target_host', 'target'),
+            ('host', 'source'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
@@ -16,6 +16,7 @@
 import copy
 
 from novaclient import exceptions as nova_exceptions
+from osc_lib.cli import format_columns
 from osc_lib import exceptions
 
 from openstackclient.compute.v2 import hypervisor
@@ -46,6 +47,26 @@ class TestHypervisorList(TestHypervisor):
         self.hypervisors = compute_fakes.FakeHypervisor.create_hypervisors()
         self.hypervisors_mock.list.return_value = self.hypervisors
 
+        # Both fake hypervisors are on host 'aaa'
+        self.aggregate = compute_fakes.FakeAggregate.create_one_aggregate(
+            {'hosts': ['aaa', 'bbb']})
+        self.aggregates_mock.list.return_value = [
+            self.aggregate,
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                {'hosts': ['bbb']}),
+        ]
+
+        def _uptime(hypervisor_id):
+            if hypervisor_id != self.hypervisors[0].id:
+                raise nova_exceptions.HTTPNotImplemented(501)
+            return fakes.FakeResource(info={
+                'id': hypervisor_id,
+                'uptime': ' 01:28:24 up 3 days, 11:15,  1 user, '
+                          ' load average: 0.94, 0.62, 0.50\n',
+            })
+
+        self.hypervisors_mock.uptime.side_effect = _uptime
+
         self.columns = (
             "ID",
             "Hypervisor Hostname",
@@ -62,7 +83,9 @@ class TestHypervisorList(TestHypervisor):
             "vCPUs Used",
             "vCPUs",
             "Memory MB Used",
-            "Memory MB"
+            "Memory MB",
+            "Aggregates",
+            "Uptime",
         )
         self.data = (
             (
@@ -91,7 +114,9 @@ class TestHypervisorList(TestHypervisor):
                 self.hypervisors[0].vcpus_used,
                 self.hypervisors[0].vcpus,
                 self.hypervisors[0].memory_mb_used,
-                self.hypervisors[0].memory_mb
+                self.hypervisors[0].memory_mb,
+                format_columns.ListColumn([self.aggregate.name]),
+                '3 days, 11:15',
             ),
             (
                 self.hypervisors[1].id,
@@ -102,7 +127,9 @@ class TestHypervisorList(TestHypervisor):
                 self.hypervisors[1].vcpus_used,
                 self.hypervisors[1].vcpus,
                 self.hypervisors[1].memory_mb_used,
-                self.hypervisors[1].memory_mb
+                self.hypervisors[1].memory_mb,
+                format_columns.ListColumn([self.aggregate.name]),
+                None,
             ),
         )
         # Get the command object to test
@@ -185,6 +212,8 @@ class TestHypervisorList(TestHypervisor):
         columns, data = self.cmd.take_action(parsed_args)
 
         self.hypervisors_mock.list.assert_called_with()
+        self.aggregates_mock.list.assert_called_once_with()
+        self.assertEqual(2, self.hypervisors_mock.uptime.call_count)
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(self.data_long, tuple(data))
 
@@ -294,6 +323,29 @@ class TestHypervisorShow(TestHypervisor):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
 
+    def test_hypervisor_show_aggregates_in_cell(self):
+        self.hypervisor.service['host'] = 'cell1@aaa'
+        self.hypervisors_mock.get.return_value = self.hypervisor
+        self.aggregates_mock.list.return_value = [
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                {'name': 'cell1@agg1', 'hosts': ['aaa']}),
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                {'name': 'cell2@agg2', 'hosts': ['aaa']}),
+            compute_fakes.FakeAggregate.create_one_aggregate(
+                {'name': 'cell1@agg3', 'hosts': ['bbb']}),
+        ]
+        arglist = [
+            self.hypervisor.hypervisor_hostname,
+        ]
+        verifylist = [
+            ('hypervisor', self.hypervisor.hypervisor_hostname),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['cell1@agg1'], data[columns.index('aggregates')])
+
     def test_hyprvisor_show_uptime_not_implemented(self):
         arglist = [
             self.hypervisor.hypervisor_hostname,
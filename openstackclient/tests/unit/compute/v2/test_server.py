@@ -26,6 +26,8 @@ from osc_lib import utils as common_utils
 from oslo_utils import timeutils
 import six
 
+from openstackclient.common import resource_cache
+from openstackclient.common import waiter
 from openstackclient.compute.v2 import server
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -38,6 +40,7 @@ class TestServer(compute_fakes.TestComputev2):
 
     def setUp(self):
         super(TestServer, self).setUp()
+        self.addCleanup(resource_cache.reset)
 
         # Get a shortcut to the compute client ServerManager Mock
         self.servers_mock = self.app.client_manager.compute.servers
@@ -1351,7 +1354,7 @@ class TestServerCreate(TestServer):
                           self.cmd.take_action, parsed_args)
         self.assertNotCalled(self.servers_mock.create)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=True)
     def test_server_create_with_wait_ok(self, mock_wait_for_status):
         arglist = [
             '--image', 'image1',
@@ -1370,7 +1373,7 @@ class TestServerCreate(TestServer):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
         columns, data = self.cmd.take_action(parsed_args)
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.new_server.id,
             callback=mock.ANY,
         )
@@ -1399,7 +1402,7 @@ class TestServerCreate(TestServer):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist(), data)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=False)
     def test_server_create_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--image', 'image1',
@@ -1420,7 +1423,7 @@ class TestServerCreate(TestServer):
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.new_server.id,
             callback=mock.ANY,
         )
@@ -1447,6 +1450,64 @@ class TestServerCreate(TestServer):
             **kwargs
         )
 
+    @mock.patch('time.sleep')
+    def test_server_create_with_wait_many(self, mock_sleep):
+        building = compute_fakes.FakeServer.create_servers(
+            attrs={'status': 'BUILD'}, count=2)
+        booted = [
+            compute_fakes.FakeServer.create_one_server(attrs={
+                'id': building[0].id, 'name': building[0].name,
+                'status': 'ACTIVE', 'networks': {}}),
+            compute_fakes.FakeServer.create_one_server(attrs={
+                'id': building[1].id, 'name': building[1].name,
+                'status': 'ERROR', 'networks': {}}),
+        ]
+        self.servers_mock.create.return_value = 'r-reservation'
+        self.servers_mock.list.side_effect = [building, booted, booted]
+
+        arglist = [
+            '--image', 'image1',
+            '--flavor', 'flavor1',
+            '--min', '2',
+            '--max', '2',
+            '--wait',
+            self.new_server.name,
+        ]
+        verifylist = [
+            ('min', 2),
+            ('max', 2),
+            ('wait', True),
+            ('server_name', self.new_server.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertTrue(
+            self.servers_mock.create.call_args[1]['reservation_id'])
+        search_opts = {'reservation_id': 'r-reservation'}
+        self.servers_mock.list.assert_has_calls([
+            mock.call(search_opts=search_opts, limit=-1),
+            mock.call(search_opts={'changes-since': mock.ANY}, limit=-1),
+            mock.call(search_opts=search_opts, limit=-1),
+        ])
+        self.servers_mock.get.assert_not_called()
+        self.assertEqual(tuple(s.id for s in booted), columns)
+        rows = [value.human_readable() for value in data]
+        for s, row in zip(booted, rows):
+            self.assertIn("name='%s'" % s.name, row)
+            self.assertIn("status='%s'" % s.status, row)
+        self.assertIn("boot_time='", rows[0])
+        self.assertIn("boot_time=,", rows[1])
+        self.assertEqual([booted[1].id], self.cmd._failed_servers)
+
+    @mock.patch('osc_lib.command.command.ShowOne.run', return_value=0)
+    def test_server_create_with_wait_many_failed(self, mock_run):
+        self.cmd._failed_servers = ['server-b', 'server-a']
+
+        self.assertRaises(exceptions.CommandError, self.cmd.run, mock.Mock())
+        mock_run.assert_called_once_with(mock.ANY)
+
     @mock.patch('openstackclient.compute.v2.server.io.open')
     def test_server_create_userdata(self, mock_open):
         mock_file = mock.Mock(name='File')
@@ -2423,9 +2484,63 @@ class TestServerDelete(TestServer):
         self.servers_mock.delete.assert_has_calls(calls)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=True)
+    def test_server_delete_multi_servers_parallel(self):
+        servers = self.setup_servers_mock(count=3)
+
+        arglist = [s.id for s in servers] + ['--parallel', '3']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        result = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.delete.assert_has_calls(
+            [call(s.id) for s in servers], any_order=True)
+        self.assertIsNone(result)
+
+    def test_server_delete_multi_servers_with_exception(self):
+        servers = self.setup_servers_mock(count=1)
+
+        arglist = [servers[0].id, 'unexist_server']
+        verifylist = [
+            ('server', [servers[0].id, 'unexist_server']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(common_utils, 'find_resource',
+                               side_effect=[servers[0],
+                                            exceptions.CommandError]):
+            ex = self.assertRaises(exceptions.CommandError,
+                                   self.cmd.take_action,
+                                   parsed_args)
+        self.assertEqual('1 of 2 servers failed to delete.', str(ex))
+        self.servers_mock.delete.assert_called_once_with(servers[0].id)
+
+    def test_server_delete_wait_multi_servers(self):
+        servers = self.setup_servers_mock(count=3)
+        # Deleted servers are gone from the list of changed servers
+        self.servers_mock.list.return_value = []
+
+        arglist = [s.id for s in servers] + ['--wait']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        result = self.cmd.take_action(parsed_args)
+
+        # A single list request polls all the servers
+        self.servers_mock.list.assert_called_once_with(
+            search_opts={'changes-since': mock.ANY}, limit=-1)
+        self.assertIsNone(result)
+
+    @mock.patch.object(waiter.Waiter, 'wait_for_delete')
     def test_server_delete_wait_ok(self, mock_wait_for_delete):
         servers = self.setup_servers_mock(count=1)
+        mock_wait_for_delete.return_value = {servers[0].id: True}
 
         arglist = [
             servers[0].id, '--wait'
@@ -2439,15 +2554,16 @@ class TestServerDelete(TestServer):
 
         self.servers_mock.delete.assert_called_with(servers[0].id)
         mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
+            [servers[0].id],
+            deleted_status=('deleted', 'soft_deleted'),
             callback=mock.ANY,
         )
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=False)
+    @mock.patch.object(waiter.Waiter, 'wait_for_delete')
     def test_server_delete_wait_fails(self, mock_wait_for_delete):
         servers = self.setup_servers_mock(count=1)
+        mock_wait_for_delete.return_value = {servers[0].id: False}
 
         arglist = [
             servers[0].id, '--wait'
@@ -2461,8 +2577,8 @@ class TestServerDelete(TestServer):
 
         self.servers_mock.delete.assert_called_with(servers[0].id)
         mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
+            [servers[0].id],
+            deleted_status=('deleted', 'soft_deleted'),
             callback=mock.ANY,
         )
 
@@ -2639,14 +2755,54 @@ class TestServerList(TestServer):
         columns, data = self.cmd.take_action(parsed_args)
 
         self.servers_mock.list.assert_called_with(**self.kwargs)
-        self.images_mock.list.assert_called()
-        self.flavors_mock.list.assert_called()
-        # we did not pass image or flavor, so gets on those must be absent
+        # only a few images and flavors are referenced, so they are looked
+        # up by ID rather than listing the whole catalogs
+        self.assertFalse(self.images_mock.list.call_count)
+        self.assertFalse(self.flavors_mock.list.call_count)
+        self.images_mock.get.assert_has_calls(
+            [mock.call(s.image['id']) for s in self.servers if s.image],
+            any_order=True)
+        self.flavors_mock.get.assert_has_calls(
+            [mock.call(s.flavor['id']) for s in self.servers],
+            any_order=True)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(tuple(self.data), tuple(data))
+
+    @mock.patch.object(server, 'NAME_LOOKUP_BULK_THRESHOLD', 1)
+    def test_server_list_bulk_name_lookup(self):
+        arglist = []
+        verifylist = [
+            ('name_lookup_one_by_one', False),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.list.assert_called_with(**self.kwargs)
+        self.images_mock.list.assert_called_once_with()
+        self.flavors_mock.list.assert_called_once_with(is_public=None)
         self.assertFalse(self.flavors_mock.get.call_count)
         self.assertFalse(self.images_mock.get.call_count)
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
 
+    @mock.patch.object(server, 'NAME_LOOKUP_BULK_THRESHOLD', 1)
+    def test_server_list_name_lookup_failure(self):
+        arglist = []
+        verifylist = []
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.images_mock.list.side_effect = Exception()
+        self.flavors_mock.list.side_effect = Exception()
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            tuple((s.id, s.name, s.status,
+                   server._format_servers_list_networks(s.networks),
+                   '', '') for s in self.servers),
+            tuple(data))
+
     def test_server_list_no_servers(self):
         arglist = []
         verifylist = [
@@ -3468,7 +3624,7 @@ class TestServerMigrate(TestServer):
         self.assertNotCalled(self.servers_mock.migrate)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=True)
     def test_server_migrate_with_wait(self, mock_wait_for_status):
         arglist = [
             '--wait', self.server.id,
@@ -3488,7 +3644,7 @@ class TestServerMigrate(TestServer):
         self.assertNotCalled(self.servers_mock.live_migrate)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=False)
     def test_server_migrate_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--wait', self.server.id,
@@ -3646,7 +3802,7 @@ class TestServerRebuild(TestServer):
         self.server.rebuild.assert_called_with(self.image, None,
                                                description=description)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=True)
     def test_rebuild_with_wait_ok(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -3664,7 +3820,7 @@ class TestServerRebuild(TestServer):
         # kwargs = dict(success_status=['active', 'verify_resize'],)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.server.id,
             callback=mock.ANY,
             # **kwargs
@@ -3674,7 +3830,7 @@ class TestServerRebuild(TestServer):
         self.images_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, None)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=False)
     def test_rebuild_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -3689,7 +3845,7 @@ class TestServerRebuild(TestServer):
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.server.id,
             callback=mock.ANY,
         )
@@ -4269,7 +4425,7 @@ class TestServerResize(TestServer):
         self.assertIn('The --revert option has been deprecated.',
                       six.text_type(mock_warning.call_args[0][0]))
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=True)
     def test_server_resize_with_wait_ok(self, mock_wait_for_status):
 
         arglist = [
@@ -4296,7 +4452,7 @@ class TestServerResize(TestServer):
         kwargs = dict(success_status=['active', 'verify_resize'],)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.server.id,
             callback=mock.ANY,
             **kwargs
@@ -4309,7 +4465,7 @@ class TestServerResize(TestServer):
         self.assertNotCalled(self.servers_mock.confirm_resize)
         self.assertNotCalled(self.servers_mock.revert_resize)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(server, '_wait_for_server_status', return_value=False)
     def test_server_resize_with_wait_fails(self, mock_wait_for_status):
 
         arglist = [
@@ -4336,7 +4492,7 @@ class TestServerResize(TestServer):
         kwargs = dict(success_status=['active', 'verify_resize'],)
 
         mock_wait_for_status.assert_called_once_with(
-            self.servers_mock.get,
+            mock.ANY,
             self.server.id,
             callback=mock.ANY,
             **kwargs
@@ -5102,11 +5258,9 @@ class TestServerGeneral(TestServer):
 
     @mock.patch('osc_lib.utils.find_resource')
     def test_prep_server_detail(self, find_resource):
-        # Setup mock method return value. utils.find_resource() will be called
-        # three times in _prep_server_detail():
-        # - The first time, return server info.
-        # - The second time, return image info.
-        # - The third time, return flavor info.
+        # Setup mock method return value. utils.find_resource() is only
+        # called to refresh the server, the image and flavor are fetched
+        # by ID.
         _image = image_fakes.FakeImage.create_one_image()
         _flavor = compute_fakes.FakeFlavor.create_one_flavor()
         server_info = {
@@ -5117,7 +5271,9 @@ class TestServerGeneral(TestServer):
             'links': u'http://xxx.yyy.com',
         }
         _server = compute_fakes.FakeServer.create_one_server(attrs=server_info)
-        find_resource.side_effect = [_server, _image, _flavor]
+        find_resource.side_effect = [_server]
+        self.app.client_manager.image.images.get.return_value = _image
+        self.app.client_manager.compute.flavors.get.return_value = _flavor
 
         # Prepare result data.
         info = {
@@ -5143,3 +5299,29 @@ class TestServerGeneral(TestServer):
 
         # Check the results.
         self.assertEqual(info, server_detail)
+        self.app.client_manager.image.images.get.assert_called_once_with(
+            _image.id)
+        self.app.client_manager.compute.flavors.get.assert_called_once_with(
+            _flavor.id)
+
+    @mock.patch('osc_lib.utils.find_resource')
+    def test_prep_server_detail_boot_from_volume(self, find_resource):
+        _flavor = compute_fakes.FakeFlavor.create_one_flavor()
+        _server = compute_fakes.FakeServer.create_one_server(attrs={
+            'image': '',
+            'flavor': {u'id': _flavor.id},
+            'networks': {},
+        })
+        find_resource.side_effect = [_server]
+        self.app.client_manager.compute.flavors.get.return_value = _flavor
+
+        server_detail = server._prep_server_detail(
+            self.app.client_manager.compute,
+            self.app.client_manager.image,
+            _server
+        )
+
+        self.assertEqual('', server_detail['image'])
+        self.assertEqual(
+            u'%s (%s)' % (_flavor.name, _flavor.id), server_detail['flavor'])
+        self.app.client_manager.image.images.get.assert_not_called()
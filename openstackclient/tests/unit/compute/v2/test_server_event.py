@@ -13,6 +13,10 @@
 #   under the License.
 #
 
+import mock
+from osc_lib.cli import format_columns
+from osc_lib import exceptions
+
 from openstackclient.compute.v2 import server_event
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 
@@ -79,7 +83,7 @@ class TestListServerEvent(TestServerEvent):
             self.fake_server.name,
         ]
         verifylist = [
-            ('server', self.fake_server.name),
+            ('server', [self.fake_server.name]),
             ('long', False),
         ]
 
@@ -99,7 +103,7 @@ class TestListServerEvent(TestServerEvent):
             self.fake_server.name,
         ]
         verifylist = [
-            ('server', self.fake_server.name),
+            ('server', [self.fake_server.name]),
             ('long', True),
         ]
 
@@ -113,6 +117,85 @@ class TestListServerEvent(TestServerEvent):
         self.assertEqual(self.long_columns, columns)
         self.assertEqual(self.long_data, tuple(data))
 
+    def test_server_event_list_multiple_servers(self):
+        other_server = compute_fakes.FakeServer.create_one_server()
+        self.servers_mock.get.side_effect = [self.fake_server, other_server]
+        arglist = [
+            self.fake_server.name,
+            other_server.name,
+        ]
+        verifylist = [
+            ('server', [self.fake_server.name, other_server.name]),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.events_mock.list.assert_has_calls([
+            mock.call(self.fake_server.id),
+            mock.call(other_server.id),
+        ], any_order=True)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data * 2, tuple(data))
+
+    def test_server_event_list_changes_since(self):
+        old_event = compute_fakes.FakeServerEvent.create_one_server_event(
+            {'start_time': '2017-02-26T07:47:13.000000'})
+        self.events_mock.list.return_value = [self.fake_event, old_event]
+        self.servers_mock.list.return_value = [self.fake_server]
+        arglist = [
+            '--all-projects',
+            '--changes-since', '2017-02-27T00:00:00Z',
+        ]
+        verifylist = [
+            ('server', []),
+            ('all_projects', True),
+            ('changes_since', '2017-02-27T00:00:00Z'),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.list.assert_called_once_with(search_opts={
+            'changes-since': '2017-02-27T00:00:00Z',
+            'all_tenants': True,
+        }, limit=-1)
+        self.events_mock.list.assert_called_once_with(self.fake_server.id)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, tuple(data))
+
+    def test_server_event_list_no_server(self):
+        parsed_args = self.check_parser(self.cmd, [], [('server', [])])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action,
+                          parsed_args)
+
+    def test_server_event_list_details(self):
+        self.events_mock.get.return_value = self.fake_event
+        arglist = [
+            '--details',
+            self.fake_server.name,
+        ]
+        verifylist = [
+            ('server', [self.fake_server.name]),
+            ('details', True),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.events_mock.get.assert_called_once_with(
+            self.fake_event.instance_uuid, self.fake_event.request_id)
+        self.assertEqual(self.columns + ('Events',), columns)
+        self.assertEqual(
+            (self.data[0] + (format_columns.ListColumn(
+                ['compute__do_build_and_run_instance: Success']),),),
+            tuple(data))
+
 
 class TestShowServerEvent(TestServerEvent):
 
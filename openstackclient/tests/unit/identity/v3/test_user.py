@@ -673,6 +673,7 @@ class TestUserList(TestUser):
 
         kwargs = {
             'project': self.project.id,
+            'include_names': True,
         }
 
         self.role_assignments_mock.list.assert_called_with(**kwargs)
@@ -681,6 +682,71 @@ class TestUserList(TestUser):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist, tuple(data))
 
+    def test_user_list_project_include_names(self):
+        self.role_assignments_mock.list.return_value = [
+            identity_fakes.FakeRoleAssignment.create_one_role_assignment(
+                attrs={'user': {'id': self.user.id,
+                                'name': self.user.name}}),
+        ]
+        arglist = [
+            '--project', self.project.name,
+        ]
+        verifylist = [
+            ('project', self.project.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.users_mock.get.assert_not_called()
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.datalist, tuple(data))
+
+    @mock.patch(
+        'openstackclient.identity.v3.user.USER_LOOKUP_BULK_THRESHOLD', 0)
+    def test_user_list_project_long_bulk(self):
+        self.role_assignments_mock.list.return_value = [
+            identity_fakes.FakeRoleAssignment.create_one_role_assignment(
+                attrs={'user': {'id': self.user.id,
+                                'name': self.user.name,
+                                'domain': {'id': self.domain.id}}}),
+        ]
+        arglist = [
+            '--project', self.project.name,
+            '--long',
+        ]
+        verifylist = [
+            ('project', self.project.name),
+            ('long', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.users_mock.list.assert_called_once_with(domain=self.domain.id)
+        self.users_mock.get.assert_not_called()
+        self.assertEqual(
+            [(self.user.id, self.user.name)],
+            [row[:2] for row in data],
+        )
+
+    def test_user_list_project_long_not_found(self):
+        self.users_mock.resource_class.__name__ = 'User'
+        self.users_mock.get.side_effect = exceptions.NotFound('Not found')
+        self.users_mock.find.side_effect = exceptions.NotFound('Not found')
+        arglist = [
+            '--project', self.project.name,
+            '--long',
+        ]
+        verifylist = [
+            ('project', self.project.name),
+            ('long', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+
 
 class TestUserSet(TestUser):
 
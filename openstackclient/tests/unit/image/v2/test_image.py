@@ -14,12 +14,14 @@
 #
 
 import copy
+import hashlib
 
 from glanceclient.common import utils as glanceclient_utils
 from glanceclient.v2 import schemas
 import mock
 from osc_lib.cli import format_columns
 from osc_lib import exceptions
+import six
 import warlock
 
 from openstackclient.image.v2 import image
@@ -303,6 +305,56 @@ class TestImageCreate(TestImage):
             exceptions.CommandError,
             self.cmd.take_action, parsed_args)
 
+    def _upload_data(self, data, image_attrs):
+        def _upload(image_id, reader):
+            self.uploaded = b''.join(iter(lambda: reader.read(3), b''))
+
+        self.images_mock.upload.side_effect = _upload
+        self.images_mock.get.return_value = (
+            image_fakes.FakeImage.create_one_image(image_attrs))
+        arglist = [
+            '--file', 'filer',
+            self.new_image.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        with mock.patch('glanceclient.common.utils.get_data_file',
+                        return_value=six.BytesIO(data)):
+            return self.cmd.take_action(parsed_args)
+
+    def test_image_create_file_verified(self):
+        data = b'image data'
+        self._upload_data(data, {
+            'checksum': hashlib.md5(data).hexdigest(),
+            'os_hash_algo': 'sha512',
+            'os_hash_value': hashlib.sha512(data).hexdigest(),
+        })
+
+        self.assertEqual(data, self.uploaded)
+        self.images_mock.delete.assert_not_called()
+
+    def test_image_create_file_checksum_mismatch(self):
+        self.assertRaises(
+            exceptions.CommandError,
+            self._upload_data,
+            b'image data',
+            {'os_hash_algo': 'sha512', 'os_hash_value': 'bad'},
+        )
+
+    def test_upload_reader_progress(self):
+        progress = mock.Mock()
+        reader = image._UploadReader(
+            six.BytesIO(b'abcdefgh'), progress=progress, chunk_size=5)
+
+        self.assertEqual([b'abcde', b'fgh'], list(reader))
+        reader.close()
+        self.assertTrue(reader.eof)
+        self.assertEqual(8, reader.bytes_read)
+        self.assertEqual(
+            hashlib.md5(b'abcdefgh').hexdigest(),
+            reader.checksum.hexdigest())
+        progress.assert_has_calls(
+            [mock.call(5, mock.ANY), mock.call(8, mock.ANY)])
+
 
 class TestAddProjectToImage(TestImage):
 
@@ -503,13 +555,33 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
         self.assertListItemEqual(self.datalist, tuple(data))
 
+    def test_image_list_pages(self):
+        images = image_fakes.FakeImage.create_images(count=2)
+        self.api_mock.image_list.side_effect = [
+            [images[0]], [images[1]], [],
+        ]
+
+        parsed_args = self.check_parser(self.cmd, [], [])
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            [images[0].id, images[1].id], [row[0] for row in data])
+        self.api_mock.image_list.assert_has_calls([
+            mock.call(marker=None, sort_key='name', sort_dir='asc'),
+            mock.call(marker=images[0].id, sort_key='name', sort_dir='asc'),
+            mock.call(marker=images[1].id, sort_key='name', sort_dir='asc'),
+        ])
+
     def test_image_list_public_option(self):
         arglist = [
             '--public',
@@ -527,9 +599,12 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             public=True,
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -552,9 +627,12 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             private=True,
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -577,9 +655,12 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             community=True,
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -602,9 +683,12 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             shared=True,
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -629,10 +713,13 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             shared=True,
             member_status='all',
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -666,8 +753,11 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
         collist = (
@@ -716,18 +806,67 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
+        self.api_mock.image_list.assert_called_with(
+            marker=self._image.id,
+            a='1',
+            sort_key='name',
+            sort_dir='asc',
+        )
+        sf_mock.assert_not_called()
+
+        self.assertEqual(self.columns, columns)
+        self.assertListItemEqual(self.datalist, data)
+
+    @mock.patch('osc_lib.api.utils.simple_filter')
+    def test_image_list_property_option_client_side(self, sf_mock):
+        arglist = [
+            '--property', 'min_disk=1',
+        ]
+        verifylist = [
+            ('property', {'min_disk': '1'}),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
         )
-        sf_mock.assert_called_with(
+        sf_mock.assert_called_once_with(
             [self._image],
-            attr='a',
+            attr='min_disk',
             value='1',
             property_field='properties',
         )
 
-        self.assertEqual(self.columns, columns)
-        self.assertListItemEqual(self.datalist, tuple(data))
+    @mock.patch('osc_lib.api.utils.simple_filter')
+    def test_image_list_property_option_visibility(self, sf_mock):
+        arglist = [
+            '--property', 'visibility=private',
+        ]
+        verifylist = [
+            ('property', {'visibility': 'private'}),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
+        # image_list() drops a visibility filter unless a --public,
+        # --private, --community or --shared flag is given
+        self.api_mock.image_list.assert_called_with(
+            marker=self._image.id,
+            sort_key='name',
+            sort_dir='asc',
+        )
+        sf_mock.assert_called_once_with(
+            [self._image],
+            attr='visibility',
+            value='private',
+            property_field='properties',
+        )
 
     @mock.patch('osc_lib.utils.sort_items')
     def test_image_list_sort_option(self, si_mock):
@@ -741,6 +880,7 @@ class TestImageList(TestImage):
         # returns a tuple containing the column names and an iterable
         # containing the data to be listed.
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             marker=self._image.id,
         )
@@ -763,8 +903,9 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
-            limit=ret_limit, marker=None
+            limit=ret_limit, marker=None, sort_key='name', sort_dir='asc',
         )
 
         self.assertEqual(self.columns, columns)
@@ -787,8 +928,11 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
             marker=image_fakes.image_id,
+            sort_key='name',
+            sort_dir='asc',
         )
 
     def test_image_list_name_option(self):
@@ -801,8 +945,10 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
-            name='abc', marker=self._image.id
+            name='abc', marker=self._image.id,
+            sort_key='name', sort_dir='asc',
         )
 
     def test_image_list_status_option(self):
@@ -815,8 +961,10 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
-            status='active', marker=self._image.id
+            status='active', marker=self._image.id,
+            sort_key='name', sort_dir='asc',
         )
 
     def test_image_list_tag_option(self):
@@ -829,8 +977,10 @@ class TestImageList(TestImage):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = tuple(data)
         self.api_mock.image_list.assert_called_with(
-            tag='abc', marker=self._image.id
+            tag='abc', marker=self._image.id,
+            sort_key='name', sort_dir='asc',
         )
 
 
@@ -1638,3 +1788,49 @@ class TestImageSave(TestImage):
 
         # Raise SystemExit if no data was provided.
         self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
+
+    def test_save_data_parallel(self):
+        image_with_data = image_fakes.FakeImage.create_one_image(
+            {'size': 1024})
+        self.images_mock.get.return_value = image_with_data
+        api_mock = mock.Mock()
+        self.app.client_manager.image.api = api_mock
+
+        arglist = [
+            '--file', '/path/to/file',
+            '--parallel', '4',
+            '--chunk-size', '256',
+            '--resume',
+            image_with_data.id,
+        ]
+        verifylist = [
+            ('file', '/path/to/file'),
+            ('parallel', 4),
+            ('chunk_size', 256),
+            ('resume', True),
+            ('image', image_with_data.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        api_mock.image_save.assert_called_once_with(
+            image_with_data,
+            '/path/to/file',
+            workers=4,
+            chunk_size=256,
+            resume=True,
+            progress=None,
+        )
+        self.images_mock.data.assert_not_called()
+
+    def test_save_parallel_to_stdout(self):
+        arglist = ['--parallel', '4', self.image.id]
+        verifylist = [
+            ('parallel', 4),
+            ('image', self.image.id)
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args)
@@ -732,6 +732,39 @@ class TestDeletePort(TestPort):
             self._ports[0]
         )
 
+    def test_multi_ports_delete_parallel_with_exception(self):
+        arglist = [
+            self._ports[0].name,
+            'unexist_port',
+            self._ports[1].name,
+            '--parallel', '3',
+        ]
+        verifylist = [
+            ('port',
+             [self._ports[0].name, 'unexist_port', self._ports[1].name]),
+            ('parallel', 3),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        ports = dict((p.name, p) for p in self._ports)
+
+        def _find_port(name_or_id, ignore_missing=False):
+            if name_or_id not in ports:
+                raise exceptions.CommandError()
+            return ports[name_or_id]
+
+        self.network.find_port = mock.Mock(side_effect=_find_port)
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 of 3 ports failed to delete.', str(e))
+
+        self.network.delete_port.assert_has_calls(
+            [call(p) for p in self._ports], any_order=True)
+        self.assertEqual(2, self.network.delete_port.call_count)
+
 
 class TestListPort(TestPort):
 
@@ -11,11 +11,15 @@
 #   under the License.
 #
 
+import os
+
+import fixtures
 import mock
 from mock import call
 
 from osc_lib import exceptions
 
+from openstackclient.common import name_cache
 from openstackclient.network import utils as network_utils
 from openstackclient.network.v2 import security_group_rule
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
@@ -503,3 +507,58 @@ class TestShowSecurityGroupRuleCompute(TestSecurityGroupRuleCompute):
         self.compute.api.security_group_list.assert_called_once_with()
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
+
+    def test_security_group_rule_show_stops_at_match(self):
+        security_group = mock.MagicMock()
+        security_group.__getitem__.side_effect = AssertionError(
+            'Searched past the matching rule')
+        self.compute.api.security_group_list.return_value = [
+            {'id': 'sg-id', 'rules': [self._security_group_rule]},
+            security_group,
+        ]
+        arglist = [
+            self._security_group_rule['id'],
+        ]
+        verifylist = [
+            ('rule', self._security_group_rule['id']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, data)
+
+    def test_security_group_rule_show_name_cache(self):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'cache.json')
+        name_cache.configure(path)
+        self.addCleanup(name_cache.reset)
+        fake_rule = compute_fakes.FakeSecurityGroupRule
+        other_rule = fake_rule.create_one_security_group_rule()
+        security_group = {
+            'id': 'sg-id',
+            'rules': [other_rule, self._security_group_rule],
+        }
+        self.compute.api.security_group_list.return_value = [security_group]
+        self.compute.api.security_group_find = mock.Mock(
+            return_value=security_group)
+        arglist = [
+            self._security_group_rule['id'],
+        ]
+        verifylist = [
+            ('rule', self._security_group_rule['id']),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+        columns, data = self.cmd.take_action(parsed_args)
+        self.assertEqual(
+            'sg-id',
+            name_cache.get_cache().get('security_group_rule',
+                                       str(other_rule['id'])))
+
+        self.compute.api.security_group_list.assert_called_once_with()
+        self.compute.api.security_group_find.assert_called_once_with('sg-id')
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, data)
@@ -11,9 +11,13 @@
 #   under the License.
 #
 
+import os
+
+import fixtures
 import mock
 from mock import call
 
+from osc_lib.cli import format_columns
 from osc_lib import exceptions
 
 from openstackclient.network.v2 import security_group_rule
@@ -757,6 +761,135 @@ class TestCreateSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         self.assertEqual(self.expected_columns, columns)
         self.assertEqual(self.expected_data, data)
 
+    def _write_rules_file(self, content):
+        path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'rules.yaml')
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def _setup_bulk_create(self):
+        fake_rule = network_fakes.FakeSecurityGroupRule
+        existing_rule = fake_rule.create_one_security_group_rule({
+            'protocol': 'tcp',
+            'port_range_min': 22,
+            'port_range_max': 22,
+            'remote_ip_prefix': '10.0.0.0/8',
+        })
+        self.network.security_group_rules = mock.Mock(
+            return_value=[existing_rule])
+
+        def _post(url, json):
+            response = mock.Mock(status_code=201)
+            response.json.return_value = {'security_group_rules': [
+                dict(rule, id='rule-id-%s' % rule['port_range_min'])
+                for rule in json['security_group_rules']]}
+            return response
+        self.network.post = mock.Mock(side_effect=_post)
+        return self._write_rules_file(
+            '- {protocol: tcp, dst-port: 22, remote-ip: 10.0.0.0/8}\n'
+            '- {protocol: tcp, dst-port: 80, remote-group: web}\n'
+            '- {protocol: tcp, dst-port: 80, remote-group: web}\n'
+            '- {protocol: udp, dst-port: "53:54", direction: egress}\n'
+        ), existing_rule
+
+    @mock.patch.object(security_group_rule, 'BULK_CREATE_BATCH_SIZE', 1)
+    def test_create_from_file(self):
+        path, existing_rule = self._setup_bulk_create()
+        arglist = [
+            '--from-file', path,
+            self._security_group.id,
+        ]
+        verifylist = [
+            ('from_file', path),
+            ('dry_run', False),
+            ('group', self._security_group.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.network.find_security_group.assert_has_calls([
+            call(self._security_group.id, ignore_missing=False),
+            call('web', ignore_missing=False),
+        ])
+        self.assertEqual(2, self.network.find_security_group.call_count)
+        self.network.security_group_rules.assert_called_once_with(
+            security_group_id=self._security_group.id)
+        self.network.post.assert_has_calls([
+            call('/security-group-rules', json={'security_group_rules': [{
+                'direction': 'ingress',
+                'ethertype': 'IPv4',
+                'protocol': 'tcp',
+                'port_range_min': 80,
+                'port_range_max': 80,
+                'remote_group_id': self._security_group.id,
+                'security_group_id': self._security_group.id,
+            }]}),
+            call('/security-group-rules', json={'security_group_rules': [{
+                'direction': 'egress',
+                'ethertype': 'IPv4',
+                'protocol': 'udp',
+                'port_range_min': 53,
+                'port_range_max': 54,
+                'remote_ip_prefix': '0.0.0.0/0',
+                'security_group_id': self._security_group.id,
+            }]}),
+        ])
+        self.assertEqual(('created', 'skipped'), columns)
+        self.assertEqual(
+            (format_columns.ListColumn(['rule-id-80', 'rule-id-53']),
+             format_columns.ListColumn([existing_rule.id])),
+            data)
+
+    def test_create_from_file_dry_run(self):
+        path, existing_rule = self._setup_bulk_create()
+        arglist = [
+            '--from-file', path,
+            '--dry-run',
+            self._security_group.id,
+        ]
+        verifylist = [
+            ('from_file', path),
+            ('dry_run', True),
+            ('group', self._security_group.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.network.post.assert_not_called()
+        self.assertEqual(('skipped', 'would_create'), columns)
+        self.assertEqual(
+            (format_columns.ListColumn([existing_rule.id]),
+             format_columns.ListColumn([
+                 'ingress IPv4 tcp 80:80 %s' % self._security_group.id,
+                 'egress IPv4 udp 53:54 0.0.0.0/0',
+             ])),
+            data)
+
+    def test_create_from_file_invalid_rule(self):
+        path = self._write_rules_file('- {protocol: tcp, port: 22}\n')
+        arglist = [
+            '--from-file', path,
+            self._security_group.id,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+
+    def test_create_from_file_with_rule_option(self):
+        arglist = [
+            '--from-file', 'rules.yaml',
+            '--protocol', 'tcp',
+            self._security_group.id,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+
 
 class TestDeleteSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
 
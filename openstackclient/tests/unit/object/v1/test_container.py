@@ -101,7 +101,8 @@ class TestContainerDelete(TestContainer):
             container=object_fakes.container_name,
             **kwargs
         )
-        o_list_mock.assert_called_with(container=object_fakes.container_name)
+        o_list_mock.assert_called_with(
+            container=object_fakes.container_name, all_data=True)
         o_delete_mock.assert_called_with(
             container=object_fakes.container_name,
             object=object_fakes.OBJECT['name'],
@@ -129,7 +130,8 @@ class TestContainerDelete(TestContainer):
             container=object_fakes.container_name,
             **kwargs
         )
-        o_list_mock.assert_called_with(container=object_fakes.container_name)
+        o_list_mock.assert_called_with(
+            container=object_fakes.container_name, all_data=True)
         o_delete_mock.assert_called_with(
             container=object_fakes.container_name,
             object=object_fakes.OBJECT['name'],
@@ -347,7 +349,7 @@ class TestContainerList(TestContainer):
 
         # Set expected values
         kwargs = {
-            'full_listing': True,
+            'all_data': True,
         }
         c_mock.assert_called_with(
             **kwargs
@@ -361,6 +363,33 @@ class TestContainerList(TestContainer):
         )
         self.assertEqual(datalist, tuple(data))
 
+    def test_object_list_containers_all_limit(self, c_mock):
+        c_mock.return_value = iter([
+            copy.deepcopy(object_fakes.CONTAINER),
+            copy.deepcopy(object_fakes.CONTAINER_2),
+            copy.deepcopy(object_fakes.CONTAINER_3),
+        ])
+
+        arglist = [
+            '--all',
+            '--limit', '2',
+        ]
+        verifylist = [
+            ('all', True),
+            ('limit', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        c_mock.assert_called_with(all_data=True, limit=2)
+        self.assertEqual(self.columns, columns)
+        datalist = (
+            (object_fakes.container_name, ),
+            (object_fakes.container_name_2, ),
+        )
+        self.assertEqual(datalist, tuple(data))
+
 
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.container_show'
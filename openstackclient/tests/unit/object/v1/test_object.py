@@ -317,7 +317,7 @@ class TestObjectList(TestObject):
 
         # Set expected values
         kwargs = {
-            'full_listing': True,
+            'all_data': True,
         }
         o_mock.assert_called_with(
             container=object_fakes.container_name,
@@ -331,6 +331,37 @@ class TestObjectList(TestObject):
         )
         self.assertEqual(datalist, tuple(data))
 
+    def test_object_list_objects_all_limit(self, o_mock):
+        o_mock.return_value = iter([
+            copy.deepcopy(object_fakes.OBJECT),
+            copy.deepcopy(object_fakes.OBJECT_2),
+        ])
+
+        arglist = [
+            '--all',
+            '--limit', '1',
+            object_fakes.container_name,
+        ]
+        verifylist = [
+            ('all', True),
+            ('limit', 1),
+            ('container', object_fakes.container_name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        o_mock.assert_called_with(
+            container=object_fakes.container_name,
+            all_data=True,
+            limit=1,
+        )
+        self.assertEqual(self.columns, columns)
+        datalist = (
+            (object_fakes.object_name_1, ),
+        )
+        self.assertEqual(datalist, tuple(data))
+
 
 @mock.patch(
     'openstackclient.api.object_store_v1.APIv1.object_show'
@@ -59,6 +59,45 @@ class TestObjectCreate(TestObjectAll):
                           self.cmd.take_action,
                           parsed_args)
 
+    @mock.patch(
+        'openstackclient.api.object_store_v1.APIv1.object_create'
+    )
+    def test_object_create_parallel_with_exception(self, mock_create):
+        mock_create.side_effect = [
+            {'object': object_fakes.object_name_1,
+             'container': object_fakes.container_name,
+             'etag': 'youreit'},
+            IOError('No such file'),
+        ]
+        arglist = [
+            object_fakes.container_name,
+            object_fakes.object_name_1,
+            object_fakes.object_name_2,
+            '--segment-size', '1048576',
+            '--parallel', '2',
+        ]
+        verifylist = [
+            ('container', object_fakes.container_name),
+            ('objects', [object_fakes.object_name_1,
+                         object_fakes.object_name_2]),
+            ('segment_size', 1048576),
+            ('parallel', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        ex = self.assertRaises(exceptions.CommandError,
+                               self.cmd.take_action,
+                               parsed_args)
+        self.assertEqual('1 of 2 objects failed to upload.', str(ex))
+        mock_create.assert_any_call(
+            container=object_fakes.container_name,
+            object=object_fakes.object_name_1,
+            name=None,
+            segment_size=1048576,
+            workers=1,
+        )
+        self.assertEqual(2, mock_create.call_count)
+
 
 class TestObjectList(TestObjectAll):
 
@@ -21,6 +21,7 @@ from osc_lib.tests import utils as osc_lib_test_utils
 from oslo_utils import importutils
 import wrapt
 
+from openstackclient.common import name_cache
 from openstackclient import shell
 
 
@@ -413,6 +414,30 @@ class TestShellCli(TestShell):
         self._assert_cli(flag, kwargs)
 
 
+class TestNameCacheTTL(TestShell):
+
+    def setUp(self):
+        super(TestNameCacheTTL, self).setUp()
+        self.useFixture(osc_lib_test_utils.EnvFixture())
+
+    def test_default(self):
+        os.environ = {}
+        self.assertEqual(
+            name_cache.DEFAULT_TTL, shell._name_cache_ttl_from_env())
+
+    def test_env(self):
+        os.environ = {'OS_NAME_CACHE_TTL': '30'}
+        self.assertEqual(30, shell._name_cache_ttl_from_env())
+
+    def test_invalid_env(self):
+        for ttl in ('ten', '', '-5'):
+            os.environ = {'OS_NAME_CACHE_TTL': ttl}
+            with mock.patch.object(shell.LOG, 'warning') as mock_warning:
+                self.assertEqual(
+                    name_cache.DEFAULT_TTL, shell._name_cache_ttl_from_env())
+            self.assertEqual(1, mock_warning.call_count)
+
+
 class TestShellArgV(TestShell):
     """Test the deferred help flag"""
 
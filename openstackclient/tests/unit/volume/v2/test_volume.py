@@ -21,6 +21,7 @@ from osc_lib.cli import format_columns
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import resource_cache
 from openstackclient.tests.unit.identity.v3 import fakes as identity_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
 from openstackclient.tests.unit import utils as tests_utils
@@ -683,6 +684,26 @@ class TestVolumeList(TestVolume):
         ), )
         self.assertListItemEqual(datalist, tuple(data))
 
+    def test_volume_list_attachment_servers(self):
+        compute_client = mock.Mock()
+        server = mock.Mock()
+        server.name = 'attached-server'
+        compute_client.servers.get.return_value = server
+        self.app.client_manager.compute = compute_client
+        self.addCleanup(resource_cache.reset)
+
+        parsed_args = self.check_parser(self.cmd, [], [])
+        columns, data = self.cmd.take_action(parsed_args)
+
+        attachment = self.mock_volume.attachments[0]
+        compute_client.servers.get.assert_called_once_with(
+            attachment['server_id'])
+        compute_client.servers.list.assert_not_called()
+        self.assertEqual(
+            'Attached to attached-server on %s ' % attachment['device'],
+            list(data)[0][4].human_readable(),
+        )
+
     def test_volume_list_project(self):
         arglist = [
             '--project', self.project.name,
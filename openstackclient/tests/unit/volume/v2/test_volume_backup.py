@@ -18,6 +18,7 @@ from mock import call
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import resource_cache
 from openstackclient.tests.unit.volume.v2 import fakes as volume_fakes
 from openstackclient.volume.v2 import volume_backup
 
@@ -282,6 +283,7 @@ class TestBackupList(TestBackup):
         self.backups_mock.list.return_value = self.backups
         self.volumes_mock.get.return_value = self.volume
         self.backups_mock.get.return_value = self.backups[0]
+        self.addCleanup(resource_cache.reset)
         # Get the command to test
         self.cmd = volume_backup.ListVolumeBackup(self.app, None)
 
@@ -345,7 +347,10 @@ class TestBackupList(TestBackup):
             "volume_id": self.volume.id,
             'all_tenants': True,
         }
-        self.volumes_mock.get.assert_called_once_with(self.volume.id)
+        self.volumes_mock.get.assert_any_call(self.volume.id)
+        # Only the volumes of the listed backups are looked up
+        self.volumes_mock.get.assert_any_call(self.backups[0].volume_id)
+        self.volumes_mock.list.assert_not_called()
         self.backups_mock.get.assert_called_once_with(self.backups[0].id)
         self.backups_mock.list.assert_called_with(
             search_opts=search_opts,
@@ -27,6 +27,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import resource_cache
 from openstackclient.i18n import _
 
 
@@ -379,27 +380,27 @@ class ListVolume(command.Lister):
                 'Attached to',
             )
 
-        # Cache the server list
-        server_cache = {}
-        try:
-            for s in compute_client.servers.list():
-                server_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-        AttachmentsColumnWithCache = functools.partial(
-            AttachmentsColumn, server_cache=server_cache)
-
         search_opts = {
             'all_tenants': parsed_args.all_projects,
             'display_name': parsed_args.name,
             'status': parsed_args.status,
         }
 
-        data = volume_client.volumes.list(
+        data = list(volume_client.volumes.list(
             search_opts=search_opts,
             limit=parsed_args.limit,
+        ))
+
+        # Only look up the servers the volumes are attached to
+        server_cache = resource_cache.lookup(
+            'server',
+            (attachment.get('server_id')
+             for v in data for attachment in getattr(v, 'attachments', [])),
+            lambda server_id: compute_client.servers.get(server_id),
         )
+        AttachmentsColumnWithCache = functools.partial(
+            AttachmentsColumn, server_cache=server_cache)
+
         column_headers = utils.backward_compat_col_lister(
             column_headers, parsed_args.columns, {'Display Name': 'Name'})
 
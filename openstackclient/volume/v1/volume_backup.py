@@ -25,6 +25,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import resource_cache
 from openstackclient.i18n import _
 
 
@@ -187,17 +188,6 @@ class ListVolumeBackup(command.Lister):
             columns = ['ID', 'Name', 'Description', 'Status', 'Size']
             column_headers = columns
 
-        # Cache the volume list
-        volume_cache = {}
-        try:
-            for s in volume_client.volumes.list():
-                volume_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-        VolumeIdColumnWithCache = functools.partial(VolumeIdColumn,
-                                                    volume_cache=volume_cache)
-
         filter_volume_id = None
         if parsed_args.volume:
             filter_volume_id = utils.find_resource(volume_client.volumes,
@@ -208,9 +198,20 @@ class ListVolumeBackup(command.Lister):
             'volume_id': filter_volume_id,
             'all_tenants': parsed_args.all_projects,
         }
-        data = volume_client.backups.list(
+        data = list(volume_client.backups.list(
             search_opts=search_opts,
-        )
+        ))
+
+        # Only look up the volumes shown in the Volume ID column
+        volume_cache = {}
+        if parsed_args.long:
+            volume_cache = resource_cache.lookup(
+                'volume',
+                (getattr(s, 'volume_id', None) for s in data),
+                volume_client.volumes.get,
+            )
+        VolumeIdColumnWithCache = functools.partial(VolumeIdColumn,
+                                                    volume_cache=volume_cache)
 
         return (column_headers,
                 (utils.get_item_properties(
@@ -27,6 +27,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import resource_cache
 from openstackclient.i18n import _
 
 
@@ -206,17 +207,6 @@ class ListVolumeSnapshot(command.Lister):
         column_headers[1] = 'Name'
         column_headers[2] = 'Description'
 
-        # Cache the volume list
-        volume_cache = {}
-        try:
-            for s in volume_client.volumes.list():
-                volume_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-        VolumeIdColumnWithCache = functools.partial(VolumeIdColumn,
-                                                    volume_cache=volume_cache)
-
         volume_id = None
         if parsed_args.volume:
             volume_id = utils.find_resource(
@@ -229,8 +219,20 @@ class ListVolumeSnapshot(command.Lister):
             'volume_id': volume_id,
         }
 
-        data = volume_client.volume_snapshots.list(
-            search_opts=search_opts)
+        data = list(volume_client.volume_snapshots.list(
+            search_opts=search_opts))
+
+        # Only look up the volumes shown in the Volume ID column
+        volume_cache = {}
+        if parsed_args.long:
+            volume_cache = resource_cache.lookup(
+                'volume',
+                (getattr(s, 'volume_id', None) for s in data),
+                volume_client.volumes.get,
+            )
+        VolumeIdColumnWithCache = functools.partial(VolumeIdColumn,
+                                                    volume_cache=volume_cache)
+
         return (column_headers,
                 (utils.get_item_properties(
                     s, columns,
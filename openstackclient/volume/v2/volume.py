@@ -27,6 +27,8 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import concurrency
+from openstackclient.common import resource_cache
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -279,22 +281,26 @@ class DeleteVolume(command.Command):
             help=_("Remove any snapshots along with volume(s) "
                    "(defaults to False)")
         )
+        concurrency.add_parallel_option_to_parser(parser)
         return parser
 
     def take_action(self, parsed_args):
         volume_client = self.app.client_manager.volume
         result = 0
 
-        for i in parsed_args.volumes:
-            try:
-                volume_obj = utils.find_resource(
-                    volume_client.volumes, i)
-                if parsed_args.force:
-                    volume_client.volumes.force_delete(volume_obj.id)
-                else:
-                    volume_client.volumes.delete(volume_obj.id,
-                                                 cascade=parsed_args.purge)
-            except Exception as e:
+        def _delete_volume(i):
+            volume_obj = utils.find_resource(
+                volume_client.volumes, i)
+            if parsed_args.force:
+                volume_client.volumes.force_delete(volume_obj.id)
+            else:
+                volume_client.volumes.delete(volume_obj.id,
+                                             cascade=parsed_args.purge)
+
+        for i, _r, e in concurrency.run_concurrently(
+                _delete_volume, parsed_args.volumes,
+                workers=parsed_args.parallel):
+            if e is not None:
                 result += 1
                 LOG.error(_("Failed to delete volume with "
                             "name or ID '%(volume)s': %(e)s"),
@@ -392,17 +398,6 @@ class ListVolume(command.Lister):
             column_headers = copy.deepcopy(columns)
             column_headers[4] = 'Attached to'
 
-        # Cache the server list
-        server_cache = {}
-        try:
-            for s in compute_client.servers.list():
-                server_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-        AttachmentsColumnWithCache = functools.partial(
-            AttachmentsColumn, server_cache=server_cache)
-
         project_id = None
         if parsed_args.project:
             project_id = identity_common.find_project(
@@ -427,11 +422,22 @@ class ListVolume(command.Lister):
             'status': parsed_args.status,
         }
 
-        data = volume_client.volumes.list(
+        data = list(volume_client.volumes.list(
             search_opts=search_opts,
             marker=parsed_args.marker,
             limit=parsed_args.limit,
+        ))
+
+        # Only look up the servers the volumes are attached to
+        server_cache = resource_cache.lookup(
+            'server',
+            (attachment.get('server_id')
+             for v in data for attachment in getattr(v, 'attachments', [])),
+            lambda server_id: compute_client.servers.get(server_id),
         )
+        AttachmentsColumnWithCache = functools.partial(
+            AttachmentsColumn, server_cache=server_cache)
+
         column_headers = utils.backward_compat_col_lister(
             column_headers, parsed_args.columns, {'Display Name': 'Name'})
 
@@ -26,6 +26,7 @@ from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import resource_cache
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -257,17 +258,6 @@ class ListVolumeSnapshot(command.Lister):
             columns = ['ID', 'Name', 'Description', 'Status', 'Size']
             column_headers = copy.deepcopy(columns)
 
-        # Cache the volume list
-        volume_cache = {}
-        try:
-            for s in volume_client.volumes.list():
-                volume_cache[s.id] = s
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
-        _VolumeIdColumn = functools.partial(VolumeIdColumn,
-                                            volume_cache=volume_cache)
-
         volume_id = None
         if parsed_args.volume:
             volume_id = utils.find_resource(
@@ -292,11 +282,23 @@ class ListVolumeSnapshot(command.Lister):
             'volume_id': volume_id,
         }
 
-        data = volume_client.volume_snapshots.list(
+        data = list(volume_client.volume_snapshots.list(
             search_opts=search_opts,
             marker=parsed_args.marker,
             limit=parsed_args.limit,
-        )
+        ))
+
+        # Only look up the volumes shown in the Volume ID column
+        volume_cache = {}
+        if parsed_args.long:
+            volume_cache = resource_cache.lookup(
+                'volume',
+                (getattr(s, 'volume_id', None) for s in data),
+                volume_client.volumes.get,
+            )
+        _VolumeIdColumn = functools.partial(VolumeIdColumn,
+                                            volume_cache=volume_cache)
+
         return (column_headers,
                 (utils.get_item_properties(
                     s, columns,